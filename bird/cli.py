@@ -155,9 +155,8 @@ def cmd_status(args):
     ]:
         if queue_file.exists():
             if queue_file.suffix == ".yaml":
-                import yaml
-                with open(queue_file) as f:
-                    data = yaml.safe_load(f) or {}
+                from ingestion.catalog import load_yaml
+                data = load_yaml(queue_file, default={})
                 count = len(data.get("quotes", []))
             else:
                 # Count headers as items
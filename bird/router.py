@@ -14,6 +14,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from ingestion.logger import new_run_id
+from ingestion.writer import append_text, update_file
+
 from .triage import TriageResult
 
 
@@ -50,6 +53,8 @@ class BookmarkRouter:
         self.review_queue = self.queues_dir / "review-queue.md"
         self.quotes_file = self.queues_dir / "quotes.yaml"
         self.log_file = self.queues_dir / "bird-log.jsonl"
+        # Tags this router's log entries, so runs can be told apart
+        self.run_id = new_run_id()
 
         # Buffers for batch writing
         self._learn_buffer: list[TriageResult] = []
@@ -94,6 +99,7 @@ class BookmarkRouter:
 
         entry = {
             "timestamp": datetime.now().isoformat(),
+            "run_id": self.run_id,
             "tweet_id": result.tweet_id,
             "author": result.author_handle,
             "intent": result.intent,
@@ -141,8 +147,7 @@ class BookmarkRouter:
 
         lines.append("")
 
-        with open(self.intake_queue, "a") as f:
-            f.write("\n".join(lines))
+        append_text(self.intake_queue, "\n".join(lines))
 
         self._learn_buffer.clear()
 
@@ -179,8 +184,7 @@ class BookmarkRouter:
             lines.append(f"> {result.tweet_text[:200]}...")
             lines.append("")
 
-        with open(self.try_queue, "a") as f:
-            f.write("\n".join(lines))
+        append_text(self.try_queue, "\n".join(lines))
 
         self._try_buffer.clear()
 
@@ -217,36 +221,34 @@ class BookmarkRouter:
                 lines.append(f"**Link**: {result.primary_url}")
                 lines.append("")
 
-        with open(self.review_queue, "a") as f:
-            f.write("\n".join(lines))
+        append_text(self.review_queue, "\n".join(lines))
 
         self._review_buffer.clear()
 
     def _write_quotes(self):
         """Append quotes to quotes.yaml."""
-        # Load existing quotes
-        if self.quotes_file.exists():
-            with open(self.quotes_file) as f:
-                data = yaml.safe_load(f) or {"quotes": []}
-        else:
-            data = {"quotes": []}
-
-        # Add new quotes
-        for result in self._quote_buffer:
-            if result.extracted_quote:
-                quote_entry = {
-                    "quote": result.extracted_quote,
-                    "author": result.author_name,
-                    "handle": result.author_handle,
-                    "source": result.tweet_url,
-                    "topic": result.quote_topic,
-                    "added": datetime.now().strftime("%Y-%m-%d"),
-                }
-                data["quotes"].append(quote_entry)
-
-        # Write back
-        with open(self.quotes_file, "w") as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        from ingestion.catalog import parse_yaml
+
+        new_quotes = [
+            {
+                "quote": result.extracted_quote,
+                "author": result.author_name,
+                "handle": result.author_handle,
+                "source": result.tweet_url,
+                "topic": result.quote_topic,
+                "added": datetime.now().strftime("%Y-%m-%d"),
+            }
+            for result in self._quote_buffer
+            if result.extracted_quote
+        ]
+
+        def add_quotes(text):
+            # Re-read under the file lock so concurrent runs don't drop quotes
+            data = (parse_yaml(text) if text else None) or {"quotes": []}
+            data.setdefault("quotes", []).extend(new_quotes)
+            return yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+        update_file(self.quotes_file, add_quotes)
 
         self._quote_buffer.clear()
 
@@ -8,57 +8,45 @@ Usage:
     python ingest.py batch <file>           Process URLs from markdown file
     python ingest.py batch <file> --dry-run Preview batch without processing
     python ingest.py review                 Review pending resources
+    python ingest.py review --approve-all   Bulk-approve pending resources
+    python ingest.py cache prune            Trim caches to their disk budget
+    python ingest.py dedup backfill         Index catalog text for near-duplicate checks
+    python ingest.py relationships backfill Suggest relationships for the whole catalog
+    python ingest.py metrics --last 20      Per-step latency, tokens and cost of recent runs
+    python ingest.py logs --since 2025-06-01 Throughput, latency, confidence and failure reports
 
 Examples:
     python ingest.py add "https://pluralistic.net/2024/06/21/seedbed/"
     python ingest.py add "https://moderndata101.substack.com/p/ai-ready-data" --dry-run
     python ingest.py batch intake-queue.md --dry-run
+    python ingest.py batch intake-queue.md --concurrency 4
+    python ingest.py batch intake-queue.md --extract-workers 4 --classify-workers 2
+    python ingest.py review --approve-all --min-confidence 0.6 --domain ai-llms
 """
 
 import argparse
 import sys
+import threading
+from dataclasses import asdict
 from pathlib import Path
-from urllib.parse import urlparse, urlunparse
 
 import yaml
 
-
-def normalize_url(url: str) -> str:
-    """Normalize URL for deduplication."""
-    parsed = urlparse(url)
-    # Remove fragment, normalize path
-    normalized = urlunparse((
-        parsed.scheme.lower(),
-        parsed.netloc.lower().replace("www.", ""),
-        parsed.path.rstrip("/") or "/",
-        "",  # params
-        parsed.query,
-        "",  # fragment
-    ))
-    return normalized
+from ingestion.urls import clean_url, normalize_url
 
 
 def load_existing_urls() -> dict[str, str]:
-    """Load existing resource URLs from resources.yaml.
+    """Load existing resource URLs from the catalog index.
+
+    The index (ingestion/catalog_index.py) mirrors resources.yaml and only
+    re-parses it when the file has changed since the last run.
 
     Returns:
         Dict mapping normalized URL to resource ID
     """
-    resources_file = Path(__file__).parent / "resources.yaml"
-    if not resources_file.exists():
-        return {}
-
-    with open(resources_file) as f:
-        data = yaml.safe_load(f)
-
-    if not data or "resources" not in data:
-        return {}
+    from ingestion.catalog_index import get_catalog_index
 
-    urls = {}
-    for r in data["resources"]:
-        if "url" in r and "id" in r:
-            urls[normalize_url(r["url"])] = r["id"]
-    return urls
+    return get_catalog_index().url_map()
 
 
 def check_duplicate(url: str, existing_urls: dict[str, str]) -> str | None:
@@ -72,38 +60,485 @@ def check_duplicate(url: str, existing_urls: dict[str, str]) -> str | None:
 
 
 def load_existing_authors() -> set[str]:
-    """Load existing author IDs from authors.yaml."""
-    authors_file = Path(__file__).parent / "authors.yaml"
-    if not authors_file.exists():
-        return set()
+    """Load existing author IDs from the catalog index (mirrors authors.yaml)."""
+    from ingestion.catalog_index import get_catalog_index
 
-    with open(authors_file) as f:
-        data = yaml.safe_load(f)
-
-    if not data or "authors" not in data:
-        return set()
-
-    return {a["id"] for a in data["authors"] if "id" in a}
+    return get_catalog_index().author_ids()
 
 
 def load_config() -> dict:
     """Load ingestion configuration."""
+    from ingestion.catalog import load_yaml
+
     config_file = Path(__file__).parent / "config" / "ingestion.yaml"
-    if config_file.exists():
-        with open(config_file) as f:
-            return yaml.safe_load(f)
+    if config := load_yaml(config_file, snapshot=False):
+        return config
     return {
         "llm": {"provider": "anthropic", "model": "claude-sonnet-4-20250514"},
         "classification": {"confidence_threshold": 0.7},
     }
 
 
-def cmd_add(url: str, dry_run: bool = False, auto_approve: bool = False):
-    """Add a single URL to the knowledge base."""
+def open_stage_cache(config: dict):
+    """Open the LLM stage cache using the cache: config section."""
+    from ingestion.cache import StageCache
+
+    max_mb = config.get("cache", {}).get("max_size_mb", 200)
+    return StageCache(max_bytes=max_mb * 1024 * 1024)
+
+
+def open_extraction_cache(config: dict):
+    """Open the extraction cache using the cache: config section."""
+    from ingestion.cache import ExtractionCache
+
+    cache_config = config.get("cache", {})
+    return ExtractionCache(
+        max_bytes=cache_config.get("extraction_max_size_mb", 500) * 1024 * 1024,
+        ttl=cache_config.get("extraction_ttl_hours", 168) * 3600,
+    )
+
+
+def update_pending_queue(queue_file: Path, update) -> list[dict]:
+    """Rewrite queue/pending.yaml as update(current items), under its file lock.
+
+    Reads the queue fresh under the lock, so items added by another run in
+    the meantime are never lost.
+
+    Returns:
+        The items written
+    """
+    from ingestion.catalog import parse_yaml
+    from ingestion.writer import update_file
+
+    written: list[dict] = []
+
+    def transform(text: str | None) -> str:
+        queue = (parse_yaml(text) if text else None) or {"pending": []}
+        queue["pending"] = update(queue.get("pending") or [])
+        written[:] = queue["pending"]
+        return yaml.dump(queue, default_flow_style=False, allow_unicode=True)
+
+    update_file(queue_file, transform)
+    return written
+
+
+class IngestionSession:
+    """Catalog, config and pipeline shared across every URL in a run.
+
+    `cmd_batch` builds one session and passes it to `cmd_add` for each URL,
+    so resources.yaml, authors.yaml and the config are parsed once and the
+    LM and DSPy modules are set up once. The URL and author indexes are
+    updated as resources are written, which also catches duplicates that
+    appear more than once in the same batch.
+
+    The session is also the single writer for resources.yaml, authors.yaml
+    and queue/pending.yaml. Writes go through ingestion/writer.py, which
+    locks each file against other processes (e.g. the bird cron job) and
+    fsyncs. Catalog appends are buffered and committed flush_every entries
+    at a time (1 = immediately; cmd_batch raises it).
+    """
+
+    def __init__(self, config: dict | None = None, use_cache: bool = True):
+        self.config = config or load_config()
+        self.use_cache = use_cache and self.config.get("cache", {}).get("enabled", True)
+        self._stage_cache = None
+        self._extraction_cache = None
+        self._near_duplicates = None
+        self._resolver = None
+        self.existing_urls = load_existing_urls()
+        self.existing_authors = load_existing_authors()
+        self.base_dir = Path(__file__).parent
+        self.flush_every = 1
+        self._writers = None
+        self._id_index = None
+        self._preclassifier = None
+        self._relationships = None
+        self._logger = None
+        self._lm_configured = False
+        self._local = threading.local()
+        self._lock = threading.RLock()
+
+    def configure_lm(self) -> None:
+        """Configure DSPy once. Call from the main thread before starting workers."""
+        with self._lock:
+            if self._lm_configured:
+                return
+            from ingestion.classifiers import configure_dspy
+            from ingestion.metering import configure_pricing
+
+            configure_dspy(
+                provider=self.config["llm"]["provider"],
+                model=self.config["llm"]["model"],
+            )
+            configure_pricing(self.config.get("metrics", {}).get("pricing"))
+            self._lm_configured = True
+
+    @property
+    def logger(self):
+        """Run logger shared by every pipeline of the session."""
+        with self._lock:
+            if self._logger is None:
+                from ingestion.logger import IngestionLogger
+
+                log_config = self.config.get("run_log", {})
+                self._logger = IngestionLogger(
+                    max_segment_bytes=int(log_config.get("segment_mb", 8) * 1024 * 1024),
+                    compress=log_config.get("compress", True),
+                    flush_every=log_config.get("flush_every", 1),
+                )
+            return self._logger
+
+    @property
+    def stage_cache(self):
+        """Shared LLM stage cache, or None when caching is disabled."""
+        if self.use_cache and self._stage_cache is None:
+            self._stage_cache = open_stage_cache(self.config)
+        return self._stage_cache
+
+    @property
+    def extraction_cache(self):
+        """Shared extraction cache, or None when caching is disabled."""
+        if self.use_cache and self._extraction_cache is None:
+            self._extraction_cache = open_extraction_cache(self.config)
+        return self._extraction_cache
+
+    @property
+    def resolver(self):
+        """Shared short-link resolver, or None when disabled in config."""
+        urls_config = self.config.get("urls", {})
+        if urls_config.get("resolve_redirects", True) and self._resolver is None:
+            from ingestion.urls import RedirectResolver
+
+            self._resolver = RedirectResolver(
+                use_cache=self.use_cache,
+                timeout=urls_config.get("resolve_timeout", 10),
+            )
+        return self._resolver
+
+    def canonicalize_many(self, urls: list[str]) -> dict[str, str]:
+        """Expand short links (concurrently) and drop tracking parameters.
+
+        Returns:
+            {url: canonical url} for every input
+        """
+        with self._lock:
+            resolver = self.resolver
+        resolved = resolver.resolve_many(urls) if resolver else {u: u for u in urls}
+        return {url: clean_url(target) for url, target in resolved.items()}
+
+    def canonicalize(self, url: str) -> str:
+        return self.canonicalize_many([url])[url]
+
+    def page_canonical(self, extracted, url: str) -> str | None:
+        """The page's <link rel=canonical> if it names a different page than url."""
+        canonical = extracted.canonical_url
+        if not canonical or not self.config.get("urls", {}).get("honor_canonical", True):
+            return None
+        from urllib.parse import urlparse
+
+        parsed, requested = urlparse(canonical), urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            return None
+        # Some sites point every page's canonical at the home page
+        if parsed.path.strip("/") == "" and requested.path.strip("/") != "":
+            return None
+        canonical = clean_url(canonical)
+        return canonical if normalize_url(canonical) != normalize_url(url) else None
+
+    @property
+    def near_duplicates(self):
+        """Shared near-duplicate index, or None when disabled in config."""
+        dedup_config = self.config.get("deduplication", {})
+        if dedup_config.get("near_duplicates", True) and self._near_duplicates is None:
+            from ingestion.neardup import NearDuplicateIndex
+
+            self._near_duplicates = NearDuplicateIndex(
+                threshold=dedup_config.get("similarity_threshold", 0.8)
+            )
+        return self._near_duplicates
+
+    @property
+    def id_index(self):
+        """Resource IDs taken in the catalog, the review queue or this session."""
+        with self._lock:
+            if self._id_index is None:
+                from ingestion.catalog import load_yaml
+                from ingestion.catalog_index import get_catalog_index
+                from ingestion.ids import IdIndex
+
+                queue = load_yaml(self.base_dir / "queue" / "pending.yaml", default={}) or {}
+                self._id_index = IdIndex(
+                    get_catalog_index().resource_ids()
+                    | {item["id"] for item in queue.get("pending") or [] if item.get("id")}
+                )
+            return self._id_index
+
+    @property
+    def preclassifier(self):
+        """Shared local pre-classifier, or None when disabled in config."""
+        pre_config = self.config.get("preclassifier", {})
+        with self._lock:
+            if pre_config.get("enabled", True) and self._preclassifier is None:
+                from ingestion.classifiers import DOMAINS
+                from ingestion.preclassifier import LocalClassifier
+
+                self._preclassifier = LocalClassifier(
+                    self.base_dir / "resources.yaml",
+                    neighbors=pre_config.get("neighbors", 7),
+                    min_margin=pre_config.get("min_margin", 0.6),
+                    min_similarity=pre_config.get("min_similarity", 0.2),
+                    min_examples=pre_config.get("min_examples", 20),
+                    taxonomy=DOMAINS,
+                )
+            return self._preclassifier
+
+    @property
+    def relationships(self):
+        """Shared relationship suggester, or None when max_suggestions is 0."""
+        rel_config = self.config.get("relationships", {})
+        with self._lock:
+            if rel_config.get("max_suggestions", 5) and self._relationships is None:
+                from ingestion.relationships import RelationshipSuggester
+
+                self._relationships = RelationshipSuggester(
+                    self.base_dir / "resources.yaml",
+                    max_suggestions=rel_config.get("max_suggestions", 5),
+                    threshold=rel_config.get("similarity_threshold", 0.25),
+                )
+            return self._relationships
+
+    def suggest_relationships(self, resource) -> list:
+        suggester = self.relationships
+        return suggester.suggest(resource) if suggester else []
+
+    @property
+    def pipeline(self):
+        """Pipeline for the current thread, built on first use.
+
+        Each worker thread gets its own pipeline, since the pipeline keeps
+        per-run state (cache counts, LM usage); all of them log through the
+        session's one run logger.
+        """
+        pipeline = getattr(self._local, "pipeline", None)
+        if pipeline is None:
+            from ingestion.classifiers import IngestionPipeline
+
+            self.configure_lm()
+            with self._lock:
+                cache = self.stage_cache
+            long_config = self.config.get("long_documents", {})
+            summary_lm = None
+            if long_config.get("summary_model"):
+                from ingestion.classifiers import make_lm
+
+                summary_lm = make_lm(self.config["llm"]["provider"], long_config["summary_model"])
+            pipeline = IngestionPipeline(
+                existing_authors=self.existing_authors,
+                logger=self.logger,
+                fused=self.config["classification"].get("mode") == "fused",
+                cache=cache,
+                id_mode=self.config.get("ids", {}).get("generator", "local"),
+                id_index=self.id_index,
+                preclassifier=self.preclassifier,
+                window_chars=self.config.get("preprocess", {}).get("window_chars", 4000) or None,
+                long_doc_words=long_config.get("threshold_words", 8000) or None,
+                chunk_words=long_config.get("chunk_words", 1500),
+                summary_workers=long_config.get("max_workers", 4),
+                summary_lm=summary_lm,
+            )
+            self._local.pipeline = pipeline
+        return pipeline
+
+    def extract(self, url: str):
+        """Fetch and extract a URL's content, reusing a cached extraction."""
+        from ingestion.extractor import extract_url
+
+        with self._lock:
+            cache = self.extraction_cache
+        if cache is None:
+            return extract_url(url)
+
+        key = normalize_url(url)
+        if (extracted := cache.get(key)) is not None:
+            extracted.fetch_seconds = 0.0  # Cached: nothing was fetched this run
+            return extracted
+        extracted = extract_url(url)
+        cache.set(key, extracted)
+        return extracted
+
+    def log_failure(self, url: str, step: str, error: Exception) -> None:
+        """Log a run that failed before reaching the pipeline (e.g. extraction)."""
+        run = self.logger.start_run(url)
+        run.log_step(step, inputs={"url": url}, outputs={})
+        self.logger.finish_run(run, success=False, error=f"{type(error).__name__}: {error}")
+
+    def check_duplicate(self, url: str) -> str | None:
+        """Check a URL against the catalog and everything written this session."""
+        return check_duplicate(url, self.existing_urls)
+
+    def check_near_duplicate(self, extracted):
+        """Match extracted text against indexed catalog and queued resources.
+
+        Returns:
+            (NearDuplicate or None, MinHash signature or None). Pass the
+            signature on to queue_for_review / write_resource.
+        """
+        with self._lock:
+            index = self.near_duplicates
+        min_words = self.config.get("deduplication", {}).get("min_words", 150)
+        if index is None or extracted.word_count < min_words:
+            return None, None
+
+        from ingestion.neardup import minhash
+
+        signature = minhash(extracted.text)
+        if signature is None:
+            return None, None
+        # Ignore signatures left behind by deleted resources
+        return index.query(signature, known=self.id_index), signature
+
+    def index_signature(self, resource, signature=None, status: str = "catalog") -> None:
+        """Add a resource to the near-duplicate index.
+
+        Without a signature, an already-indexed resource just changes
+        status; otherwise the text is taken from the extraction cache
+        (never fetched).
+        """
+        with self._lock:
+            index = self.near_duplicates
+            extraction_cache = self.extraction_cache
+        if index is None:
+            return
+        if signature is None:
+            if index.set_status(resource.id, status) or extraction_cache is None:
+                return
+            if (extracted := extraction_cache.get(normalize_url(resource.url))) is None:
+                return
+            from ingestion.neardup import minhash
+
+            if (signature := minhash(extracted.text)) is None:
+                return
+        index.add(resource.id, resource.url, signature, status=status)
+
+    def record_resource(self, resource, source_url: str | None = None) -> None:
+        """Add a written resource to the in-memory URL and author indexes."""
+        self.existing_urls[normalize_url(resource.url)] = resource.id
+        self.id_index.add(resource.id)
+        if source_url:
+            # The requested URL, if the page's canonical URL replaced it
+            self.existing_urls[normalize_url(source_url)] = resource.id
+        self.existing_authors.add(resource.author_id)
+
+    @property
+    def writers(self):
+        """(resources.yaml, authors.yaml) appenders, created on first use."""
+        if self._writers is None:
+            from ingestion.writer import CatalogWriter, validate_yaml_entries
+
+            self._writers = (
+                CatalogWriter(self.base_dir / "resources.yaml", validate=validate_yaml_entries),
+                CatalogWriter(self.base_dir / "authors.yaml", validate=validate_yaml_entries),
+            )
+        return self._writers
+
+    def flush(self) -> int:
+        """Commit buffered catalog entries. Returns resources written."""
+        with self._lock:
+            if self._writers is None:
+                return 0
+            resources_writer, authors_writer = self._writers
+            # Authors first, so a written resource never references a missing author
+            authors_writer.flush()
+            return resources_writer.flush()
+
+    def queue_for_review(self, resource, signature=None) -> Path:
+        """Append a resource to queue/pending.yaml."""
+        queue_file = self.base_dir / "queue" / "pending.yaml"
+
+        # Add to queue (as dict, not raw YAML string). The summary
+        # fields are for display; "resource" holds the complete
+        # ClassifiedResource so approval is a local write, not a re-run
+        item = {
+            "id": resource.id,
+            "url": resource.url,
+            "title": resource.title,
+            "domain": resource.domain,
+            "category": resource.category,
+            "confidence": resource.confidence,
+            "reasoning": resource.reasoning,
+            "definition": resource.definition,
+            "author_id": resource.author_id,
+            "is_new_author": resource.is_new_author,
+            "resource": asdict(resource),
+        }
+        update_pending_queue(queue_file, lambda pending: pending + [item])
+
+        self.index_signature(resource, signature, status="pending")
+        return queue_file
+
+    def write_resource(self, resource, source_url: str, signature=None) -> bool:
+        """Append a resource (and its author, if new) to the catalog files.
+
+        Returns:
+            True if a new author entry was written
+
+        Raises:
+            ValueError: An entry isn't valid YAML; nothing was buffered or
+                recorded, so the rest of the batch is unaffected
+        """
+        from ingestion.yaml_writer import generate_resource_yaml, generate_author_yaml
+
+        with self._lock:
+            resources_writer, authors_writer = self.writers
+
+            # Re-check under the lock: another worker may have written this
+            # author since the pipeline ran
+            write_author = resource.is_new_author and resource.author_id not in self.existing_authors
+
+            relationships = self.suggest_relationships(resource)
+            resource_yaml = generate_resource_yaml(resource, relationships)
+            author_yaml = generate_author_yaml(
+                resource.author_id,
+                resource.author_name,
+                source_url=source_url,
+                github_enrichment=resource.github_enrichment,
+            ) if write_author else None
+
+            # Check both before buffering either, so a rejected entry never
+            # leaves its resource or author behind
+            if author_yaml:
+                authors_writer.check(author_yaml)
+            resources_writer.append(resource_yaml)
+            if author_yaml:
+                authors_writer.append(author_yaml)
+
+            self.record_resource(resource, source_url)
+            if self.relationships:
+                self.relationships.add(resource)
+            if self.preclassifier:
+                self.preclassifier.learn(resource)
+            if resources_writer.pending >= self.flush_every:
+                self.flush()
+
+        self.index_signature(resource, signature)
+        return write_author
+
+
+def cmd_add(
+    url: str,
+    dry_run: bool = False,
+    auto_approve: bool = False,
+    session: IngestionSession | None = None,
+    extracted=None,
+    use_cache: bool = True,
+):
+    """Add a single URL to the knowledge base.
+
+    Pass `extracted` to skip fetching when content was already extracted
+    (e.g. by the extraction stage of a pipelined batch).
+    """
     import os
 
-    from ingestion.extractor import extract_url
-    from ingestion.classifiers import configure_dspy, IngestionPipeline
     from ingestion.yaml_writer import (
         generate_resource_yaml,
         generate_author_yaml,
@@ -111,13 +546,17 @@ def cmd_add(url: str, dry_run: bool = False, auto_approve: bool = False):
         format_for_display,
     )
 
-    config = load_config()
-    existing_authors = load_existing_authors()
-    existing_urls = load_existing_urls()
+    session = session or IngestionSession(use_cache=use_cache)
+    config = session.config
+
+    # Expand short links (t.co, bit.ly, ...) and drop tracking parameters
+    if (canonical := session.canonicalize(url)) != url:
+        print(f"↪ {url} → {canonical}")
+        url = canonical
 
     # Check for duplicates first
     print(f"\n🔍 Checking for duplicates...")
-    if duplicate_id := check_duplicate(url, existing_urls):
+    if duplicate_id := session.check_duplicate(url):
         print(f"✗ Duplicate found: {duplicate_id}")
         print(f"  URL already exists in knowledge base")
         print(f"  Use --force to add anyway (not implemented)")
@@ -138,30 +577,45 @@ def cmd_add(url: str, dry_run: bool = False, auto_approve: bool = False):
 
     # Step 1: Extract content
     try:
-        extracted = extract_url(url)
+        if extracted is None:
+            extracted = session.extract(url)
+        elif isinstance(extracted, Exception):
+            raise extracted
         print(f"✓ Extracted: {extracted.title}")
         print(f"  {extracted.word_count} words, platform: {extracted.source_platform}")
     except Exception as e:
         print(f"✗ Extraction failed: {e}")
+        session.log_failure(url, "extraction", e)
         sys.exit(1)
 
-    # Step 2: Configure DSPy and run pipeline
-    print("\n🧠 Classifying with LLM...")
-    configure_dspy(
-        provider=config["llm"]["provider"],
-        model=config["llm"]["model"],
-    )
+    # The page's canonical URL identifies it better than the link we followed
+    if page_url := session.page_canonical(extracted, url):
+        print(f"↪ Canonical URL: {page_url}")
+        if duplicate_id := session.check_duplicate(page_url):
+            print(f"✗ Duplicate found: {duplicate_id}")
+            print("  Canonical URL already exists in knowledge base")
+            sys.exit(1)
+        extracted.url = page_url
+
+    # Step 2: Near-duplicate check (same text under another URL), before any LLM call
+    near_dup, signature = session.check_near_duplicate(extracted)
+    if near_dup:
+        where = "review queue" if near_dup.status == "pending" else "knowledge base"
+        print(f"\n✗ Near-duplicate found: {near_dup.resource_id} ({near_dup.similarity:.0%} similar, in {where})")
+        print(f"  {near_dup.url}")
+        sys.exit(1)
 
-    pipeline = IngestionPipeline(existing_authors=existing_authors)
-    result = pipeline.process(extracted)
+    # Step 3: Run pipeline (DSPy is configured once per session)
+    print("\n🧠 Classifying with LLM...")
+    result = session.pipeline.process(extracted)
 
-    # Step 3: Display results
+    # Step 4: Display results
     print(format_for_display(result))
 
     if dry_run:
         print("\n📋 Generated YAML (dry run - not written):")
         print("─" * 60)
-        print(generate_resource_yaml(result))
+        print(generate_resource_yaml(result, session.suggest_relationships(result)))
         if result.is_new_author:
             print("\n📋 New Author YAML:")
             print("─" * 60)
@@ -172,83 +626,91 @@ def cmd_add(url: str, dry_run: bool = False, auto_approve: bool = False):
             ))
         return
 
-    # Step 4: Handle based on confidence
+    # Step 5: Handle based on confidence
     threshold = config["classification"]["confidence_threshold"]
 
     if result.needs_review and not auto_approve:
         print(f"\n⚠️  Confidence ({result.confidence:.0%}) below threshold ({threshold:.0%})")
         print("    Adding to review queue...")
 
-        queue_file = Path(__file__).parent / "queue" / "pending.yaml"
-        queue_file.parent.mkdir(exist_ok=True)
-
-        # Load or create queue
-        if queue_file.exists():
-            with open(queue_file) as f:
-                queue = yaml.safe_load(f) or {"pending": []}
-        else:
-            queue = {"pending": []}
-
-        # Add to queue (as dict, not raw YAML string)
-        queue["pending"].append({
-            "id": result.id,
-            "url": result.url,
-            "title": result.title,
-            "domain": result.domain,
-            "category": result.category,
-            "confidence": result.confidence,
-            "reasoning": result.reasoning,
-            "definition": result.definition,
-            "author_id": result.author_id,
-            "is_new_author": result.is_new_author,
-        })
-
-        with open(queue_file, "w") as f:
-            yaml.dump(queue, f, default_flow_style=False, allow_unicode=True)
-
+        queue_file = session.queue_for_review(result, signature=signature)
         print(f"    Written to: {queue_file}")
         print("\n    Run `python ingest.py review` to approve/edit")
         return
 
-    # Step 5: Write to files
-    resources_file = Path(__file__).parent / "resources.yaml"
-    authors_file = Path(__file__).parent / "authors.yaml"
-
-    # Append resource
-    with open(resources_file, "a") as f:
-        f.write("\n")
-        f.write(generate_resource_yaml(result))
-        f.write("\n")
-    print(f"\n✓ Resource written to: {resources_file}")
-
-    # Append author if new
-    if result.is_new_author:
-        with open(authors_file, "a") as f:
-            f.write("\n")
-            f.write(generate_author_yaml(
-                result.author_id,
-                result.author_name,
-                source_url=url,
-                github_enrichment=result.github_enrichment,
-            ))
-            f.write("\n")
-        print(f"✓ New author written to: {authors_file}")
+    # Step 6: Write to files
+    try:
+        wrote_author = session.write_resource(result, source_url=url, signature=signature)
+    except ValueError as e:
+        print(f"\n❌ Could not write resource: {e}")
+        sys.exit(1)
+    print(f"\n✓ Resource written to: {session.base_dir / 'resources.yaml'}")
+
+    if wrote_author:
+        print(f"✓ New author written to: {session.base_dir / 'authors.yaml'}")
         if result.github_enrichment:
             print(f"  ✓ Enriched from GitHub: {result.github_enrichment.get('github', '')}")
+        elif result.github_deferred:
+            print(f"  ⏳ GitHub enrichment deferred: {result.github_deferred}")
 
     print("\n✅ Done! Resource added to knowledge base.")
 
 
-def cmd_review():
-    """Interactive review of pending resources."""
+def approve_pending(item: dict, session: IngestionSession) -> bool:
+    """Write a reviewed queue item to the catalog.
+
+    Items queued with the full ClassifiedResource are written exactly as
+    reviewed, with no re-extraction or LLM calls. Older items that only
+    have summary fields fall back to re-running the pipeline.
+
+    Returns:
+        True if the item can be removed from the queue
+    """
+    if dup_id := session.check_duplicate(item["url"]):
+        print(f"    Already in knowledge base as {dup_id}; removing from queue.")
+        return True
+
+    if "resource" not in item:
+        print("    (Queued before full results were stored - re-running pipeline)")
+        try:
+            cmd_add(item["url"], auto_approve=True, session=session)
+        except SystemExit:
+            return False
+        return True
+
+    from ingestion.classifiers import ClassifiedResource
+
+    resource = ClassifiedResource(**item["resource"])
+    resource.needs_review = False
+    try:
+        wrote_author = session.write_resource(resource, source_url=resource.url)
+    except ValueError as e:
+        print(f"    ❌ Could not write {resource.id}: {e}")
+        return False
+    print(f"    ✓ Written: {resource.id}" + (f" (+ new author {resource.author_id})" if wrote_author else ""))
+    return True
+
+
+def cmd_review(
+    approve_all: bool = False,
+    min_confidence: float = 0.0,
+    domain: str | None = None,
+):
+    """Review pending resources.
+
+    Interactive by default. With approve_all, every item matching the
+    filters (confidence >= min_confidence, and domain if given) is approved
+    without prompting.
+    """
+    from ingestion.catalog import load_yaml
+
     queue_file = Path(__file__).parent / "queue" / "pending.yaml"
 
     if not queue_file.exists():
         print("No pending resources to review.")
         return
 
-    with open(queue_file) as f:
-        queue = yaml.safe_load(f)
+    queue = load_yaml(queue_file)
 
     if not queue or not queue.get("pending"):
         print("No pending resources to review.")
@@ -257,34 +719,260 @@ def cmd_review():
     pending = queue["pending"]
     print(f"\n📋 {len(pending)} resource(s) pending review\n")
 
-    for i, item in enumerate(pending):
-        print(f"[{i+1}/{len(pending)}] {item['title']}")
-        print(f"    URL: {item['url']}")
-        print(f"    Classification: {item['domain']} → {item['category']}")
-        print(f"    Confidence: {item['confidence']:.0%}")
-        print(f"    Reasoning: {item['reasoning'][:100]}...")
-        print()
-
-        action = input("    [a]pprove / [s]kip / [e]dit / [d]elete? ").strip().lower()
-
-        if action == "a":
-            # Re-run with auto-approve
-            cmd_add(item["url"], auto_approve=True)
-            pending.remove(item)
-        elif action == "d":
-            pending.remove(item)
-            print("    Deleted.")
-        elif action == "e":
-            print("    (Edit not yet implemented - use 'a' to approve then edit YAML)")
+    session = IngestionSession()
+    remaining = []
+
+    if approve_all:
+        matches = [
+            item for item in pending
+            if item["confidence"] >= min_confidence and (domain is None or item["domain"] == domain)
+        ]
+        print(f"Approving {len(matches)} item(s) (confidence ≥ {min_confidence:.0%}"
+              f"{f', domain {domain}' if domain else ''})\n")
+        session.flush_every = max(1, session.config.get("writer", {}).get("batch_flush_every", 25))
+        for item in pending:
+            if item in matches:
+                print(f"  {item['title'][:60]}")
+                if approve_pending(item, session):
+                    continue
+            remaining.append(item)
+    else:
+        for i, item in enumerate(pending):
+            print(f"[{i+1}/{len(pending)}] {item['title']}")
+            print(f"    URL: {item['url']}")
+            print(f"    Classification: {item['domain']} → {item['category']}")
+            print(f"    Confidence: {item['confidence']:.0%}")
+            print(f"    Reasoning: {item['reasoning'][:100]}...")
+            print()
+
+            action = input("    [a]pprove / [s]kip / [e]dit / [d]elete? ").strip().lower()
+
+            if action == "a":
+                if approve_pending(item, session):
+                    continue
+            elif action == "d":
+                if session.near_duplicates:
+                    session.near_duplicates.remove(item["id"])
+                print("    Deleted.")
+                continue
+            elif action == "e":
+                print("    (Edit not yet implemented - use 'a' to approve then edit YAML)")
+            else:
+                print("    Skipped.")
+            remaining.append(item)
+
+    # Commit approved entries before they leave the queue
+    session.flush()
+
+    # Remove handled items from the queue as it is now (another run may
+    # have queued more items while this review was open)
+    kept = {id(item) for item in remaining}
+    handled = {(item["id"], item["url"]) for item in pending if id(item) not in kept}
+    remaining = update_pending_queue(
+        queue_file,
+        lambda current: [item for item in current if (item.get("id"), item.get("url")) not in handled],
+    )
+
+    print(f"\n✓ Queue updated. {len(remaining)} item(s) remaining.")
+
+
+def cmd_cache(action: str, max_mb: float | None = None):
+    """Show, prune or clear the on-disk ingestion caches."""
+    from ingestion.github_client import GitHubClient
+    from ingestion.urls import RedirectResolver
+
+    config = load_config()
+    caches = [
+        ("Extraction", open_extraction_cache(config).store),
+        ("LLM stages", open_stage_cache(config).store),
+        ("Redirects", RedirectResolver().store),
+        ("GitHub", GitHubClient().store),
+    ]
+
+    for name, store in caches:
+        if action == "prune":
+            budget = int(max_mb * 1024 * 1024) if max_mb is not None else None
+            removed = store.prune(budget)
+            print(f"✓ {name}: removed {removed} entries")
+        elif action == "clear":
+            store.clear()
+            print(f"✓ {name}: cleared")
+
+        stats = store.stats()
+        budget_mb = (max_mb if max_mb is not None else stats["max_bytes"] / 1024 / 1024)
+        print(
+            f"  {name}: {stats['entries']} entries, "
+            f"{stats['bytes'] / 1024 / 1024:.1f} MB (budget {budget_mb:.0f} MB) → {store.path}"
+        )
+
+
+def cmd_dedup(action: str, fetch: bool = False):
+    """Show or backfill the near-duplicate index.
+
+    Backfill drops signatures of resources no longer in the catalog or
+    queue, then indexes catalog resources that have no signature yet,
+    using cached extractions (and fetching missing pages only with
+    fetch=True).
+    """
+    from ingestion.neardup import minhash
+    from ingestion.scan import iter_resource_urls
+
+    session = IngestionSession()
+    index = session.near_duplicates
+    if index is None:
+        print("Near-duplicate detection is disabled (deduplication.near_duplicates in config)")
+        return
+
+    if action == "backfill":
+        from ingestion.catalog import load_yaml
+
+        catalog = list(iter_resource_urls(session.base_dir / "resources.yaml"))
+        queue = load_yaml(session.base_dir / "queue" / "pending.yaml", default={}) or {}
+        known = {resource_id for resource_id, _ in catalog} | {
+            item["id"] for item in queue.get("pending") or [] if item.get("id")
+        }
+        if removed := index.reconcile(known):
+            print(f"✓ Dropped {removed} signature(s) of deleted resources")
+
+        added = skipped = 0
+        for resource_id, url in catalog:
+            if not url or resource_id in index:
+                continue
+            key = normalize_url(url)
+            extracted = session.extraction_cache.get(key) if session.extraction_cache else None
+            if extracted is None and fetch:
+                try:
+                    extracted = session.extract(url)
+                except Exception as e:
+                    print(f"  ✗ {resource_id}: {e}")
+            signature = minhash(extracted.text) if extracted is not None else None
+            if signature is None:
+                skipped += 1
+                continue
+            index.add(resource_id, url, signature)
+            added += 1
+        print(f"✓ Indexed {added} resources ({skipped} without cached text"
+              + ("" if fetch else "; use --fetch to download them") + ")")
+
+    stats = index.stats()
+    print(f"  Near-duplicate index: {stats['catalog']} catalog, {stats['pending']} queued → {index.path}")
+
+
+def cmd_relationships(action: str, dry_run: bool = False):
+    """Show relationship coverage, or backfill suggestions for the catalog.
+
+    Backfill fills every `relationships: []` in resources.yaml with the
+    resource's nearest neighbors; entries with relationships are kept.
+    """
+    from ingestion.catalog import parse_yaml
+    from ingestion.relationships import fill_relationships
+    from ingestion.scan import scan_entries
+    from ingestion.writer import update_file
+
+    session = IngestionSession()
+    resources_file = session.base_dir / "resources.yaml"
+    suggester = session.relationships
+    if suggester is None:
+        print("Relationship suggestions are disabled (relationships.max_suggestions in config)")
+        return
+
+    if action == "backfill":
+        suggestions = suggester.backfill()
+        filled = 0
+
+        def transform(text: str | None) -> str:
+            nonlocal filled
+            updated, filled = fill_relationships(text or "", suggestions)
+            parse_yaml(updated)  # Never write a file that doesn't parse
+            return updated
+
+        if dry_run:
+            transform(resources_file.read_text(encoding="utf-8"))
         else:
-            print("    Skipped.")
+            update_file(resources_file, transform)
+        verb = "Would fill" if dry_run else "Filled"
+        print(f"✓ {verb} relationships for {filled} resources "
+              f"({sum(1 for s in suggestions.values() if s)} have neighbors above "
+              f"{suggester.threshold:.2f} similarity)")
+
+    total = linked = 0
+    for entry in scan_entries(resources_file, "resources", ("id", "relationships")):
+        total += 1
+        linked += bool(entry.get("relationships"))
+    print(f"  Relationships: {linked} of {total} resources linked → {resources_file}")
+
+
+def cmd_metrics(
+    last: int | None = None,
+    since: str | None = None,
+    append: bool = False,
+    method: str = "Pipeline (batch)",
+    notes: str = "",
+):
+    """Aggregate run logs into per-step latency, token and cost figures.
+
+    With --append, the totals are added as a row to the Metrics Log in
+    docs/ingestion-metrics.md.
+    """
+    from ingestion.logger import iter_runs
+    from ingestion.metrics import append_row, format_duration, format_table, metrics_row, summarize_runs
+
+    runs = list(iter_runs())
+    if since:
+        runs = [r for r in runs if r.get("started_at", "") >= since]
+    if last:
+        runs = runs[-last:]
+    if not runs:
+        print("No logged runs match")
+        return
 
-    # Save updated queue
-    queue["pending"] = pending
-    with open(queue_file, "w") as f:
-        yaml.dump(queue, f, default_flow_style=False, allow_unicode=True)
+    summary = summarize_runs(runs)
+    print(f"📊 {summary.runs} runs ({summary.succeeded} succeeded) "
+          f"over {format_duration(summary.wall_seconds)}\n")
+    print(format_table(summary))
+    print(f"\n  Tokens: {summary.total_tokens:,}   Estimated cost: ${summary.total_cost:.4f}")
+
+    if append:
+        row = metrics_row(summary, method=method, notes=notes)
+        append_row(row)
+        print(f"\n✓ Appended to docs/ingestion-metrics.md:\n  {row}")
+
+
+def cmd_logs(
+    reports: list[str],
+    since: str | None = None,
+    until: str | None = None,
+    fmt: str = "text",
+    output: str | None = None,
+    bird_runs: int = 20,
+):
+    """Report on the ingestion run log and the bird log, streaming both.
+
+    JSON and CSV (tidy report/group/metric/value rows) go to --output, or
+    stdout.
+    """
+    from ingestion.analytics import build_report, format_report, iter_jsonl, write_csv, write_json
+    from ingestion.logger import iter_runs
+
+    bird_log = Path(__file__).parent / "queues" / "bird-log.jsonl"
+    report = build_report(
+        iter_runs(),
+        iter_jsonl(bird_log),
+        since=since,
+        until=until,
+        bird_runs=bird_runs,
+    )
 
-    print(f"\n✓ Queue updated. {len(pending)} item(s) remaining.")
+    if fmt == "text":
+        print(format_report(report, reports))
+        return
+    writer = write_csv if fmt == "csv" else write_json
+    if output:
+        with open(output, "w", newline="", encoding="utf-8") as f:
+            writer(report, f, reports)
+        print(f"✓ Wrote {fmt.upper()} report → {output}")
+    else:
+        writer(report, sys.stdout, reports)
 
 
 def extract_markdown_links(content: str) -> list[tuple[str, str]]:
@@ -302,8 +990,26 @@ def extract_markdown_links(content: str) -> list[tuple[str, str]]:
     return [(title, url) for title, url in matches if url.startswith(('http://', 'https://'))]
 
 
-def cmd_batch(file_path: str, dry_run: bool = False, auto_approve: bool = False):
-    """Process URLs from a markdown file."""
+def cmd_batch(
+    file_path: str,
+    dry_run: bool = False,
+    auto_approve: bool = False,
+    concurrency: int = 1,
+    extract_workers: int = 0,
+    classify_workers: int = 0,
+    queue_size: int | None = None,
+    use_cache: bool = True,
+):
+    """Process URLs from a markdown file.
+
+    With concurrency > 1, URLs run on a thread pool of that size; writes
+    still go through the session one at a time.
+
+    Setting extract_workers or classify_workers switches to pipelined mode:
+    extraction and classification run as separate stages joined by a
+    bounded queue (queue_size), so fetching the next pages overlaps with
+    LLM calls for earlier ones.
+    """
     from pathlib import Path
 
     file = Path(file_path)
@@ -321,17 +1027,30 @@ def cmd_batch(file_path: str, dry_run: bool = False, auto_approve: bool = False)
     print(f"\n📋 Found {len(links)} links in {file.name}")
     print("─" * 60)
 
-    # Load existing URLs for duplicate check
-    existing_urls = load_existing_urls()
+    # Load catalog, config and pipeline once for the whole batch
+    session = IngestionSession(use_cache=use_cache)
+
+    # Expand short links (e.g. t.co from bird bookmarks) and drop tracking
+    # parameters before duplicate checks
+    canonical = session.canonicalize_many([url for _, url in links])
+    expanded = sum(1 for url, target in canonical.items() if normalize_url(url) != normalize_url(target))
+    if expanded:
+        print(f"↪ Expanded {expanded} short link(s)")
+    links = [(title, canonical[url]) for title, url in links]
 
-    # Categorize links
+    # Categorize links (repeats within the file count as duplicates too)
     new_links = []
     duplicate_links = []
+    seen_in_batch: set[str] = set()
 
     for title, url in links:
-        if dup_id := check_duplicate(url, existing_urls):
+        normalized = normalize_url(url)
+        if dup_id := session.check_duplicate(url):
             duplicate_links.append((title, url, dup_id))
+        elif normalized in seen_in_batch:
+            duplicate_links.append((title, url, "(earlier in this batch)"))
         else:
+            seen_in_batch.add(normalized)
             new_links.append((title, url))
 
     print(f"\n✓ {len(new_links)} new URLs")
@@ -362,20 +1081,56 @@ def cmd_batch(file_path: str, dry_run: bool = False, auto_approve: bool = False)
     print(f"\n📥 Processing {len(new_links)} URLs...")
     print("─" * 60)
 
-    successes = 0
-    failures = []
-
-    for i, (title, url) in enumerate(new_links, 1):
+    def process_link(i: int, link: tuple[str, str], extracted=None) -> bool:
+        title, url = link
         print(f"\n[{i}/{len(new_links)}] {title[:40]}...")
-        try:
-            cmd_add(url, dry_run=False, auto_approve=auto_approve)
-            successes += 1
-        except SystemExit:
-            # cmd_add calls sys.exit on failure
-            failures.append((title, url))
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            failures.append((title, url))
+        cmd_add(url, dry_run=False, auto_approve=auto_approve, session=session, extracted=extracted)
+        return True
+
+    # Commit catalog entries in groups rather than one write + fsync each
+    session.flush_every = max(1, session.config.get("writer", {}).get("batch_flush_every", 25))
+
+    stage_report = None
+    try:
+        if extract_workers or classify_workers:
+            from ingestion.batch import format_stage_stats, run_staged
+
+            extract_workers = extract_workers or 1
+            classify_workers = classify_workers or 1
+            session.configure_lm()
+            print(f"Pipelined: {extract_workers} extract / {classify_workers} classify worker(s)")
+            outcomes, stats, wall = run_staged(
+                new_links,
+                extract=lambda link: session.extract(link[1]),
+                process=process_link,
+                extract_workers=extract_workers,
+                process_workers=classify_workers,
+                max_pending=queue_size,
+            )
+            stage_report = format_stage_stats(stats, wall)
+        elif concurrency > 1:
+            from ingestion.batch import run_concurrent
+
+            # Configure DSPy on the main thread before workers start
+            session.configure_lm()
+            print(f"Running {concurrency} workers (output shown per URL as each finishes)")
+            outcomes = run_concurrent(new_links, process_link, max_workers=concurrency)
+        else:
+            outcomes = []
+            for i, link in enumerate(new_links, 1):
+                try:
+                    outcomes.append((link, process_link(i, link)))
+                except SystemExit:
+                    # cmd_add calls sys.exit on failure
+                    outcomes.append((link, False))
+                except Exception as e:
+                    print(f"  ✗ Error: {e}")
+                    outcomes.append((link, False))
+    finally:
+        session.flush()
+
+    successes = sum(1 for _, ok in outcomes if ok)
+    failures = [link for link, ok in outcomes if not ok]
 
     print(f"\n{'─' * 60}")
     print(f"📊 Batch complete: {successes} succeeded, {len(failures)} failed")
@@ -383,6 +1138,17 @@ def cmd_batch(file_path: str, dry_run: bool = False, auto_approve: bool = False)
         print("\nFailed URLs:")
         for title, url in failures:
             print(f"  - {url}")
+    if stage_report:
+        print(f"\n{stage_report}")
+    if session.use_cache:
+        llm = session.stage_cache.stats()
+        pages = session.extraction_cache.stats()
+        print(f"\n💾 Cache: extraction {pages['hits']} hits / {pages['misses']} misses, "
+              f"LLM {llm['hits']} hits / {llm['misses']} misses")
+    stats = session.preclassifier.stats if session.preclassifier else None
+    if stats and stats["local"] + stats["llm"]:
+        print(f"\n🧭 Pre-classifier: {stats['local']} of {stats['local'] + stats['llm']} classified locally "
+              f"({stats['local']} LLM calls saved), {stats['learned']} examples learned")
 
 
 def main():
@@ -398,24 +1164,141 @@ def main():
     add_parser.add_argument("url", help="URL to ingest")
     add_parser.add_argument("--dry-run", action="store_true", help="Preview without writing")
     add_parser.add_argument("--auto-approve", action="store_true", help="Skip review queue")
+    add_parser.add_argument("--no-cache", action="store_true", help="Ignore cached extractions and LLM outputs")
 
     # review command
-    subparsers.add_parser("review", help="Review pending resources")
+    review_parser = subparsers.add_parser("review", help="Review pending resources")
+    review_parser.add_argument(
+        "--approve-all", action="store_true",
+        help="Approve every matching item without prompting",
+    )
+    review_parser.add_argument(
+        "--min-confidence", type=float, default=0.0,
+        help="With --approve-all: only items at or above this confidence (0-1)",
+    )
+    review_parser.add_argument("--domain", help="With --approve-all: only items in this domain")
 
     # batch command
     batch_parser = subparsers.add_parser("batch", help="Process URLs from a markdown file")
     batch_parser.add_argument("file", help="Markdown file containing URLs")
     batch_parser.add_argument("--dry-run", action="store_true", help="Preview without processing")
     batch_parser.add_argument("--auto-approve", action="store_true", help="Skip review queue")
+    batch_parser.add_argument("--no-cache", action="store_true", help="Ignore cached extractions and LLM outputs")
+    batch_parser.add_argument(
+        "--concurrency", type=int, default=1, metavar="N",
+        help="Process up to N URLs at once (default: 1)",
+    )
+    batch_parser.add_argument(
+        "--extract-workers", type=int, default=0, metavar="N",
+        help="Pipelined mode: N extraction workers",
+    )
+    batch_parser.add_argument(
+        "--classify-workers", type=int, default=0, metavar="N",
+        help="Pipelined mode: N classification workers",
+    )
+    batch_parser.add_argument(
+        "--queue-size", type=int, default=None, metavar="N",
+        help="Pipelined mode: max extracted documents waiting for classification",
+    )
+
+    # cache command
+    cache_parser = subparsers.add_parser("cache", help="Inspect or trim on-disk caches")
+    cache_parser.add_argument("action", choices=["stats", "prune", "clear"])
+    cache_parser.add_argument(
+        "--max-mb", type=float, default=None,
+        help="prune: disk budget per cache (default: config values)",
+    )
+
+    # dedup command
+    dedup_parser = subparsers.add_parser("dedup", help="Inspect or backfill the near-duplicate index")
+    dedup_parser.add_argument("action", choices=["stats", "backfill"])
+    dedup_parser.add_argument(
+        "--fetch", action="store_true",
+        help="backfill: fetch pages missing from the extraction cache",
+    )
+
+    # relationships command
+    rel_parser = subparsers.add_parser("relationships", help="Inspect or backfill suggested relationships")
+    rel_parser.add_argument("action", choices=["stats", "backfill"])
+    rel_parser.add_argument("--dry-run", action="store_true", help="backfill: report without writing")
+
+    # logs command
+    logs_parser = subparsers.add_parser("logs", help="Analytics over the ingestion and bird logs")
+    logs_parser.add_argument(
+        "report", nargs="*", default=[],
+        help="Reports to show: throughput, latency, confidence, intents, failures (default: all)",
+    )
+    logs_parser.add_argument("--since", default=None, metavar="DATE", help="Only entries on/after DATE (ISO)")
+    logs_parser.add_argument("--until", default=None, metavar="DATE", help="Only entries before DATE (ISO)")
+    logs_parser.add_argument("--format", choices=["text", "json", "csv"], default="text")
+    logs_parser.add_argument("--output", "-o", default=None, metavar="FILE", help="json/csv: write to FILE")
+    logs_parser.add_argument("--bird-runs", type=int, default=20, metavar="N", help="intents: most recent N bird runs")
+
+    # metrics command
+    metrics_parser = subparsers.add_parser("metrics", help="Per-step latency, tokens and cost from run logs")
+    metrics_parser.add_argument("--last", type=int, default=None, metavar="N", help="Only the N most recent runs")
+    metrics_parser.add_argument("--since", default=None, metavar="DATE", help="Only runs started on/after DATE (ISO)")
+    metrics_parser.add_argument("--append", action="store_true", help="Add a row to docs/ingestion-metrics.md")
+    metrics_parser.add_argument(
+        "--method", default="Pipeline (batch)",
+        choices=["Pipeline (batch)", "Pipeline (auto)", "Pipeline (dry-run)"],
+        help="--append: Method column",
+    )
+    metrics_parser.add_argument("--notes", default="", help="--append: Notes column")
 
     args = parser.parse_args()
 
     if args.command == "add":
-        cmd_add(args.url, dry_run=args.dry_run, auto_approve=args.auto_approve)
+        cmd_add(
+            args.url,
+            dry_run=args.dry_run,
+            auto_approve=args.auto_approve,
+            use_cache=not args.no_cache,
+        )
     elif args.command == "review":
-        cmd_review()
+        cmd_review(
+            approve_all=args.approve_all,
+            min_confidence=args.min_confidence,
+            domain=args.domain,
+        )
     elif args.command == "batch":
-        cmd_batch(args.file, dry_run=args.dry_run, auto_approve=args.auto_approve)
+        cmd_batch(
+            args.file,
+            dry_run=args.dry_run,
+            auto_approve=args.auto_approve,
+            concurrency=max(1, args.concurrency),
+            extract_workers=max(0, args.extract_workers),
+            classify_workers=max(0, args.classify_workers),
+            queue_size=args.queue_size,
+            use_cache=not args.no_cache,
+        )
+    elif args.command == "cache":
+        cmd_cache(args.action, max_mb=args.max_mb)
+    elif args.command == "dedup":
+        cmd_dedup(args.action, fetch=args.fetch)
+    elif args.command == "relationships":
+        cmd_relationships(args.action, dry_run=args.dry_run)
+    elif args.command == "logs":
+        from ingestion.analytics import REPORTS
+
+        if unknown := set(args.report) - set(REPORTS):
+            parser.error(f"unknown report(s): {', '.join(sorted(unknown))} (choose from {', '.join(REPORTS)})")
+        cmd_logs(
+            args.report or list(REPORTS),
+            since=args.since,
+            until=args.until,
+            fmt=args.format,
+            output=args.output,
+            bird_runs=args.bird_runs,
+        )
+    elif args.command == "metrics":
+        cmd_metrics(
+            last=args.last,
+            since=args.since,
+            append=args.append,
+            method=args.method,
+            notes=args.notes,
+        )
 
 
 if __name__ == "__main__":
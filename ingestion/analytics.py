@@ -0,0 +1,307 @@
+"""
+Streaming analytics over the ingestion and bird logs.
+
+Reads the ingestion run log (logger.iter_runs: legacy JSON files and JSONL
+segments) and queues/bird-log.jsonl one record at a time, folding each
+into fixed-size aggregates:
+
+- throughput: runs, successes and failures per day
+- latency: per-step histograms over fixed buckets (percentiles are read
+  off the histogram, so no samples are kept)
+- confidence: classification confidence histogram per domain
+- intents: intent mix of the most recent bird runs
+- failures: failed runs by step and normalized error
+
+Memory grows with the number of days, steps, domains and distinct
+failure reasons, not with the number of runs. Results export as JSON or
+tidy CSV (report, group, metric, value) for dashboards.
+"""
+
+import csv
+import json
+import re
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional
+
+REPORTS = ("throughput", "latency", "confidence", "intents", "failures")
+
+# Upper bounds (seconds) of the latency buckets; the last bucket is open
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+CONFIDENCE_BUCKETS = 10
+LOW_CONFIDENCE = 0.7
+
+# Bird runs kept for the intent report (older ones are dropped as we stream)
+DEFAULT_BIRD_RUNS = 20
+
+# Bird log entries without a run_id further apart than this are separate runs
+LEGACY_RUN_GAP_S = 300
+
+_VOLATILE = re.compile(r"https?://\S+|\b[0-9a-f]{8,}\b|\d+")
+
+
+@dataclass
+class Histogram:
+    """Counts over fixed bucket bounds, with approximate percentiles."""
+    bounds: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    n: int = 0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def add(self, value: float):
+        i = 0
+        while i < len(self.bounds) and value > self.bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += value
+        self.n += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.n if self.n else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th value (inf if open)."""
+        if not self.n:
+            return 0.0
+        target = pct / 100 * self.n
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return self.bounds[i] if i < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def count_at_most(self, bound: float) -> int:
+        """Values in buckets whose upper bound is <= bound."""
+        return sum(c for upper, c in zip(self.bounds, self.counts) if upper <= bound)
+
+    def labels(self) -> list[str]:
+        edges = [0.0, *self.bounds]
+        labels = [f"{edges[i]:g}-{edges[i + 1]:g}" for i in range(len(self.bounds))]
+        return [*labels, f">{self.bounds[-1]:g}"]
+
+
+def _confidence_histogram() -> Histogram:
+    return Histogram(tuple(round((i + 1) / CONFIDENCE_BUCKETS, 2) for i in range(CONFIDENCE_BUCKETS - 1)))
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def failure_reason(error: Optional[str]) -> str:
+    """Group errors that differ only in URLs, IDs and numbers."""
+    if not error:
+        return "unknown"
+    reason = _VOLATILE.sub("…", error.strip().splitlines()[0])
+    return reason[:100]
+
+
+# =============================================================================
+# AGGREGATION
+# =============================================================================
+
+@dataclass
+class LogReport:
+    """Aggregates of the ingestion and bird logs."""
+    days: dict[str, Counter] = field(default_factory=dict)
+    latency: dict[str, Histogram] = field(default_factory=dict)
+    confidence: dict[str, Histogram] = field(default_factory=dict)
+    failures: Counter = field(default_factory=Counter)
+    bird_runs: deque = field(default_factory=lambda: deque(maxlen=DEFAULT_BIRD_RUNS))
+    runs: int = 0
+    bird_entries: int = 0
+
+    def add_run(self, run: dict):
+        """Fold one ingestion run into the aggregates."""
+        self.runs += 1
+        day = (run.get("started_at") or "")[:10] or "unknown"
+        counts = self.days.setdefault(day, Counter())
+        counts["runs"] += 1
+        counts["succeeded" if run.get("success") else "failed"] += 1
+        if run.get("duration_s") is not None:
+            counts["seconds"] += run["duration_s"]
+
+        steps = run.get("steps", [])
+        for step in steps:
+            duration = (step.get("metrics") or {}).get("duration_s")
+            if duration is not None:
+                self.latency.setdefault(step["step"], Histogram(LATENCY_BUCKETS)).add(duration)
+            if step["step"] == "classification":
+                outputs = step.get("outputs") or {}
+                if outputs.get("confidence") is not None:
+                    domain = outputs.get("domain") or "unknown"
+                    self.confidence.setdefault(domain, _confidence_histogram()).add(float(outputs["confidence"]))
+
+        if not run.get("success"):
+            last_step = steps[-1]["step"] if steps else "start"
+            self.failures[(last_step, failure_reason(run.get("error")))] += 1
+
+    def add_bird_entries(self, entries: Iterable[dict]):
+        """Fold bird log entries (in file order) into per-run intent counts."""
+        current_id, current, previous = None, None, None
+        for entry in entries:
+            self.bird_entries += 1
+            timestamp = _parse_time(entry.get("timestamp"))
+            run_id = entry.get("run_id")
+            if run_id is None:
+                # Entries from before run IDs: a gap of LEGACY_RUN_GAP_S starts a new run
+                gap = (timestamp - previous).total_seconds() if timestamp and previous else None
+                same_run = current_id and current_id.startswith("legacy-") and gap is not None and gap <= LEGACY_RUN_GAP_S
+                run_id = current_id if same_run else f"legacy-{(entry.get('timestamp') or '')[:19]}"
+            if run_id != current_id:
+                current_id, current = run_id, Counter()
+                self.bird_runs.append((run_id, (entry.get("timestamp") or "")[:19], current))
+            current[entry.get("intent") or "unknown"] += 1
+            previous = timestamp or previous
+
+    # -------------------------------------------------------------------------
+
+    def rows(self, reports: Iterable[str] = REPORTS) -> Iterator[tuple[str, str, str, object]]:
+        """Tidy (report, group, metric, value) rows."""
+        reports = set(reports)
+        if "throughput" in reports:
+            for day in sorted(self.days):
+                counts = self.days[day]
+                for metric in ("runs", "succeeded", "failed"):
+                    yield "throughput", day, metric, counts[metric]
+                if counts["runs"]:
+                    yield "throughput", day, "mean_run_s", round(counts["seconds"] / counts["runs"], 3)
+        if "latency" in reports:
+            for step, hist in self.latency.items():
+                yield "latency", step, "n", hist.n
+                yield "latency", step, "mean_s", round(hist.mean, 3)
+                yield "latency", step, "p50_s", hist.percentile(50)
+                yield "latency", step, "p95_s", hist.percentile(95)
+                for label, count in zip(hist.labels(), hist.counts):
+                    yield "latency", step, f"bucket_{label}", count
+        if "confidence" in reports:
+            for domain in sorted(self.confidence):
+                hist = self.confidence[domain]
+                low = hist.count_at_most(LOW_CONFIDENCE)
+                yield "confidence", domain, "n", hist.n
+                yield "confidence", domain, "mean", round(hist.mean, 3)
+                yield "confidence", domain, f"at_most_{LOW_CONFIDENCE:g}", low
+                for label, count in zip(hist.labels(), hist.counts):
+                    yield "confidence", domain, f"bucket_{label}", count
+        if "intents" in reports:
+            for run_id, _, intents in self.bird_runs:
+                for intent, count in sorted(intents.items()):
+                    yield "intents", run_id, intent, count
+        if "failures" in reports:
+            for (step, reason), count in self.failures.most_common():
+                yield "failures", step, reason, count
+
+    def as_dict(self, reports: Iterable[str] = REPORTS) -> dict:
+        """Nested {report: {group: {metric: value}}}."""
+        data: dict = {}
+        for report, group, metric, value in self.rows(reports):
+            data.setdefault(report, {}).setdefault(group, {})[metric] = value
+        return data
+
+
+def _in_range(record_time: Optional[str], since: Optional[str], until: Optional[str]) -> bool:
+    time = record_time or ""
+    return (not since or time >= since) and (not until or time < until)
+
+
+def iter_jsonl(path: Path) -> Iterator[dict]:
+    """Records of a JSONL file, one line at a time (bad lines skipped)."""
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def build_report(
+    runs: Iterable[dict],
+    bird_entries: Iterable[dict] = (),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    bird_runs: int = DEFAULT_BIRD_RUNS,
+) -> LogReport:
+    """Stream both logs into a LogReport (since/until: ISO dates or times)."""
+    report = LogReport(bird_runs=deque(maxlen=max(1, bird_runs)))
+    for run in runs:
+        if _in_range(run.get("started_at"), since, until):
+            report.add_run(run)
+    report.add_bird_entries(e for e in bird_entries if _in_range(e.get("timestamp"), since, until))
+    return report
+
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+def write_csv(report: LogReport, out: IO[str], reports: Iterable[str] = REPORTS):
+    writer = csv.writer(out)
+    writer.writerow(["report", "group", "metric", "value"])
+    writer.writerows(report.rows(reports))
+
+
+def write_json(report: LogReport, out: IO[str], reports: Iterable[str] = REPORTS):
+    json.dump(report.as_dict(reports), out, indent=2, default=str)
+    out.write("\n")
+
+
+def _bar(count: int, peak: int, width: int = 20) -> str:
+    return "█" * max(1 if count else 0, round(width * count / peak)) if peak else ""
+
+
+def format_report(report: LogReport, reports: Iterable[str] = REPORTS) -> str:
+    """Human-readable report for the terminal."""
+    reports = set(reports)
+    lines = [f"📒 {report.runs} ingestion runs, {report.bird_entries} bird log entries"]
+
+    if "throughput" in reports and report.days:
+        lines += ["", "Throughput per day", f"  {'Day':<12} {'runs':>6} {'ok':>6} {'failed':>7} {'mean s':>8}"]
+        for day in sorted(report.days):
+            c = report.days[day]
+            mean = c["seconds"] / c["runs"] if c["runs"] else 0
+            lines.append(f"  {day:<12} {c['runs']:>6} {c['succeeded']:>6} {c['failed']:>7} {mean:>8.1f}")
+
+    if "latency" in reports and report.latency:
+        lines += ["", "Step latency (histogram bucket bounds, seconds)"]
+        for step, hist in report.latency.items():
+            lines.append(f"  {step:<22} n={hist.n:<6} mean={hist.mean:.2f}s "
+                         f"p50≤{hist.percentile(50):g}s p95≤{hist.percentile(95):g}s")
+            peak = max(hist.counts)
+            for label, count in zip(hist.labels(), hist.counts):
+                if count:
+                    lines.append(f"    {label:>9}s {_bar(count, peak):<20} {count}")
+
+    if "confidence" in reports and report.confidence:
+        lines += ["", f"Classification confidence by domain (low = at most {LOW_CONFIDENCE:g})"]
+        for domain in sorted(report.confidence, key=lambda d: report.confidence[d].mean):
+            hist = report.confidence[domain]
+            low = hist.count_at_most(LOW_CONFIDENCE)
+            spark = "".join(" ▁▂▃▄▅▆▇█"[min(8, round(8 * c / max(hist.counts)))] for c in hist.counts)
+            lines.append(f"  {domain:<28} n={hist.n:<5} mean={hist.mean:.2f} low={low / hist.n:>4.0%}  |{spark}|")
+
+    if "intents" in reports and report.bird_runs:
+        lines += ["", f"Bird intent mix (last {len(report.bird_runs)} runs)"]
+        for run_id, started, intents in report.bird_runs:
+            mix = ", ".join(f"{intent} {count}" for intent, count in intents.most_common())
+            lines.append(f"  {started or run_id:<20} {sum(intents.values()):>4}  {mix}")
+
+    if "failures" in reports and report.failures:
+        lines += ["", "Failures"]
+        for (step, reason), count in report.failures.most_common(20):
+            lines.append(f"  {count:>4} × [{step}] {reason}")
+
+    return "\n".join(lines)
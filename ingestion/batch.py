@@ -0,0 +1,251 @@
+"""
+Concurrent batch processing helpers.
+
+Runs per-URL work on a bounded thread pool while keeping console output
+readable: everything a worker prints is buffered and written as one block
+when that URL finishes. The staged mode overlaps extraction (subprocess
+bound) with classification (LLM bound) through a bounded hand-off queue.
+"""
+
+import io
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+
+class ThreadBufferedStdout(io.TextIOBase):
+    """stdout proxy that routes writes to a per-thread buffer when capturing.
+
+    Threads that are not capturing write straight through to the real
+    stream, so the main thread's progress output is unaffected.
+    """
+
+    def __init__(self, target):
+        self._target = target
+        self._local = threading.local()
+        self._emit_lock = threading.Lock()
+
+    def write(self, s: str) -> int:
+        buf = getattr(self._local, "buf", None)
+        if buf is not None:
+            return buf.write(s)
+        with self._emit_lock:
+            return self._target.write(s)
+
+    def flush(self):
+        if getattr(self._local, "buf", None) is None:
+            self._target.flush()
+
+    @contextmanager
+    def capture(self) -> Iterator[None]:
+        """Buffer this thread's output and emit it as one block on exit."""
+        self._local.buf = io.StringIO()
+        try:
+            yield
+        finally:
+            text = self._local.buf.getvalue()
+            self._local.buf = None
+            with self._emit_lock:
+                self._target.write(text)
+                self._target.flush()
+
+
+@contextmanager
+def buffered_stdout() -> Iterator[ThreadBufferedStdout]:
+    """Install a ThreadBufferedStdout as sys.stdout for the duration."""
+    original = sys.stdout
+    proxy = ThreadBufferedStdout(original)
+    sys.stdout = proxy
+    try:
+        yield proxy
+    finally:
+        sys.stdout = original
+
+
+def run_concurrent(
+    items: Iterable[Any],
+    worker: Callable[[int, Any], bool],
+    max_workers: int,
+) -> list[tuple[Any, bool]]:
+    """
+    Run worker(index, item) for each item on a bounded thread pool.
+
+    Each worker's console output is printed as one uninterrupted block.
+    Exceptions (including SystemExit from CLI helpers) count as failures.
+
+    Args:
+        items: Work items, numbered from 1 in submission order
+        worker: Callable returning True on success
+        max_workers: Maximum number of items in flight
+
+    Returns:
+        List of (item, succeeded) in completion order
+    """
+    items = list(items)
+    outcomes: list[tuple[Any, bool]] = []
+
+    with buffered_stdout() as out:
+
+        def run_one(index: int, item: Any) -> bool:
+            with out.capture():
+                try:
+                    return bool(worker(index, item))
+                except SystemExit:
+                    return False
+                except Exception as e:
+                    print(f"  ✗ Error: {e}")
+                    return False
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(run_one, i, item): item
+                for i, item in enumerate(items, 1)
+            }
+            for future in as_completed(futures):
+                outcomes.append((futures[future], future.result()))
+
+    return outcomes
+
+
+# =============================================================================
+# STAGE-PIPELINED MODE
+# =============================================================================
+
+@dataclass
+class StageStats:
+    """Occupancy counters for one pipeline stage."""
+    name: str
+    workers: int
+    items: int = 0
+    busy_seconds: float = 0.0
+    # Producer time blocked on a full hand-off queue, or consumer time
+    # waiting on an empty one
+    waiting_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, busy: float = 0.0, waiting: float = 0.0, items: int = 0):
+        with self._lock:
+            self.busy_seconds += busy
+            self.waiting_seconds += waiting
+            self.items += items
+
+    def occupancy(self, wall_seconds: float) -> float:
+        """Fraction of available worker time spent doing work."""
+        if wall_seconds <= 0 or self.workers <= 0:
+            return 0.0
+        return min(1.0, self.busy_seconds / (wall_seconds * self.workers))
+
+
+def run_staged(
+    items: Iterable[Any],
+    extract: Callable[[Any], Any],
+    process: Callable[[int, Any, Any], bool],
+    extract_workers: int,
+    process_workers: int,
+    max_pending: Optional[int] = None,
+) -> tuple[list[tuple[Any, bool]], list[StageStats], float]:
+    """
+    Run a two-stage producer/consumer pipeline over items.
+
+    Extraction workers call extract(item) and hand results to processing
+    workers through a bounded queue. When the queue is full, extraction
+    blocks, so at most max_pending extracted documents are held in memory.
+    Extraction errors are passed to process() as the payload and should be
+    reported there.
+
+    Args:
+        items: Work items, numbered from 1 in submission order
+        extract: Callable producing the payload for an item (silent)
+        process: Callable(index, item, payload) returning True on success
+        extract_workers: Threads in the extraction stage
+        process_workers: Threads in the processing stage
+        max_pending: Hand-off queue bound (default: 2 x process_workers)
+
+    Returns:
+        (outcomes in completion order, [extract stats, process stats], wall seconds)
+    """
+    todo: queue.Queue = queue.Queue()
+    for i, item in enumerate(items, 1):
+        todo.put((i, item))
+
+    handoff: queue.Queue = queue.Queue(maxsize=max_pending or 2 * process_workers)
+    done = object()
+
+    extract_stats = StageStats("extract", extract_workers)
+    process_stats = StageStats("classify", process_workers)
+    outcomes: list[tuple[Any, bool]] = []
+    outcomes_lock = threading.Lock()
+
+    def extract_loop():
+        while True:
+            try:
+                index, item = todo.get_nowait()
+            except queue.Empty:
+                return
+            start = time.monotonic()
+            try:
+                payload = extract(item)
+            except Exception as e:
+                payload = e
+            busy = time.monotonic() - start
+
+            start = time.monotonic()
+            handoff.put((index, item, payload))
+            extract_stats.add(busy=busy, waiting=time.monotonic() - start, items=1)
+
+    def process_loop(out: ThreadBufferedStdout):
+        while True:
+            start = time.monotonic()
+            entry = handoff.get()
+            waited = time.monotonic() - start
+            if entry is done:
+                process_stats.add(waiting=waited)
+                return
+
+            index, item, payload = entry
+            start = time.monotonic()
+            with out.capture():
+                try:
+                    ok = bool(process(index, item, payload))
+                except SystemExit:
+                    ok = False
+                except Exception as e:
+                    print(f"  ✗ Error: {e}")
+                    ok = False
+            process_stats.add(busy=time.monotonic() - start, waiting=waited, items=1)
+            with outcomes_lock:
+                outcomes.append((item, ok))
+
+    wall_start = time.monotonic()
+    with buffered_stdout() as out:
+        extractors = [threading.Thread(target=extract_loop, daemon=True) for _ in range(extract_workers)]
+        processors = [threading.Thread(target=process_loop, args=(out,), daemon=True) for _ in range(process_workers)]
+        for t in extractors + processors:
+            t.start()
+        for t in extractors:
+            t.join()
+        for _ in processors:
+            handoff.put(done)
+        for t in processors:
+            t.join()
+
+    return outcomes, [extract_stats, process_stats], time.monotonic() - wall_start
+
+
+def format_stage_stats(stats: list[StageStats], wall_seconds: float) -> str:
+    """Format stage occupancy for the batch summary."""
+    lines = [f"⏱  Stage occupancy (wall {wall_seconds:.1f}s)"]
+    for s in stats:
+        wait_label = "blocked on full queue" if s.name == "extract" else "idle waiting for input"
+        lines.append(
+            f"  {s.name:<9} {s.workers} worker(s)  busy {s.occupancy(wall_seconds):.0%}"
+            f"  {wait_label} {s.waiting_seconds:.1f}s  ({s.items} items)"
+        )
+    bottleneck = max(stats, key=lambda s: s.occupancy(wall_seconds))
+    lines.append(f"  → {bottleneck.name} is the bottleneck; add workers there first")
+    return "\n".join(lines)
@@ -0,0 +1,295 @@
+"""
+Persistent on-disk caches.
+
+DiskCache is a small SQLite-backed key/value store with size-bounded LRU
+eviction and optional per-entry TTL. StageCache sits in front of the DSPy
+modules in classifiers.py so identical inputs never hit the LLM provider
+twice; ExtractionCache keeps extract_url results so a dry run, a real run
+and a review approval only fetch a page once.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Any, Optional
+
+# Default location for all ingestion caches
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+
+# Eviction frees space down to this share of max_bytes, so it runs once per
+# ~10% of the budget written rather than on every set() once full
+LOW_WATER = 0.9
+
+
+class DiskCache:
+    """SQLite-backed key/value cache with LRU eviction by total size.
+
+    Safe to share between threads; SQLite's WAL mode lets separate
+    processes (e.g. a batch and a review session) use the same file.
+    The total size is tracked in memory and re-read from the file only
+    when it says the cache is over budget (other processes may have
+    written or evicted since).
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 200 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                expires REAL
+            )"""
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "expires" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN expires REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+        self._conn.commit()
+        self._total = self._stored_bytes()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        """Store a value (expiring after ttl seconds, if given).
+
+        Evicts least-recently-used entries if the cache goes over budget.
+        """
+        now = time.time()
+        expires = now + ttl if ttl else None
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed, expires)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now, expires),
+            )
+            self._total += len(value) - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._total = self._stored_bytes()
+                self._evict(int(self.max_bytes * LOW_WATER))
+            self._conn.commit()
+
+    def get_json(self, key: str) -> Any:
+        value = self.get(key)
+        return None if value is None else json.loads(value)
+
+    def set_json(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.set(key, json.dumps(value).encode(), ttl=ttl)
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Drop expired entries, then evict LRU entries until the cache fits
+        max_bytes. Returns entries removed."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (time.time(),)
+            ).rowcount
+            self._total = self._stored_bytes()
+            removed += self._evict(self.max_bytes if max_bytes is None else max_bytes)
+            self._conn.commit()
+        if removed:
+            self._conn.execute("VACUUM")
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._total = 0
+        self._conn.execute("VACUUM")
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "entries": count,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _stored_bytes(self) -> int:
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return total
+
+    def _evict(self, max_bytes: int) -> int:
+        """Delete least-recently-used entries until the total fits max_bytes.
+
+        Walks the accessed index only as far as the excess, then removes
+        everything up to that point with a single DELETE.
+        """
+        excess = self._total - max_bytes
+        if excess <= 0:
+            return 0
+
+        freed, cutoff = 0, None
+        for size, accessed in self._conn.execute("SELECT size, accessed FROM entries ORDER BY accessed ASC"):
+            freed += size
+            cutoff = accessed
+            if freed >= excess:
+                break
+        if cutoff is None:
+            return 0
+
+        # Entries sharing the cutoff's timestamp go too
+        (freed,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries WHERE accessed <= ?", (cutoff,)
+        ).fetchone()
+        removed = self._conn.execute("DELETE FROM entries WHERE accessed <= ?", (cutoff,)).rowcount
+        self._total -= freed
+        return removed
+
+
+# =============================================================================
+# DSPy STAGE CACHE
+# =============================================================================
+
+# Bump when module post-processing changes in a way that invalidates
+# previously cached outputs
+STAGE_CACHE_VERSION = 1
+
+
+def _hash(obj: Any) -> str:
+    data = json.dumps(obj, sort_keys=True, default=str).encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def signature_fingerprint(module) -> str:
+    """Hash the prompts (instructions, fields, demos) behind a dspy.Module."""
+    parts = []
+    for name, predictor in module.named_predictors():
+        sig = predictor.signature
+        field_descs = {
+            field_name: getattr(field, "json_schema_extra", None) or str(field)
+            for field_name, field in getattr(sig, "fields", {}).items()
+        }
+        demos = [dict(d) if hasattr(d, "keys") else str(d) for d in getattr(predictor, "demos", [])]
+        parts.append({
+            "predictor": name,
+            "instructions": getattr(sig, "instructions", ""),
+            "fields": field_descs,
+            "demos": demos,
+        })
+    return _hash(parts)
+
+
+def current_model_name() -> str:
+    """Model name of the configured DSPy LM."""
+    import dspy
+
+    lm = getattr(dspy.settings, "lm", None)
+    return getattr(lm, "model", "") if lm is not None else ""
+
+
+class StageCache:
+    """Content-addressed cache of DSPy module outputs.
+
+    Keys combine the module name, a hash of its signature/prompt, the
+    model name and a hash of the input fields. Outputs must be
+    JSON-serializable (the pipeline modules return dicts or strings).
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = 200 * 1024 * 1024):
+        self.store = DiskCache(path or CACHE_DIR / "llm-stages.sqlite", max_bytes=max_bytes)
+        self._fingerprints: dict[type, str] = {}
+
+    def key_for(self, module, inputs: dict) -> str:
+        cls = type(module)
+        if cls not in self._fingerprints:
+            self._fingerprints[cls] = signature_fingerprint(module)
+        return _hash({
+            "version": STAGE_CACHE_VERSION,
+            "module": cls.__name__,
+            "signature": self._fingerprints[cls],
+            # Modules with their own LM (e.g. ChunkSummarizer) key on it
+            "model": getattr(getattr(module, "lm", None), "model", None) or current_model_name(),
+            "inputs": _hash(inputs),
+        })
+
+    def call(self, module, **inputs) -> tuple[Any, bool]:
+        """
+        Call module(**inputs), serving repeat calls from the cache.
+
+        Returns:
+            (output, cache_hit)
+        """
+        key = self.key_for(module, inputs)
+        cached = self.store.get_json(key)
+        if cached is not None:
+            return cached["output"], True
+
+        output = module(**inputs)
+        self.store.set_json(key, {"module": type(module).__name__, "output": output})
+        return output, False
+
+    def stats(self) -> dict:
+        return self.store.stats()
+
+
+# =============================================================================
+# EXTRACTION CACHE
+# =============================================================================
+
+class ExtractionCache:
+    """Cache of ExtractedContent keyed on normalized URL.
+
+    Entries are zlib-compressed JSON and expire after ttl seconds so pages
+    that change are eventually re-fetched.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_bytes: int = 500 * 1024 * 1024,
+        ttl: Optional[float] = 7 * 24 * 3600,
+    ):
+        self.store = DiskCache(path or CACHE_DIR / "extraction.sqlite", max_bytes=max_bytes)
+        self.ttl = ttl
+
+    def get(self, normalized_url: str):
+        """Return cached ExtractedContent for a normalized URL, or None."""
+        from .extractor import ExtractedContent
+
+        value = self.store.get(normalized_url)
+        if value is None:
+            return None
+        data = json.loads(zlib.decompress(value))
+        known = {f.name for f in fields(ExtractedContent)}
+        return ExtractedContent(**{k: v for k, v in data.items() if k in known})
+
+    def set(self, normalized_url: str, extracted):
+        value = zlib.compress(json.dumps(asdict(extracted)).encode())
+        self.store.set(normalized_url, value, ttl=self.ttl)
+
+    def stats(self) -> dict:
+        return self.store.stats()
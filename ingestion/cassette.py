@@ -0,0 +1,291 @@
+"""
+Record/replay cassettes for offline pipeline benchmarks.
+
+The pipeline touches the network in three places: extract_url (the
+summarize CLI), LM calls (every LM is built by make_lm from
+metering.MeteredLM) and GitHub author enrichment. recording() wraps all
+three and stores what they return in a Cassette; replaying() serves the
+stored results instead, with configurable LM latency and an injected
+rate-limit error rate, so throughput can be measured without live
+services (see scripts/bench_ingestion.py).
+
+LM responses are keyed on the exact prompt messages. When a prompt has
+changed since recording (e.g. after a preprocessing change), replay
+falls back to a response recorded for the same signature, so the
+pipeline still runs; such calls are counted as near misses.
+"""
+
+import functools
+import hashlib
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterator, Optional
+
+from . import extractor, github_enrichment, metering
+from .metering import MeteredLM
+from .urls import normalize_url
+
+CASSETTE_VERSION = 1
+
+
+class RateLimitError(Exception):
+    """Injected provider error; its name is in metering.TRANSIENT_ERRORS, so it is retried."""
+
+
+class CassetteMiss(KeyError):
+    """Replay asked for something the cassette never recorded."""
+
+
+def _messages_key(prompt, messages) -> str:
+    payload = json.dumps({"prompt": prompt, "messages": messages}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _signature_key(prompt, messages) -> str:
+    """Key for the call's instructions (the system message), ignoring its inputs."""
+    system = next((m.get("content") for m in messages or [] if m.get("role") == "system"), prompt)
+    return hashlib.sha256(str(system).encode()).hexdigest()
+
+
+class Cassette:
+    """Recorded extractions, LM responses and GitHub lookups.
+
+    Usage:
+        cassette = Cassette.load(path)      # or Cassette() to record
+        with replaying(cassette, lm_latency=0.5):
+            ...                             # run the pipeline
+        cassette.stats                      # hits / near_misses / ...
+
+    Safe to share between threads.
+    """
+
+    def __init__(self):
+        self.extractions: dict[str, dict] = {}
+        self.lm: dict[str, dict] = {}
+        self.signatures: dict[str, str] = {}   # signature key -> an lm key
+        self.github: dict[str, dict] = {}
+        self.stats = {"hits": 0, "near_misses": 0, "errors_injected": 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {path}: {data.get('version')}")
+        cassette = cls()
+        cassette.extractions = data["extractions"]
+        cassette.lm = data["lm"]
+        cassette.signatures = data["signatures"]
+        cassette.github = data["github"]
+        return cassette
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "version": CASSETTE_VERSION,
+                "extractions": self.extractions,
+                "lm": self.lm,
+                "signatures": self.signatures,
+                "github": self.github,
+            }
+        path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+
+    @property
+    def urls(self) -> list[str]:
+        """Recorded URLs, in recording order."""
+        return [e["url"] for e in self.extractions.values()]
+
+    # -------------------------------------------------------------------------
+
+    def record_extraction(self, extracted):
+        with self._lock:
+            self.extractions[normalize_url(extracted.url)] = asdict(extracted)
+
+    def replay_extraction(self, url: str):
+        data = self.extractions.get(normalize_url(url))
+        if data is None:
+            raise CassetteMiss(f"No recorded extraction for {url}")
+        known = extractor.ExtractedContent.__dataclass_fields__
+        return extractor.ExtractedContent(**{k: v for k, v in data.items() if k in known})
+
+    def record_lm(self, prompt, messages, outputs, entry: Optional[dict], seconds: float):
+        key = _messages_key(prompt, messages)
+        with self._lock:
+            self.lm[key] = {
+                "outputs": outputs,
+                "usage": dict((entry or {}).get("usage") or {}),
+                "latency_s": round(seconds, 3),
+            }
+            self.signatures.setdefault(_signature_key(prompt, messages), key)
+
+    def replay_lm(self, prompt, messages) -> dict:
+        key = _messages_key(prompt, messages)
+        with self._lock:
+            if key in self.lm:
+                self.stats["hits"] += 1
+                return self.lm[key]
+            fallback = self.signatures.get(_signature_key(prompt, messages))
+            if fallback is None:
+                raise CassetteMiss("No recorded LM response for this signature")
+            self.stats["near_misses"] += 1
+            return self.lm[fallback]
+
+    def github_key(self, author_name: str, author_id: str, source_url: Optional[str]) -> str:
+        return json.dumps([author_name, author_id, source_url or ""])
+
+
+# =============================================================================
+# LMs
+# =============================================================================
+
+class RecordingLM(MeteredLM):
+    """MeteredLM that stores every response in a cassette."""
+
+    def __init__(self, model: str, cassette: Cassette, **kwargs):
+        super().__init__(model, **kwargs)
+        self.cassette = cassette
+
+    def _complete(self, prompt, messages, **kwargs):
+        start = time.monotonic()
+        outputs = super()._complete(prompt, messages, **kwargs)
+        self.cassette.record_lm(
+            prompt, messages, outputs, self._history_entry(prompt, messages), time.monotonic() - start
+        )
+        return outputs
+
+
+class ReplayLM(MeteredLM):
+    """MeteredLM that answers from a cassette instead of the provider.
+
+    Args:
+        lm_latency: Seconds per call; None replays the recorded latency
+        jitter: +/- fraction of the latency, drawn uniformly
+        error_rate: Share of calls that raise RateLimitError (retried by
+            MeteredLM like a real rate limit)
+        seed: Random seed for jitter and errors
+    """
+
+    def __init__(
+        self,
+        model: str,
+        cassette: Cassette,
+        lm_latency: Optional[float] = None,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        **kwargs,
+    ):
+        super().__init__(model, **kwargs)
+        self.cassette = cassette
+        self.lm_latency = lm_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def _complete(self, prompt, messages, **kwargs):
+        recorded = self.cassette.replay_lm(prompt, messages)
+        latency = recorded.get("latency_s", 0.0) if self.lm_latency is None else self.lm_latency
+        with self._random_lock:
+            latency *= 1 + self.jitter * (2 * self._random.random() - 1)
+            fail = self._random.random() < self.error_rate
+        time.sleep(max(0.0, latency))
+        if fail:
+            with self.cassette._lock:
+                self.cassette.stats["errors_injected"] += 1
+            raise RateLimitError("injected rate limit")
+        # Same shape as a provider call's history entry, for metering
+        self.history.append({
+            "prompt": prompt,
+            "messages": messages,
+            "kwargs": kwargs,
+            "outputs": recorded["outputs"],
+            "usage": recorded.get("usage") or {},
+            "cost": None,
+        })
+        return list(recorded["outputs"])
+
+
+# =============================================================================
+# PATCHING
+# =============================================================================
+
+@contextmanager
+def _patched(target, name: str, value) -> Iterator[None]:
+    original = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, original)
+
+
+@contextmanager
+def recording(cassette: Cassette) -> Iterator[Cassette]:
+    """Run live, storing extractions, LM responses and GitHub lookups."""
+    live_extract, live_enrich = extractor.extract_url, github_enrichment.enrich_author
+
+    def extract_url(url: str, *args, **kwargs):
+        extracted = live_extract(url, *args, **kwargs)
+        cassette.record_extraction(extracted)
+        return extracted
+
+    def enrich_author(author_name: str, author_id: str, source_url: Optional[str] = None, **kwargs):
+        result = live_enrich(author_name=author_name, author_id=author_id, source_url=source_url, **kwargs)
+        with cassette._lock:
+            cassette.github[cassette.github_key(author_name, author_id, source_url)] = result
+        return result
+
+    with _patched(extractor, "extract_url", extract_url), \
+            _patched(github_enrichment, "enrich_author", enrich_author), \
+            _patched(metering, "MeteredLM", functools.partial(RecordingLM, cassette=cassette)):
+        yield cassette
+
+
+@contextmanager
+def replaying(
+    cassette: Cassette,
+    lm_latency: Optional[float] = None,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    fetch_latency: Optional[float] = None,
+    retry_backoff: float = 0.05,
+    seed: int = 0,
+) -> Iterator[Cassette]:
+    """Serve extractions, LM responses and GitHub lookups from the cassette.
+
+    Args:
+        lm_latency / jitter / error_rate / seed: See ReplayLM
+        fetch_latency: Seconds per extraction; None replays the recorded time
+        retry_backoff: MeteredLM backoff base for injected errors
+    """
+    def extract_url(url: str, *args, **kwargs):
+        extracted = cassette.replay_extraction(url)
+        delay = (extracted.fetch_seconds or 0.0) if fetch_latency is None else fetch_latency
+        time.sleep(delay)
+        extracted.fetch_seconds = delay
+        return extracted
+
+    def enrich_author(author_name: str, author_id: str, source_url: Optional[str] = None, **kwargs):
+        return cassette.github.get(cassette.github_key(author_name, author_id, source_url)) or {}
+
+    lm = functools.partial(
+        ReplayLM,
+        cassette=cassette,
+        lm_latency=lm_latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        seed=seed,
+        backoff=retry_backoff,
+    )
+    with _patched(extractor, "extract_url", extract_url), \
+            _patched(github_enrichment, "enrich_author", enrich_author), \
+            _patched(metering, "MeteredLM", lm):
+        yield cassette
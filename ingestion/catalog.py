@@ -0,0 +1,90 @@
+"""
+Shared YAML loader for the catalog and queue files.
+
+Parses with the libyaml C loader when PyYAML was built with it, and keeps
+a pickle snapshot of each parsed file keyed on its content hash, so
+repeat loads of an unchanged file skip YAML parsing entirely.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+from .cache import CACHE_DIR
+
+# libyaml-backed loader if available (several times faster than SafeLoader)
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+SNAPSHOT_DIR = CACHE_DIR / "snapshots"
+
+
+def parse_yaml(text: str) -> Any:
+    """Parse YAML text with the fastest available safe loader."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def load_yaml(
+    path: Path,
+    default: Any = None,
+    snapshot: bool = True,
+    snapshot_dir: Optional[Path] = None,
+) -> Any:
+    """
+    Load a YAML file, serving unchanged files from a snapshot.
+
+    Args:
+        path: YAML file to load
+        default: Returned if the file is missing or empty
+        snapshot: Use (and write) the pickle snapshot for this file
+        snapshot_dir: Where snapshots live (default: .cache/snapshots)
+
+    Returns:
+        Parsed document (a fresh copy; callers may mutate it)
+    """
+    path = Path(path)
+    if not path.exists():
+        return default
+
+    raw = path.read_bytes()
+    if not snapshot:
+        data = parse_yaml(raw)
+        return default if data is None else data
+
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    # One snapshot per source file (prefix) per content version (digest)
+    prefix = f"{path.stem}-{hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:8]}"
+    digest = hashlib.sha256(raw).hexdigest()[:32]
+    snapshot_file = snapshot_dir / f"{prefix}-{digest}.pickle"
+
+    if snapshot_file.exists():
+        try:
+            with open(snapshot_file, "rb") as f:
+                data = pickle.load(f)
+            return default if data is None else data
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass  # Corrupt snapshot; re-parse below
+
+    data = parse_yaml(raw)
+    _write_snapshot(snapshot_file, data, prefix=prefix)
+    return default if data is None else data
+
+
+def _write_snapshot(snapshot_file: Path, data: Any, prefix: str):
+    """Write a snapshot atomically and drop older snapshots of the same file."""
+    try:
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(snapshot_file)
+
+        for old in snapshot_file.parent.glob(f"{prefix}-*.pickle"):
+            if old != snapshot_file:
+                old.unlink(missing_ok=True)
+    except OSError:
+        pass  # Snapshots are an optimization only
@@ -0,0 +1,295 @@
+"""
+SQLite index mirroring resources.yaml and authors.yaml.
+
+The YAML files stay the source of truth. This index is a fast read path
+for duplicate checks, author lookups and catalog queries, so they don't
+need a full YAML parse on every CLI invocation. It syncs itself when a
+file's mtime/size changes and its content hash differs, and it only
+rewrites the rows that changed. Rebuilds stream just the indexed fields
+(ingestion/scan.py) rather than parsing the full document tree.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .cache import CACHE_DIR
+from .scan import scan_entries
+from .urls import NORMALIZER_VERSION, normalize_url
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resources (
+    id TEXT PRIMARY KEY,
+    url TEXT,
+    preferred_label TEXT,
+    author TEXT,
+    source TEXT,
+    content_type TEXT,
+    domain TEXT,
+    category TEXT,
+    granularity TEXT,
+    date_added TEXT
+);
+CREATE TABLE IF NOT EXISTS urls (
+    normalized_url TEXT PRIMARY KEY,
+    resource_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS authors (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    affiliation TEXT
+);
+CREATE TABLE IF NOT EXISTS domains (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    color TEXT
+);
+CREATE TABLE IF NOT EXISTS categories (
+    domain_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (domain_id, name)
+);
+CREATE INDEX IF NOT EXISTS resources_domain ON resources(domain, category);
+CREATE INDEX IF NOT EXISTS resources_author ON resources(author);
+"""
+
+RESOURCE_COLUMNS = (
+    "id", "url", "preferred_label", "author", "source", "content_type",
+    "domain", "category", "granularity", "date_added",
+)
+
+# resources.yaml keys, in RESOURCE_COLUMNS order
+RESOURCE_KEYS = (
+    "id", "url", "preferredLabel", "author", "source", "contentType",
+    "domain", "category", "granularity", "dateAdded",
+)
+
+
+def _str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CatalogIndex:
+    """Auto-maintained SQLite mirror of the catalog YAML files.
+
+    Usage:
+        index = CatalogIndex()
+        index.refresh()            # no-op unless a YAML file changed
+        index.lookup_url(url)      # -> resource ID or None
+    """
+
+    def __init__(self, base_dir: Optional[Path] = None, path: Optional[Path] = None):
+        self.base_dir = base_dir or Path(__file__).parent.parent
+        self.resources_file = self.base_dir / "resources.yaml"
+        self.authors_file = self.base_dir / "authors.yaml"
+        self.path = path or CACHE_DIR / "catalog-index.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    # -------------------------------------------------------------------------
+    # Sync
+    # -------------------------------------------------------------------------
+
+    def refresh(self) -> list[str]:
+        """Sync the index with any catalog file that changed.
+
+        Returns:
+            Names of the files that were re-indexed
+        """
+        synced = []
+        with self._lock:
+            if self._meta("normalizer_version") != str(NORMALIZER_VERSION):
+                # Stored normalized URLs are stale; force a resource re-sync
+                self._conn.execute("DELETE FROM files WHERE name = ?", (self.resources_file.name,))
+
+            for path, sync in (
+                (self.resources_file, self._sync_resources),
+                (self.authors_file, self._sync_authors),
+            ):
+                if self._refresh_file(path, sync):
+                    synced.append(path.name)
+
+            self._set_meta("normalizer_version", str(NORMALIZER_VERSION))
+            self._conn.commit()
+        return synced
+
+    def _refresh_file(self, path: Path, sync) -> bool:
+        if not path.exists():
+            return False
+
+        stat = path.stat()
+        row = self._conn.execute(
+            "SELECT mtime, size, sha256 FROM files WHERE name = ?", (path.name,)
+        ).fetchone()
+        if row and row[0] == stat.st_mtime and row[1] == stat.st_size:
+            return False
+
+        sha = _file_sha256(path)
+        if row and row[2] == sha:
+            # Touched but unchanged
+            self._conn.execute(
+                "UPDATE files SET mtime = ?, size = ? WHERE name = ?",
+                (stat.st_mtime, stat.st_size, path.name),
+            )
+            return False
+
+        sync(path)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (name, mtime, size, sha256) VALUES (?, ?, ?, ?)",
+            (path.name, stat.st_mtime, stat.st_size, sha),
+        )
+        return True
+
+    def _sync_resources(self, path: Path):
+        rows = {}
+        for r in scan_entries(path, "resources", RESOURCE_KEYS):
+            if "id" not in r:
+                continue
+            rows[str(r["id"])] = tuple(_str(r.get(key)) for key in RESOURCE_KEYS)
+        self._apply_diff("resources", RESOURCE_COLUMNS, rows)
+
+        urls = {
+            normalize_url(row[1]): (normalize_url(row[1]), resource_id)
+            for resource_id, row in rows.items()
+            if row[1]
+        }
+        self._apply_diff("urls", ("normalized_url", "resource_id"), urls)
+
+        domains = {}
+        categories = {}
+        for d in scan_entries(path, "domains", ("id", "name", "color", "categories")):
+            if "id" not in d:
+                continue
+            domains[d["id"]] = (d["id"], _str(d.get("name")), _str(d.get("color")))
+            for name in d.get("categories") or []:
+                categories[(d["id"], name)] = (d["id"], name)
+        self._apply_diff("domains", ("id", "name", "color"), domains)
+        self._apply_diff("categories", ("domain_id", "name"), categories)
+
+    def _sync_authors(self, path: Path):
+        rows = {}
+        for a in scan_entries(path, "authors", ("id", "name", "affiliation")):
+            if "id" not in a:
+                continue
+            rows[str(a["id"])] = (str(a["id"]), _str(a.get("name")), _str(a.get("affiliation")))
+        self._apply_diff("authors", ("id", "name", "affiliation"), rows)
+
+    def _apply_diff(self, table: str, columns: tuple[str, ...], rows: dict):
+        """Insert, update and delete only the rows that differ."""
+        key_columns = {
+            "categories": ("domain_id", "name"),
+            "urls": ("normalized_url",),
+        }.get(table, ("id",))
+        key_len = len(key_columns)
+
+        existing = {}
+        for row in self._conn.execute(f"SELECT {', '.join(columns)} FROM {table}"):
+            key = row[0] if key_len == 1 else tuple(row[:key_len])
+            existing[key] = tuple(row)
+
+        stale = [key for key in existing if key not in rows]
+        changed = [row for key, row in rows.items() if existing.get(key) != tuple(row)]
+
+        where = " AND ".join(f"{c} = ?" for c in key_columns)
+        self._conn.executemany(
+            f"DELETE FROM {table} WHERE {where}",
+            [(k,) if key_len == 1 else k for k in stale],
+        )
+        placeholders = ", ".join("?" for _ in columns)
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+            changed,
+        )
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def url_map(self) -> dict[str, str]:
+        """Normalized URL -> resource ID for the whole catalog."""
+        return dict(self._query("SELECT normalized_url, resource_id FROM urls"))
+
+    def lookup_url(self, url: str) -> Optional[str]:
+        """Resource ID for a URL, or None."""
+        rows = self._query(
+            "SELECT resource_id FROM urls WHERE normalized_url = ?", (normalize_url(url),)
+        )
+        return rows[0][0] if rows else None
+
+    def author_ids(self) -> set[str]:
+        return {row[0] for row in self._query("SELECT id FROM authors")}
+
+    def get_author(self, author_id: str) -> Optional[dict]:
+        rows = self._query("SELECT id, name, affiliation FROM authors WHERE id = ?", (author_id,))
+        if not rows:
+            return None
+        return dict(zip(("id", "name", "affiliation"), rows[0]))
+
+    def resource_ids(self) -> set[str]:
+        return {row[0] for row in self._query("SELECT id FROM resources")}
+
+    def find_resources(
+        self,
+        domain: Optional[str] = None,
+        category: Optional[str] = None,
+        author: Optional[str] = None,
+    ) -> list[dict]:
+        """Resources matching all given filters."""
+        clauses, params = [], []
+        for column, value in (("domain", domain), ("category", category), ("author", author)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(f"SELECT {', '.join(RESOURCE_COLUMNS)} FROM resources{where} ORDER BY id", params)
+        return [dict(zip(RESOURCE_COLUMNS, row)) for row in rows]
+
+    def domain_counts(self) -> dict[str, int]:
+        return dict(self._query("SELECT domain, COUNT(*) FROM resources GROUP BY domain"))
+
+
+_index: Optional[CatalogIndex] = None
+
+
+def get_catalog_index() -> CatalogIndex:
+    """Get the shared catalog index, synced with the YAML files."""
+    global _index
+    if _index is None:
+        _index = CatalogIndex()
+    _index.refresh()
+    return _index
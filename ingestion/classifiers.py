@@ -4,10 +4,16 @@ DSPy classification and enrichment modules
 Uses DSPy for structured LLM outputs with type safety.
 """
 
+import threading
+import time
+
 import dspy
 from dataclasses import dataclass
 from typing import Optional
 
+from .dag import Stage, run_stages
+from .ids import generate_id, sanitize_id
+
 
 # =============================================================================
 # TAXONOMY (from resources.yaml)
@@ -94,6 +100,31 @@ CONTENT_TYPES = ["essay", "blog", "video", "podcast", "documentation", "paper"]
 GRANULARITIES = ["foundational", "conceptual", "implementation", "advanced"]
 RELATIONSHIP_TYPES = ["broader", "narrower", "related", "requires-prerequisite", "governed-by", "is-example-of"]
 
+# Characters of article content each module sends to the LLM
+CONTENT_LIMITS = {"classify": 4000, "define": 6000, "author": 3000, "fused": 6000}
+
+# Log step each module's LM usage is attributed to
+MODULE_STEPS = {
+    "ResourceClassifier": "classification",
+    "FusedClassifier": "fused_classification",
+    "DefinitionGenerator": "definition",
+    "DefinitionScorer": "definition",
+    "AuthorExtractor": "author",
+    "IdGenerator": "id",
+    "ChunkSummarizer": "long_document",
+}
+
+# Log step each pipeline stage's wall time is attributed to
+STAGE_STEPS = {
+    "digest": "long_document",
+    "classify": "classification",
+    "define": "definition",
+    "score": "definition",
+    "author": "author",
+    "id": "id",
+    "github": "github",
+}
+
 
 # =============================================================================
 # DSPy SIGNATURES
@@ -167,6 +198,19 @@ class GenerateResourceId(dspy.Signature):
     )
 
 
+class SummarizeChunk(dspy.Signature):
+    """Summarize one section of a long document (transcript, paper).
+
+    Keep the claims, concepts, terminology and named tools, people and
+    organizations; drop examples, asides and filler.
+    """
+
+    title: str = dspy.InputField(desc="Document title")
+    chunk: str = dspy.InputField(desc="One section of the document")
+
+    summary: str = dspy.OutputField(desc="Dense summary of the section, at most 150 words")
+
+
 class ScoreDefinition(dspy.Signature):
     """Score a definition for quality.
 
@@ -191,10 +235,69 @@ class ScoreDefinition(dspy.Signature):
     feedback: str = dspy.OutputField(desc="Brief feedback on how to improve the definition")
 
 
+class ClassifyAndDescribe(dspy.Signature):
+    """Classify a resource, define it, and identify its author in one pass.
+
+    The knowledge base covers: knowledge engineering, AI/LLMs, AI tools,
+    analytics engineering, data visualization, data storytelling, and career development.
+
+    Good definitions explain:
+    1. What the resource IS (core thesis/content)
+    2. What it is NOT (scope boundaries)
+    3. Why it matters (value proposition)
+    """
+
+    title: str = dspy.InputField(desc="Resource title")
+    content: str = dspy.InputField(desc="First ~6000 chars of resource content")
+    url: str = dspy.InputField(desc="Source URL")
+    taxonomy: str = dspy.InputField(desc="JSON of available domains and their categories")
+    detected_author: str = dspy.InputField(desc="Author name if detected from byline, or empty")
+    platform: str = dspy.InputField(desc="Source platform name")
+
+    domain: str = dspy.OutputField(desc="Domain ID (e.g., 'knowledge-engineering', 'ai-llms')")
+    category: str = dspy.OutputField(desc="Category within the domain (e.g., 'Core Architecture')")
+    content_type: str = dspy.OutputField(desc="One of: essay, blog, video, podcast, documentation, paper")
+    granularity: str = dspy.OutputField(desc="One of: foundational, conceptual, implementation, advanced")
+    confidence: float = dspy.OutputField(desc="Classification confidence from 0.0 to 1.0")
+    reasoning: str = dspy.OutputField(desc="Brief explanation of classification choice")
+    definition: str = dspy.OutputField(
+        desc="2-3 sentence definition covering what it IS, scope boundaries, and why it matters"
+    )
+    alternate_labels: list[str] = dspy.OutputField(
+        desc="3-5 search terms, synonyms, or acronyms for discoverability"
+    )
+    author_name: str = dspy.OutputField(desc="Full author name")
+    author_id: str = dspy.OutputField(desc="Suggested ID in format: f-lastname (e.g., 'c-doctorow')")
+    is_organization: bool = dspy.OutputField(desc="True if author is company/org, not individual")
+    affiliation: str = dspy.OutputField(desc="Company, university, or organization if mentioned")
+
+
 # =============================================================================
 # DSPy MODULES
 # =============================================================================
 
+def taxonomy_json() -> str:
+    """Taxonomy context string shared by the classification signatures."""
+    import json
+
+    taxonomy = {
+        domain_id: {
+            "name": info["name"],
+            "description": info["description"],
+            "categories": info["categories"],
+        }
+        for domain_id, info in DOMAINS.items()
+    }
+    return json.dumps(taxonomy, indent=2)
+
+
+def coerce_labels(value) -> list[str]:
+    """Normalize an alternate_labels output to a list of at most 5 labels."""
+    if isinstance(value, str):
+        value = [label.strip() for label in value.split(",")]
+    return [label for label in (value or []) if label][:5]
+
+
 class ResourceClassifier(dspy.Module):
     """Classifies resources into the taxonomy."""
 
@@ -203,23 +306,11 @@ class ResourceClassifier(dspy.Module):
         self.classify = dspy.ChainOfThought(ClassifyResource)
 
     def forward(self, title: str, content: str, url: str) -> dict:
-        import json
-
-        # Build taxonomy string for context
-        taxonomy = {
-            domain_id: {
-                "name": info["name"],
-                "description": info["description"],
-                "categories": info["categories"],
-            }
-            for domain_id, info in DOMAINS.items()
-        }
-
         result = self.classify(
             title=title,
-            content=content[:4000],
+            content=content[:CONTENT_LIMITS["classify"]],
             url=url,
-            taxonomy=json.dumps(taxonomy, indent=2),
+            taxonomy=taxonomy_json(),
         )
 
         # Validate outputs
@@ -258,19 +349,14 @@ class DefinitionGenerator(dspy.Module):
     def forward(self, title: str, content: str, domain: str, category: str) -> dict:
         result = self.generate(
             title=title,
-            content=content[:6000],
+            content=content[:CONTENT_LIMITS["define"]],
             domain=domain,
             category=category,
         )
 
-        # Ensure alternate_labels is a list
-        alt_labels = result.alternate_labels
-        if isinstance(alt_labels, str):
-            alt_labels = [l.strip() for l in alt_labels.split(",")]
-
         return {
             "definition": result.definition,
-            "alternate_labels": alt_labels[:5],
+            "alternate_labels": coerce_labels(result.alternate_labels),
         }
 
 
@@ -283,7 +369,7 @@ class AuthorExtractor(dspy.Module):
 
     def forward(self, content: str, url: str, detected_author: str, platform: str) -> dict:
         result = self.extract(
-            content=content[:3000],
+            content=content[:CONTENT_LIMITS["author"]],
             url=url,
             detected_author=detected_author or "",
             platform=platform,
@@ -311,12 +397,105 @@ class IdGenerator(dspy.Module):
             domain=domain,
         )
 
-        # Sanitize ID
-        resource_id = result.resource_id.lower()
-        resource_id = "".join(c if c.isalnum() or c == "-" else "-" for c in resource_id)
-        resource_id = "-".join(part for part in resource_id.split("-") if part)
+        return sanitize_id(result.resource_id)
+
+
+class FusedClassifier(dspy.Module):
+    """Classification, definition and author extraction in one LLM call.
+
+    Sends the article text once instead of three overlapping slices.
+    Unlike the per-stage modules, outputs are validated strictly rather than
+    coerced to defaults: each part that fails validation comes back as
+    None so the pipeline can fall back to the per-stage module for it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.classify = dspy.ChainOfThought(ClassifyAndDescribe)
+
+    def forward(
+        self,
+        title: str,
+        content: str,
+        url: str,
+        detected_author: str,
+        platform: str,
+    ) -> dict:
+        result = self.classify(
+            title=title,
+            content=content[:CONTENT_LIMITS["fused"]],
+            url=url,
+            taxonomy=taxonomy_json(),
+            detected_author=detected_author or "",
+            platform=platform,
+        )
+
+        return {
+            "classify": self._validate_classification(result),
+            "define": self._validate_definition(result),
+            "author": self._validate_author(result),
+        }
+
+    @staticmethod
+    def _validate_classification(result) -> Optional[dict]:
+        domain = result.domain
+        if domain not in DOMAINS or result.category not in DOMAINS[domain]["categories"]:
+            return None
+        if result.content_type not in CONTENT_TYPES or result.granularity not in GRANULARITIES:
+            return None
+        try:
+            confidence = max(0.0, min(1.0, float(result.confidence)))
+        except (TypeError, ValueError):
+            return None
+
+        return {
+            "domain": domain,
+            "category": result.category,
+            "content_type": result.content_type,
+            "granularity": result.granularity,
+            "confidence": confidence,
+            "reasoning": result.reasoning,
+            "color": DOMAINS[domain]["color"],
+        }
+
+    @staticmethod
+    def _validate_definition(result) -> Optional[dict]:
+        definition = (result.definition or "").strip()
+        labels = coerce_labels(result.alternate_labels)
+        if len(definition.split()) < 10 or not labels:
+            return None
+        return {"definition": definition, "alternate_labels": labels}
+
+    @staticmethod
+    def _validate_author(result) -> Optional[dict]:
+        name = (result.author_name or "").strip()
+        author_id = (result.author_id or "").strip().lower().replace(" ", "-")
+        if not name or not author_id:
+            return None
+        return {
+            "author_name": name,
+            "author_id": author_id,
+            "is_organization": result.is_organization,
+            "affiliation": result.affiliation,
+        }
 
-        return resource_id[:50]
+
+class ChunkSummarizer(dspy.Module):
+    """Summarizes sections of long documents (see longdoc.py).
+
+    A single Predict, no reasoning step, and optionally its own (cheaper) LM.
+    """
+
+    def __init__(self, lm=None):
+        super().__init__()
+        self.summarize = dspy.Predict(SummarizeChunk)
+        # Read by StageCache so summaries from different models don't mix
+        self.lm = lm
+        if lm is not None:
+            self.summarize.lm = lm
+
+    def forward(self, title: str, chunk: str) -> str:
+        return self.summarize(title=title, chunk=chunk).summary
 
 
 class DefinitionScorer(dspy.Module):
@@ -406,25 +585,37 @@ class ClassifiedResource:
 
     # GitHub enrichment (optional, for new authors)
     github_enrichment: Optional[dict] = None
+    # Set when GitHub's rate limit deferred enrichment (message with reset time)
+    github_deferred: Optional[str] = None
 
 
-def configure_dspy(provider: str = "anthropic", model: str = "claude-sonnet-4-20250514"):
-    """Configure DSPy with the specified LLM provider."""
+def make_lm(provider: str = "anthropic", model: str = "claude-sonnet-4-20250514"):
+    """Build a DSPy LM for the specified LLM provider (metered, see metering.py)."""
+    from .metering import MeteredLM
+
     if provider == "anthropic":
-        lm = dspy.LM(f"anthropic/{model}", temperature=0.3)
+        return MeteredLM(f"anthropic/{model}", temperature=0.3)
     elif provider == "openai":
-        lm = dspy.LM(f"openai/{model}", temperature=0.3)
+        return MeteredLM(f"openai/{model}", temperature=0.3)
     else:
         raise ValueError(f"Unknown provider: {provider}")
 
-    dspy.configure(lm=lm)
+
+def configure_dspy(provider: str = "anthropic", model: str = "claude-sonnet-4-20250514"):
+    """Configure DSPy with the specified LLM provider."""
+    dspy.configure(lm=make_lm(provider, model))
 
 
 class IngestionPipeline:
     """Full ingestion pipeline combining all modules.
 
     Uses lazy loading for DSPy modules to reduce startup time and memory
-    usage when not all modules are needed.
+    usage when not all modules are needed. Stages run as a dependency graph
+    (see dag.py) so independent LLM/HTTP calls overlap; pass
+    parallel_stages=False to run them one at a time. With fused=True,
+    classification, definition and author come from a single FusedClassifier
+    call, falling back to the per-stage modules for parts that fail
+    validation.
     """
 
     def __init__(
@@ -433,20 +624,62 @@ class IngestionPipeline:
         score_definitions: bool = True,
         enable_logging: bool = True,
         enrich_github: bool = True,
+        logger=None,
+        parallel_stages: bool = True,
+        fused: bool = False,
+        cache=None,
+        id_mode: str = "local",
+        id_index=None,
+        preclassifier=None,
+        window_chars: Optional[int] = 4000,
+        long_doc_words: Optional[int] = None,
+        chunk_words: int = 1500,
+        summary_workers: int = 4,
+        summary_lm=None,
     ):
         # Lazy-loaded module cache
         self._classifier = None
+        self._fused_classifier = None
         self._definition_gen = None
         self._definition_scorer = None
         self._author_extractor = None
         self._id_generator = None
+        self._chunk_summarizer = None
 
-        self.existing_authors = existing_authors or set()
+        # Keep the caller's set (even if empty) so authors added by a
+        # batch session are visible to later process() calls
+        self.existing_authors = existing_authors if existing_authors is not None else set()
         self.score_definitions = score_definitions
         self.enable_logging = enable_logging
         self.enrich_github = enrich_github
-        self._logger = None
-        self._logger_loaded = False
+        self.parallel_stages = parallel_stages
+        self.fused = fused
+        # "local": deterministic slug from ids.py; "llm": IdGenerator module.
+        # IDs are made unique against id_index (ids.IdIndex) when given
+        self.id_mode = id_mode
+        self.id_index = id_index
+        # Optional preclassifier.LocalClassifier; a confident local
+        # prediction replaces the ResourceClassifier call
+        self.preclassifier = preclassifier
+        # Stages share one cleaned window of this many characters
+        # (preprocess.py); None sends the raw extracted text
+        self.window_chars = window_chars
+        # Documents over long_doc_words words are classified and defined
+        # from a map-reduce summary (longdoc.py); None disables it
+        self.long_doc_words = long_doc_words
+        self.chunk_words = chunk_words
+        self.summary_workers = summary_workers
+        self.summary_lm = summary_lm
+        # Optional StageCache (cache.py) in front of every DSPy module
+        self.cache = cache
+        self._cache_counts = {"hits": 0, "misses": 0}
+        self._cache_lock = threading.Lock()
+        # Per-run LM usage by log step (metering.Measurement)
+        self._usage: dict = {}
+        # An explicit logger (e.g. the session's, configured from run_log:)
+        # replaces the global one
+        self._logger = logger
+        self._logger_loaded = logger is not None
 
     @property
     def classifier(self) -> ResourceClassifier:
@@ -454,6 +687,12 @@ class IngestionPipeline:
             self._classifier = ResourceClassifier()
         return self._classifier
 
+    @property
+    def fused_classifier(self) -> FusedClassifier:
+        if self._fused_classifier is None:
+            self._fused_classifier = FusedClassifier()
+        return self._fused_classifier
+
     @property
     def definition_gen(self) -> DefinitionGenerator:
         if self._definition_gen is None:
@@ -480,6 +719,40 @@ class IngestionPipeline:
             self._id_generator = IdGenerator()
         return self._id_generator
 
+    @property
+    def chunk_summarizer(self) -> ChunkSummarizer:
+        if self._chunk_summarizer is None:
+            self._chunk_summarizer = ChunkSummarizer(lm=self.summary_lm)
+        return self._chunk_summarizer
+
+    def _call(self, module, **inputs):
+        """Call a DSPy module, going through the stage cache if enabled.
+
+        The call's LM usage is added to its step's metrics (MODULE_STEPS).
+        """
+        from .metering import measure
+
+        with measure() as usage:
+            if self.cache is None:
+                output = module(**inputs)
+            else:
+                output, hit = self.cache.call(module, **inputs)
+                usage.cache_hits += hit
+                with self._cache_lock:
+                    self._cache_counts["hits" if hit else "misses"] += 1
+        usage.duration_s = 0.0  # Steps are timed as a whole, see _metrics
+        step = MODULE_STEPS.get(type(module).__name__, type(module).__name__)
+        with self._cache_lock:
+            self._usage.setdefault(step, usage.__class__()).merge(usage)
+        return output
+
+    def _metrics(self, step: str, duration_s: float) -> dict:
+        """Metrics for a log step: its wall time plus the LM usage of its calls."""
+        from .metering import Measurement
+
+        metrics = Measurement(duration_s=duration_s).merge(self._usage.get(step, Measurement()))
+        return metrics.as_dict()
+
     @property
     def logger(self):
         if not self._logger_loaded:
@@ -499,77 +772,263 @@ class IngestionPipeline:
         Returns:
             ClassifiedResource ready for YAML generation
         """
+        # Start logging (a RunLog per run, so concurrent runs stay apart)
+        run = self.logger.start_run(extracted.url) if self.logger else None
+        try:
+            return self._process(extracted, run)
+        except Exception as e:
+            # Failed runs are logged too, for `ingest.py logs failures`
+            if run:
+                self.logger.finish_run(run, success=False, error=f"{type(e).__name__}: {e}")
+            raise
+
+    def _process(self, extracted, run) -> ClassifiedResource:
         from .extractor import estimate_reading_time
 
-        # Start logging
-        if self.logger:
-            self.logger.start_run(extracted.url)
-            self.logger.log_extraction(extracted)
+        self._cache_counts = {"hits": 0, "misses": 0}
+        self._usage = {}
 
-        # Step 1: Classify
-        classification = self.classifier(
-            title=extracted.title or "Untitled",
-            content=extracted.text,
-            url=extracted.url,
-        )
-        if self.logger:
-            self.logger.log_classification(classification)
+        if run:
+            run.log_extraction(extracted)
 
-        # Step 2: Generate definition
-        definition = self.definition_gen(
-            title=extracted.title or "Untitled",
-            content=extracted.text,
-            domain=classification["domain"],
-            category=classification["category"],
-        )
+        title = extracted.title or "Untitled"
 
-        # Step 2b: Score definition quality (optional)
-        definition_score = 1.0
-        definition_feedback = None
-        score_result = None
-        if self.definition_scorer:
-            score_result = self.definition_scorer(
-                definition=definition["definition"],
-                title=extracted.title or "Untitled",
-                domain=classification["domain"],
+        # Strip boilerplate and build the window every stage reuses
+        content = clean_text = extracted.text
+        if self.window_chars:
+            from .preprocess import prepare
+
+            started = time.monotonic()
+            prepared = prepare(extracted.text, window_chars=self.window_chars)
+            content, clean_text = prepared.text, prepared.clean
+            if run:
+                limits = (
+                    {"fused": CONTENT_LIMITS["fused"]} if self.fused
+                    else {k: CONTENT_LIMITS[k] for k in ("classify", "define", "author")}
+                )
+                run.log_preprocess(
+                    prepared,
+                    prepared.token_savings(extracted.text, limits),
+                    metrics={"duration_s": round(time.monotonic() - started, 3)},
+                )
+
+        # Long documents: classification and definition work from the
+        # opening plus a map-reduce summary of the whole text
+        long_doc = bool(self.long_doc_words) and len(clean_text.split()) >= self.long_doc_words
+
+        def digest(_):
+            from .longdoc import digest_text, map_reduce, summary_budget
+
+            # Size the summary so the whole digest fits the stages that read
+            # it; anything longer would be summarized, then cut off. (Fused
+            # fallbacks to the classify stage still truncate.)
+            limit = (
+                CONTENT_LIMITS["fused"] if self.fused
+                else min(CONTENT_LIMITS["classify"], CONTENT_LIMITS["define"])
             )
-            definition_score = score_result["score"]
-            definition_feedback = score_result["feedback"]
+            summary = map_reduce(
+                clean_text,
+                lambda chunk: self._call(self.chunk_summarizer, title=title, chunk=chunk),
+                chunk_words=self.chunk_words,
+                max_workers=self.summary_workers,
+                max_chars=summary_budget(limit),
+            )
+            return digest_text(content, summary), summary
+
+        # Fused mode needs the summary up front; staged mode runs it as a
+        # stage alongside author extraction
+        started = time.monotonic()
+        digested = digest(None) if long_doc and self.fused else None
+        digest_seconds = time.monotonic() - started
+
+        def main_content(deps) -> str:
+            result = deps.get("digest") or digested
+            return result[0] if result else content
+
+        # Fused mode: one round-trip for classification, definition and
+        # author; any part that fails validation falls back to its stage
+        fused = {}
+        if self.fused:
+            started = time.monotonic()
+            try:
+                fused = self._call(
+                    self.fused_classifier,
+                    title=title,
+                    content=main_content({}),
+                    url=extracted.url,
+                    detected_author=extracted.author_name,
+                    platform=extracted.source_platform,
+                )
+            except Exception:
+                fused = {}
+            if run:
+                run.log_step(
+                    "fused_classification",
+                    inputs={},
+                    outputs={
+                        "accepted": [k for k, v in fused.items() if v],
+                        "fallback": [k for k in ("classify", "define", "author") if not fused.get(k)],
+                    },
+                    metrics=self._metrics("fused_classification", time.monotonic() - started),
+                )
 
-        if self.logger:
-            self.logger.log_definition(definition, score_result)
+        def classify(deps):
+            text = main_content(deps)
+            local = self.preclassifier
+            if fused.get("classify"):
+                result = fused["classify"]
+            else:
+                if local is not None:
+                    prediction = local.predict(title, text, url=extracted.url)
+                    if local.confident(prediction):
+                        local.record("local")
+                        return prediction.as_classification(DOMAINS[prediction.domain]["color"])
+                result = self._call(
+                    self.classifier,
+                    title=title,
+                    content=text,
+                    url=extracted.url,
+                )
+            if local is not None:
+                # Learned once written (IngestionSession.write_resource)
+                local.record("llm")
+            return result
+
+        def define(deps):
+            # A fused definition was written for the fused classification;
+            # re-generate it if classification fell back
+            if fused.get("define") and fused.get("classify"):
+                return fused["define"]
+            return self._call(
+                self.definition_gen,
+                title=title,
+                content=main_content(deps),
+                domain=deps["classify"]["domain"],
+                category=deps["classify"]["category"],
+            )
 
-        # Step 3: Extract author
-        author = self.author_extractor(
-            content=extracted.text,
-            url=extracted.url,
-            detected_author=extracted.author_name,
-            platform=extracted.source_platform,
-        )
+        def score(deps):
+            return self._call(
+                self.definition_scorer,
+                definition=deps["define"]["definition"],
+                title=title,
+                domain=deps["classify"]["domain"],
+            )
+
+        def extract_author(_):
+            if fused.get("author"):
+                return fused["author"]
+            return self._call(
+                self.author_extractor,
+                content=content,
+                url=extracted.url,
+                detected_author=extracted.author_name,
+                platform=extracted.source_platform,
+            )
+
+        def enrich(deps):
+            author = deps["author"]
+            if author["author_id"] in self.existing_authors:
+                return {}
+            from .github_client import RateLimited
 
-        # Step 3b: GitHub enrichment for new authors (optional)
-        github_enrichment = {}
-        is_new_author = author["author_id"] not in self.existing_authors
-        if self.enrich_github and is_new_author:
             try:
                 from .github_enrichment import enrich_author
-                github_enrichment = enrich_author(
+                return enrich_author(
                     author_name=author["author_name"],
                     author_id=author["author_id"],
                     source_url=extracted.url,
                 )
+            except RateLimited as e:
+                return {"deferred": str(e)}
             except Exception:
-                pass  # GitHub enrichment is optional, don't fail pipeline
+                return {}  # GitHub enrichment is optional, don't fail pipeline
+
+        def make_id(deps):
+            author = deps["author"]
+            if self.id_mode == "llm":
+                base = self._call(
+                    self.id_generator,
+                    title=title,
+                    author_id=author["author_id"],
+                    domain=deps["classify"]["domain"],
+                )
+            else:
+                base = generate_id(
+                    title,
+                    author_id=author["author_id"],
+                    author_name=author["author_name"],
+                    is_organization=bool(author.get("is_organization")),
+                )
+            return self.id_index.claim(base) if self.id_index is not None else base
+
+        # Author extraction doesn't depend on classification, and GitHub
+        # enrichment only needs the author, so those branches run alongside
+        # [digest ->] classify -> define -> score
+        staged_digest = long_doc and digested is None
+        stages = [
+            Stage("classify", classify, deps=("digest",) if staged_digest else ()),
+            Stage("define", define, deps=("classify", "digest") if staged_digest else ("classify",)),
+            Stage("author", extract_author),
+            Stage("id", make_id, deps=("classify", "author") if self.id_mode == "llm" else ("author",)),
+        ]
+        if staged_digest:
+            stages.append(Stage("digest", digest))
+        if self.definition_scorer:
+            stages.append(Stage("score", score, deps=("define", "classify")))
+        if self.enrich_github:
+            stages.append(Stage("github", enrich, deps=("author",)))
+
+        results, durations = run_stages(stages, max_workers=4 if self.parallel_stages else 1)
+        step_seconds = {"long_document": digest_seconds} if digested else {}
+        for stage, seconds in durations.items():
+            step = STAGE_STEPS.get(stage, stage)
+            step_seconds[step] = step_seconds.get(step, 0.0) + seconds
+
+        classification = results["classify"]
+        definition = results["define"]
+        author = results["author"]
+        resource_id = results["id"]
+        github_enrichment = dict(results.get("github") or {})
+        github_deferred = github_enrichment.pop("deferred", None)
+        is_new_author = author["author_id"] not in self.existing_authors
 
-        if self.logger:
-            self.logger.log_author(author)
+        definition_score = 1.0
+        definition_feedback = None
+        score_result = results.get("score")
+        if score_result:
+            definition_score = score_result["score"]
+            definition_feedback = score_result["feedback"]
 
-        # Step 4: Generate ID
-        resource_id = self.id_generator(
-            title=extracted.title or "Untitled",
-            author_id=author["author_id"],
-            domain=classification["domain"],
-        )
+        # Log steps in pipeline order once all stages have finished
+        if run:
+            summary = (results.get("digest") or digested or (None, None))[1]
+            metrics = {step: self._metrics(step, seconds) for step, seconds in step_seconds.items()}
+            if summary is not None:
+                run.log_step(
+                    "long_document",
+                    inputs={"words": summary.words},
+                    outputs={"chunks": summary.chunks, "levels": summary.levels, "summary_chars": len(summary.text)},
+                    metrics=metrics.get("long_document"),
+                )
+            run.log_classification(classification, metrics=metrics.get("classification"))
+            run.log_definition(definition, score_result, metrics=metrics.get("definition"))
+            run.log_author(author, metrics=metrics.get("author"))
+            if "github" in metrics:
+                run.log_step(
+                    "github",
+                    inputs={"author_id": author["author_id"]},
+                    outputs={"enriched": bool(github_enrichment), "deferred": github_deferred},
+                    metrics=metrics["github"],
+                )
+            run.log_step(
+                "id",
+                inputs={"mode": self.id_mode},
+                outputs={"resource_id": resource_id},
+                metrics=metrics.get("id"),
+            )
+            if self.cache is not None:
+                run.log_cache(**self._cache_counts)
 
         # Determine content type from signals
         content_type = classification["content_type"]
@@ -580,8 +1039,8 @@ class IngestionPipeline:
         needs_review = classification["confidence"] < 0.7 or definition_score < 0.7
 
         # Finish logging
-        if self.logger:
-            self.logger.finish_run(success=True, resource_id=resource_id)
+        if run:
+            self.logger.finish_run(run, success=True, resource_id=resource_id)
 
         return ClassifiedResource(
             id=resource_id,
@@ -607,4 +1066,5 @@ class IngestionPipeline:
             reading_time=estimate_reading_time(extracted.word_count, extracted.has_video),
             word_count=extracted.word_count,
             github_enrichment=github_enrichment if github_enrichment else None,
+            github_deferred=github_deferred,
         )
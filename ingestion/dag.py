@@ -0,0 +1,100 @@
+"""
+Minimal dependency-graph scheduler for pipeline stages.
+
+Each stage names the stages it depends on; a stage starts as soon as all of
+its dependencies have finished, so independent LLM/HTTP calls overlap and
+latency tracks the critical path instead of the sum of all calls.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass
+class Stage:
+    """A pipeline stage.
+
+    fn receives a dict of results from the stages listed in deps.
+    """
+    name: str
+    fn: Callable[[dict[str, Any]], Any]
+    deps: tuple[str, ...] = ()
+
+
+def _check_graph(stages: list[Stage]):
+    names = {s.name for s in stages}
+    if len(names) != len(stages):
+        raise ValueError("Duplicate stage names")
+    for s in stages:
+        missing = set(s.deps) - names
+        if missing:
+            raise ValueError(f"Stage {s.name!r} depends on unknown stage(s): {sorted(missing)}")
+
+
+def run_stages(
+    stages: list[Stage],
+    max_workers: int = 4,
+) -> tuple[dict[str, Any], dict[str, float]]:
+    """
+    Run stages concurrently, respecting dependencies.
+
+    Args:
+        stages: Stages to run (any order)
+        max_workers: Maximum stages in flight; 1 runs them sequentially
+
+    Returns:
+        (results by stage name, wall seconds by stage name)
+
+    Raises:
+        The first exception raised by a stage; stages not yet started are
+        skipped.
+    """
+    _check_graph(stages)
+
+    results: dict[str, Any] = {}
+    durations: dict[str, float] = {}
+    pending = list(stages)
+
+    def ready() -> list[Stage]:
+        batch = [s for s in pending if all(d in results for d in s.deps)]
+        for s in batch:
+            pending.remove(s)
+        return batch
+
+    def timed(stage: Stage) -> Any:
+        inputs = {d: results[d] for d in stage.deps}
+        start = time.monotonic()
+        try:
+            return stage.fn(inputs)
+        finally:
+            durations[stage.name] = time.monotonic() - start
+
+    if max_workers <= 1:
+        while pending:
+            batch = ready()
+            if not batch:
+                raise ValueError(f"Dependency cycle among: {[s.name for s in pending]}")
+            for stage in batch:
+                results[stage.name] = timed(stage)
+        return results, durations
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {pool.submit(timed, s): s for s in ready()}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                except Exception:
+                    for f in running:
+                        f.cancel()
+                    raise
+            for stage in ready():
+                running[pool.submit(timed, stage)] = stage
+        if pending:
+            raise ValueError(f"Dependency cycle among: {[s.name for s in pending]}")
+
+    return results, durations
@@ -8,6 +8,7 @@ Uses summarize.sh (https://summarize.sh/) for robust extraction with fallbacks.
 import json
 import re
 import subprocess
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
@@ -28,6 +29,10 @@ class ExtractedContent:
     has_code: bool
     has_video: bool
     fetch_timestamp: str
+    # <link rel=canonical> of the page, if extraction reported one
+    canonical_url: Optional[str] = None
+    # Seconds spent fetching and extracting (0.0 when served from cache)
+    fetch_seconds: Optional[float] = None
 
 
 # Platform detection patterns
@@ -151,6 +156,7 @@ def extract_url(url: str, timeout: int = 120) -> ExtractedContent:
         ExtractedContent with extracted text and metadata
     """
     # Call summarize.sh with --extract-only --json
+    started = time.monotonic()
     try:
         result = subprocess.run(
             ["summarize", url, "--extract-only", "--json", f"--timeout={timeout}s"],
@@ -178,6 +184,7 @@ def extract_url(url: str, timeout: int = 120) -> ExtractedContent:
     content = extracted.get("content", "")
     word_count = extracted.get("wordCount", len(content.split()))
     site_name = extracted.get("siteName")
+    canonical_url = extracted.get("canonicalUrl") or extracted.get("canonical")
 
     # Detect metadata from content
     has_code, has_video = detect_content_signals(content, url)
@@ -201,6 +208,8 @@ def extract_url(url: str, timeout: int = 120) -> ExtractedContent:
         has_code=has_code,
         has_video=has_video,
         fetch_timestamp=datetime.utcnow().isoformat(),
+        canonical_url=canonical_url if isinstance(canonical_url, str) else None,
+        fetch_seconds=time.monotonic() - started,
     )
 
 
@@ -0,0 +1,304 @@
+"""
+GitHub REST client for author enrichment.
+
+One pooled httpx client serves every lookup, and responses are kept in a
+DiskCache (.cache/github.sqlite) with their ETags: a repeat lookup is
+answered from the cache while fresh, and revalidated with If-None-Match
+afterwards. GitHub doesn't count 304 Not Modified against the rate limit.
+
+Requests are scheduled by a token bucket per rate-limit resource (core,
+search), kept in sync with the X-RateLimit-* headers of every response.
+When a bucket is empty the client waits for the reset if it is close
+(max_wait), and otherwise raises RateLimited so the caller can defer the
+enrichment instead of treating it as "no GitHub profile".
+
+graphql() posts to the GraphQL API (token required), which batch
+enrichment uses to look up dozens of profiles in one aliased query.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+API_URL = "https://api.github.com"
+
+# Requests per window before any headers are seen (unauthenticated / token)
+DEFAULT_LIMITS = {
+    "core": ((60, 3600), (5000, 3600)),
+    "search": ((10, 60), (30, 60)),
+    "graphql": ((5000, 3600), (5000, 3600)),  # points; needs a token
+}
+
+# Cached responses newer than this are used without a request
+DEFAULT_MAX_AGE_S = 24 * 3600
+
+
+class GitHubError(RuntimeError):
+    """A GitHub request failed (network error or unexpected status)."""
+
+
+class RateLimited(GitHubError):
+    """The rate limit is exhausted until reset_at (epoch seconds)."""
+
+    def __init__(self, resource: str, reset_at: float):
+        self.resource = resource
+        self.reset_at = reset_at
+        resets = time.strftime("%H:%M:%S", time.localtime(reset_at))
+        super().__init__(f"GitHub {resource} rate limit exhausted until {resets}")
+
+
+class TokenBucket:
+    """Request budget of one rate-limit resource.
+
+    Refills continuously at limit/window, and is corrected by the
+    X-RateLimit-Remaining/Reset headers whenever GitHub reports them.
+    """
+
+    def __init__(self, limit: int, window_s: float):
+        self.limit = limit
+        self.rate = limit / window_s
+        self.tokens = float(limit)
+        self.blocked_until = 0.0   # epoch seconds; set when GitHub says 0 remain
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        if self.blocked_until and time.time() >= self.blocked_until:
+            # The window has reset: GitHub restores the full limit
+            self.tokens, self.blocked_until = float(self.limit), 0.0
+        now = time.monotonic()
+        self.tokens = min(self.limit, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until a request may be sent."""
+        self._refill()
+        blocked = self.blocked_until - time.time()
+        if blocked > 0:
+            return blocked
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+    def sync(self, limit: int, remaining: int, reset_at: float):
+        self._refill()
+        self.limit = limit
+        self.tokens = float(remaining)
+        if remaining <= 0:
+            self.blocked_until = reset_at
+        else:
+            self.blocked_until = 0.0
+            self.rate = max(remaining / max(1.0, reset_at - time.time()), 1e-6)
+
+
+class GitHubClient:
+    """Cached, rate-limit-aware GitHub API client.
+
+    Usage:
+        client = GitHubClient(token=os.environ.get("GITHUB_TOKEN"))
+        client.get_json("/users/octocat")      # dict, or None on 404
+
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        cache_path: Optional[Path] = None,
+        use_cache: bool = True,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        max_wait_s: float = 30.0,
+        timeout: float = 10.0,
+        base_url: str = API_URL,
+    ):
+        from .cache import CACHE_DIR, DiskCache
+
+        self.token = token
+        self.store = (
+            DiskCache(cache_path or CACHE_DIR / "github.sqlite", max_bytes=50 * 1024 * 1024)
+            if use_cache else None
+        )
+        self.max_age_s = max_age_s
+        self.max_wait_s = max_wait_s
+        self.timeout = timeout
+        self.base_url = base_url.rstrip("/")
+        self.stats = {"requests": 0, "not_modified": 0, "cache_hits": 0, "waited_s": 0.0}
+        self._buckets = {
+            resource: TokenBucket(*limits[1 if token else 0])
+            for resource, limits in DEFAULT_LIMITS.items()
+        }
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Shared httpx client (keeps the connection to the API alive)."""
+        with self._lock:
+            if self._client is None:
+                import httpx
+
+                headers = {
+                    "Accept": "application/vnd.github.v3+json",
+                    "User-Agent": "data-centered-ingestion",
+                }
+                if self.token:
+                    headers["Authorization"] = f"token {self.token}"
+                self._client = httpx.Client(
+                    base_url=self.base_url,
+                    headers=headers,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                )
+            return self._client
+
+    # -------------------------------------------------------------------------
+
+    def _acquire(self, resource: str):
+        """Wait for a token, or raise RateLimited if the wait is too long."""
+        while True:
+            with self._lock:
+                bucket = self._buckets[resource]
+                wait = bucket.wait_time()
+                if wait <= 0:
+                    bucket.take()
+                    return
+                if wait > self.max_wait_s:
+                    raise RateLimited(resource, time.time() + wait)
+                self.stats["waited_s"] += wait
+            time.sleep(wait)
+
+    def _sync(self, resource: str, headers) -> str:
+        """Update the bucket from X-RateLimit-* headers. Returns the resource."""
+        resource = headers.get("x-ratelimit-resource", resource)
+        try:
+            limit = int(headers["x-ratelimit-limit"])
+            remaining = int(headers["x-ratelimit-remaining"])
+            reset_at = float(headers["x-ratelimit-reset"])
+        except (KeyError, ValueError):
+            return resource
+        with self._lock:
+            bucket = self._buckets.setdefault(resource, TokenBucket(limit, 3600))
+            bucket.sync(limit, remaining, reset_at)
+        return resource
+
+    def _request(self, method: str, path: str, resource: str, **kwargs):
+        """Send a request within the rate budget (one retry when limited).
+
+        Returns (response, resource as reported by GitHub).
+        """
+        import httpx
+
+        for attempt in range(2):
+            self._acquire(resource)
+            try:
+                with self._lock:
+                    self.stats["requests"] += 1
+                response = self.client.request(method, path, **kwargs)
+            except httpx.HTTPError as e:
+                raise GitHubError(f"GitHub request failed: {e}") from e
+            resource = self._sync(resource, response.headers)
+
+            rate_limited = response.status_code == 429 or (
+                response.status_code == 403 and response.headers.get("x-ratelimit-remaining") == "0"
+            )
+            if not rate_limited:
+                return response, resource
+            # Secondary limits send Retry-After instead of a zero remaining count
+            if retry_after := response.headers.get("retry-after"):
+                with self._lock:
+                    bucket = self._buckets[resource]
+                    bucket.blocked_until = max(bucket.blocked_until, time.time() + float(retry_after))
+            if attempt:
+                with self._lock:
+                    reset_at = self._buckets[resource].blocked_until
+                raise RateLimited(resource, reset_at)
+
+    def get_json(self, path: str, params: Optional[dict] = None) -> Optional[Any]:
+        """GET an API path; the decoded body, or None on 404.
+
+        Raises:
+            RateLimited: The rate limit won't reset within max_wait_s
+            GitHubError: Network error or unexpected status
+        """
+        resource = "search" if path.startswith("/search/") else "core"
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        key = f"{path}?{query}"
+
+        cached = self.store.get_json(key) if self.store is not None else None
+        if cached and time.time() - cached["fetched_at"] < self.max_age_s:
+            with self._lock:
+                self.stats["cache_hits"] += 1
+            return cached["body"]
+
+        headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+        response, _ = self._request("GET", path, resource, params=params, headers=headers)
+
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self.stats["not_modified"] += 1
+            if self.store is not None:
+                self.store.set_json(key, {**cached, "fetched_at": time.time()})
+            return cached["body"]
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise GitHubError(f"GitHub {path}: HTTP {response.status_code}")
+
+        try:
+            body = response.json()
+        except json.JSONDecodeError as e:
+            raise GitHubError(f"GitHub {path}: invalid JSON") from e
+        if self.store is not None:
+            self.store.set_json(key, {"etag": response.headers.get("etag"), "body": body, "fetched_at": time.time()})
+        return body
+
+    def graphql(self, query: str, variables: Optional[dict] = None) -> dict:
+        """Run a GraphQL query; the response's "data" (nulls where nothing matched).
+
+        Not cached: POST responses carry no ETag. Errors that only say a
+        node wasn't found are ignored; any other error raises.
+
+        Raises:
+            RateLimited: The GraphQL point budget won't reset within max_wait_s
+            GitHubError: No token, network error, or a GraphQL error
+        """
+        if not self.token:
+            raise GitHubError("The GitHub GraphQL API requires GITHUB_TOKEN")
+
+        response, resource = self._request(
+            "POST", "/graphql", "graphql", json={"query": query, "variables": variables or {}}
+        )
+        if response.status_code != 200:
+            raise GitHubError(f"GitHub GraphQL: HTTP {response.status_code}")
+        try:
+            body = response.json()
+        except json.JSONDecodeError as e:
+            raise GitHubError("GitHub GraphQL: invalid JSON") from e
+
+        errors = [e for e in body.get("errors") or [] if e.get("type") != "NOT_FOUND"]
+        if any(e.get("type") == "RATE_LIMITED" for e in errors):
+            with self._lock:
+                bucket = self._buckets[resource]
+                reset_at = bucket.blocked_until or time.time() + max(60.0, bucket.wait_time())
+            raise RateLimited(resource, reset_at)
+        if errors:
+            raise GitHubError(f"GitHub GraphQL: {errors[0].get('message', errors[0])}")
+        return body.get("data") or {}
+
+
+# Shared client (one connection pool and rate-limit state per process)
+_client: Optional[GitHubClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> GitHubClient:
+    """Get or create the shared client (GITHUB_TOKEN from the environment)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GitHubClient(token=os.environ.get("GITHUB_TOKEN"))
+        return _client
@@ -3,14 +3,19 @@ GitHub author enrichment module.
 
 Enriches author metadata using the GitHub API.
 Works without authentication (60 req/hour) or with GITHUB_TOKEN (5000 req/hour).
+Requests go through the shared, cached and rate-limited client in
+github_client.py. enrich_authors_batch resolves many authors at once:
+name searches run concurrently within the search budget, and with a token
+the profiles are fetched by aliased GraphQL queries (dozens per request).
 """
 
-import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional
 from urllib.parse import urlparse
-import json
+
+from .github_client import GitHubClient, GitHubError, RateLimited, get_client
 
 
 @dataclass
@@ -44,75 +49,147 @@ def extract_github_username(url: str) -> Optional[str]:
     return None
 
 
-def search_github_user(name: str, token: Optional[str] = None) -> Optional[str]:
-    """Search GitHub for a user by name, return best-match username."""
-    import urllib.request
-    import urllib.error
+def search_github_user(name: str, client: Optional[GitHubClient] = None) -> Optional[str]:
+    """Search GitHub for a user by name, return best-match username.
+
+    Raises:
+        RateLimited: The search rate limit is exhausted (see github_client.py)
+    """
+    client = client or get_client()
 
     # Clean name for search
     query = name.replace("-", " ").strip()
-    search_url = f"https://api.github.com/search/users?q={query.replace(' ', '+')}&per_page=5"
-
-    headers = {
-        "Accept": "application/vnd.github.v3+json",
-        "User-Agent": "data-centered-ingestion",
-    }
-    if token:
-        headers["Authorization"] = f"token {token}"
 
     try:
-        req = urllib.request.Request(search_url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode())
+        data = client.get_json("/search/users", params={"q": query, "per_page": 5})
+    except RateLimited:
+        raise
+    except GitHubError:
+        return None
 
-        if not data.get("items"):
-            return None
+    if not data or not data.get("items"):
+        return None
+
+    # Try to find exact name match
+    for item in data["items"]:
+        if item.get("login", "").lower() == name.lower().replace(" ", ""):
+            return item["login"]
 
-        # Try to find exact name match
-        for item in data["items"]:
-            if item.get("login", "").lower() == name.lower().replace(" ", ""):
-                return item["login"]
+    # Return top result as fallback
+    return data["items"][0].get("login")
 
-        # Return top result as fallback
-        return data["items"][0]["login"]
 
-    except (urllib.error.URLError, json.JSONDecodeError, KeyError):
+def fetch_github_profile(username: str, client: Optional[GitHubClient] = None) -> Optional[GitHubProfile]:
+    """Fetch GitHub profile data for a username.
+
+    Raises:
+        RateLimited: The core rate limit is exhausted (see github_client.py)
+    """
+    client = client or get_client()
+
+    try:
+        data = client.get_json(f"/users/{username}")
+    except RateLimited:
+        raise
+    except GitHubError:
+        return None
+    if not data:
         return None
 
+    return GitHubProfile(
+        username=data.get("login", username),
+        name=data.get("name"),
+        bio=data.get("bio"),
+        location=data.get("location"),
+        company=data.get("company"),
+        blog=data.get("blog"),
+        twitter=data.get("twitter_username"),
+        public_repos=data.get("public_repos", 0),
+        followers=data.get("followers", 0),
+    )
+
+
+# One aliased user(...) per login; the REST fields enrichment uses
+GRAPHQL_PROFILE_FIELDS = """
+    login name bio location company websiteUrl twitterUsername
+    followers { totalCount }
+    repositories(privacy: PUBLIC) { totalCount }
+"""
 
-def fetch_github_profile(username: str, token: Optional[str] = None) -> Optional[GitHubProfile]:
-    """Fetch GitHub profile data for a username."""
-    import urllib.request
-    import urllib.error
+# Logins per GraphQL query (each costs ~1 point regardless of size)
+GRAPHQL_BATCH_SIZE = 50
 
-    url = f"https://api.github.com/users/{username}"
 
-    headers = {
-        "Accept": "application/vnd.github.v3+json",
-        "User-Agent": "data-centered-ingestion",
-    }
-    if token:
-        headers["Authorization"] = f"token {token}"
+def fetch_github_profiles(
+    usernames: list[str],
+    client: Optional[GitHubClient] = None,
+    batch_size: int = GRAPHQL_BATCH_SIZE,
+) -> dict[str, GitHubProfile]:
+    """Fetch many profiles with aliased GraphQL queries (requires a token).
 
-    try:
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode())
-
-        return GitHubProfile(
-            username=data.get("login", username),
-            name=data.get("name"),
-            bio=data.get("bio"),
-            location=data.get("location"),
-            company=data.get("company"),
-            blog=data.get("blog"),
-            twitter=data.get("twitter_username"),
-            public_repos=data.get("public_repos", 0),
-            followers=data.get("followers", 0),
+    Returns:
+        Profiles keyed by the requested username; unknown users are absent
+
+    Raises:
+        RateLimited: The GraphQL budget is exhausted (profiles fetched so
+            far are lost; callers defer the whole batch)
+        GitHubError: No token, or the query failed
+    """
+    client = client or get_client()
+    usernames = list(dict.fromkeys(usernames))
+    profiles = {}
+
+    for start in range(0, len(usernames), batch_size):
+        chunk = usernames[start:start + batch_size]
+        params = ", ".join(f"$l{i}: String!" for i in range(len(chunk)))
+        fields = "\n".join(
+            f"u{i}: user(login: $l{i}) {{{GRAPHQL_PROFILE_FIELDS}}}" for i in range(len(chunk))
+        )
+        data = client.graphql(
+            f"query({params}) {{\n{fields}\n}}",
+            {f"l{i}": username for i, username in enumerate(chunk)},
         )
+        for i, username in enumerate(chunk):
+            node = data.get(f"u{i}")
+            if not node:
+                continue
+            profiles[username] = GitHubProfile(
+                username=node.get("login", username),
+                name=node.get("name"),
+                bio=node.get("bio"),
+                location=node.get("location"),
+                company=node.get("company"),
+                blog=node.get("websiteUrl"),
+                twitter=node.get("twitterUsername"),
+                public_repos=(node.get("repositories") or {}).get("totalCount", 0),
+                followers=(node.get("followers") or {}).get("totalCount", 0),
+            )
+
+    return profiles
+
+
+def profile_enrichment(profile: GitHubProfile) -> dict:
+    """Author fields from a GitHub profile (the enrich_author dict)."""
+    enrichment = {
+        "github": f"https://github.com/{profile.username}",
+        "github_username": profile.username,
+    }
 
-    except (urllib.error.URLError, json.JSONDecodeError, KeyError):
-        return None
+    # Only add fields with values
+    if profile.location:
+        enrichment["location"] = profile.location
+    if profile.company:
+        # Clean company (often has @ prefix)
+        company = profile.company.lstrip("@").strip()
+        enrichment["affiliation"] = company
+    if profile.twitter:
+        enrichment["twitter"] = f"https://twitter.com/{profile.twitter}"
+    if profile.bio:
+        enrichment["bio"] = profile.bio[:200]  # Truncate long bios
+    if profile.followers >= 100:
+        enrichment["github_followers"] = profile.followers
+
+    return enrichment
 
 
 def enrich_author(
@@ -132,8 +209,12 @@ def enrich_author(
 
     Returns:
         Dict with enrichment data (empty if no GitHub found)
+
+    Raises:
+        RateLimited: GitHub's rate limit is exhausted; enrichment should be
+            deferred rather than recorded as "no GitHub profile"
     """
-    token = os.environ.get("GITHUB_TOKEN")
+    client = get_client()
 
     # Priority 1: Use existing GitHub username
     username = existing_github
@@ -144,71 +225,99 @@ def enrich_author(
 
     # Priority 3: Search by author name
     if not username:
-        username = search_github_user(author_name, token)
+        username = search_github_user(author_name, client)
 
     if not username:
         return {}
 
-    profile = fetch_github_profile(username, token)
+    profile = fetch_github_profile(username, client)
     if not profile:
         return {}
 
-    enrichment = {
-        "github": f"https://github.com/{profile.username}",
-        "github_username": profile.username,
-    }
-
-    # Only add fields with values
-    if profile.location:
-        enrichment["location"] = profile.location
-    if profile.company:
-        # Clean company (often has @ prefix)
-        company = profile.company.lstrip("@").strip()
-        enrichment["affiliation"] = company
-    if profile.twitter:
-        enrichment["twitter"] = f"https://twitter.com/{profile.twitter}"
-    if profile.bio:
-        enrichment["bio"] = profile.bio[:200]  # Truncate long bios
-    if profile.followers >= 100:
-        enrichment["github_followers"] = profile.followers
-
-    return enrichment
+    return profile_enrichment(profile)
 
 
-def enrich_authors_batch(authors: list[dict], dry_run: bool = False) -> list[dict]:
+def enrich_authors_batch(
+    authors: list[dict],
+    dry_run: bool = False,
+    workers: int = 4,
+    batch_size: int = GRAPHQL_BATCH_SIZE,
+) -> list[dict]:
     """
     Enrich a batch of authors with GitHub data.
 
+    Usernames come from the author (github_username), their source URL,
+    or a name search; searches run on `workers` threads, paced by the
+    client's search budget. With GITHUB_TOKEN set, profiles are then
+    fetched batch_size at a time over GraphQL; without one, one REST
+    request per author. Each author gets the same fields as enrich_author.
+
     Args:
         authors: List of author dicts with at least 'id' and 'preferredLabel'
+            (or 'name', as in authors.yaml)
         dry_run: If True, print what would be enriched without modifying
+        workers: Concurrent name searches / REST profile lookups
+        batch_size: Profiles per GraphQL query
 
     Returns:
-        List of enriched author dicts
+        List of enriched author dicts (in input order; authors deferred by
+        a rate limit are returned unchanged)
     """
-    enriched = []
-
-    for author in authors:
-        author_id = author.get("id", "")
-        author_name = author.get("preferredLabel", "")
-
-        # Skip if already has GitHub
-        if author.get("github"):
-            enriched.append(author)
-            continue
-
-        data = enrich_author(
-            author_name=author_name,
-            author_id=author_id,
-            source_url=author.get("source_url", ""),
-        )
+    client = get_client()
+    pending = [a for a in authors if not a.get("github")]
+    deferred = set()
+
+    def resolve(author: dict) -> Optional[str]:
+        username = author.get("github_username") or extract_github_username(author.get("source_url", ""))
+        if username:
+            return username
+        name = author.get("preferredLabel") or author.get("name", "")
+        if not name:
+            return None
+        try:
+            return search_github_user(name, client)
+        except RateLimited:
+            deferred.add(id(author))
+            return None
 
-        if data:
-            if dry_run:
-                print(f"  Would enrich {author_id}: {data.get('github')}")
-            else:
-                author.update(data)
+    limited = set()
 
-        enriched.append(author)
+    def fetch(username: str) -> Optional[GitHubProfile]:
+        try:
+            return fetch_github_profile(username, client)
+        except RateLimited:
+            limited.add(username)
+            return None
 
-    return enriched
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        usernames = {id(a): u for a, u in zip(pending, pool.map(resolve, pending))}
+        wanted = list(dict.fromkeys(u for u in usernames.values() if u))
+
+        profiles = None
+        if client.token and wanted:
+            try:
+                profiles = fetch_github_profiles(wanted, client, batch_size)
+            except RateLimited:
+                limited.update(wanted)
+                profiles = {}
+            except GitHubError as e:
+                print(f"  ✗ {e}; falling back to REST")
+        if profiles is None:
+            profiles = dict(zip(wanted, pool.map(fetch, wanted)))
+
+    for author in pending:
+        username = usernames[id(author)]
+        if username in limited:
+            deferred.add(id(author))
+        profile = profiles.get(username) if username else None
+        if not profile:
+            continue
+        data = profile_enrichment(profile)
+        if dry_run:
+            print(f"  Would enrich {author.get('id', '')}: {data.get('github')}")
+        else:
+            author.update(data)
+
+    if deferred:
+        print(f"  ⏳ GitHub rate limit reached; deferring {len(deferred)} author(s)")
+    return authors
@@ -0,0 +1,138 @@
+"""
+Deterministic resource IDs.
+
+Builds kebab-case IDs from the title's keywords plus the author's surname
+(e.g. "The Semantic Gap: Why Your AI Can't Read the Room" by Jessica
+Talisman -> "semantic-gap-ai-cant-read-room-talisman"), and an IdIndex that
+resolves collisions against the catalog and queue with numeric suffixes.
+Same inputs always give the same base ID, and no LLM call is needed.
+"""
+
+import threading
+from typing import Iterable, Optional
+
+from slugify import slugify
+
+MAX_ID_LENGTH = 50
+MAX_KEYWORDS = 6
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "can", "do", "does",
+    "for", "from", "has", "have", "how", "in", "into", "is", "it", "its", "of",
+    "on", "or", "our", "so", "than", "that", "the", "their", "this", "to",
+    "vs", "was", "we", "what", "when", "where", "which", "who", "why", "will",
+    "with", "you", "your",
+}
+
+# Trailing words in organization author IDs that don't identify them
+ORG_SUFFIXES = {"team", "labs", "lab", "inc", "co", "company", "blog", "org", "hq", "official"}
+
+UNKNOWN_AUTHORS = {"unknown", "anonymous", "none", "n-a", "na"}
+
+# Dropped rather than turned into separators: "don't" -> "dont", not "don-t"
+_APOSTROPHES = [["'", ""], ["’", ""], ["`", ""]]
+
+
+def slug_words(text: Optional[str]) -> list[str]:
+    """Lowercase ASCII words of text ("Don't Panic!" -> ["dont", "panic"])."""
+    if not text:
+        return []
+    return [w for w in slugify(text, replacements=_APOSTROPHES).split("-") if w]
+
+
+def sanitize_id(value: str, max_length: int = MAX_ID_LENGTH) -> str:
+    """Coerce any string into a kebab-case ID of at most max_length chars."""
+    return _fit(slug_words(value), max_length)
+
+
+def _fit(words: list[str], max_length: int) -> str:
+    """Join words with hyphens, dropping whole words to fit max_length."""
+    slug = ""
+    for word in words:
+        candidate = f"{slug}-{word}" if slug else word
+        if len(candidate) > max_length:
+            break
+        slug = candidate
+    # A single over-long first word still yields an ID
+    return slug or (words[0][:max_length] if words else "")
+
+
+def author_token(
+    author_id: Optional[str],
+    author_name: Optional[str] = None,
+    is_organization: bool = False,
+) -> Optional[str]:
+    """The word identifying an author in IDs: surname, or organization name."""
+    id_words = slug_words(author_id)
+    if not id_words or "-".join(id_words) in UNKNOWN_AUTHORS:
+        return None
+
+    if is_organization:
+        words = [w for w in id_words if w not in ORG_SUFFIXES]
+        return words[0] if words else id_words[0]
+
+    name_words = slug_words(author_name)
+    return name_words[-1] if name_words else id_words[-1]
+
+
+def generate_id(
+    title: Optional[str],
+    author_id: Optional[str] = None,
+    author_name: Optional[str] = None,
+    is_organization: bool = False,
+    max_length: int = MAX_ID_LENGTH,
+) -> str:
+    """
+    Build the base ID for a resource: title keywords + author surname.
+
+    Stopwords are dropped (unless that leaves nothing), at most
+    MAX_KEYWORDS keywords are kept, and words are dropped from the end of
+    the title to fit max_length with the surname attached.
+    """
+    words = slug_words(title)
+    keywords = [w for w in words if w not in STOPWORDS] or words or ["resource"]
+    keywords = list(dict.fromkeys(keywords))[:MAX_KEYWORDS]
+
+    surname = author_token(author_id, author_name, is_organization)
+    if surname and surname not in keywords:
+        title_part = _fit(keywords, max_length - len(surname) - 1)
+        return f"{title_part}-{surname}" if title_part else surname[:max_length]
+    return _fit(keywords, max_length)
+
+
+class IdIndex:
+    """Set of taken resource IDs that hands out unique ones.
+
+    Seed it with the catalog and queue IDs; claim() reserves an ID for the
+    rest of the session, so two resources in one batch never share one.
+    Thread-safe.
+    """
+
+    def __init__(self, existing: Iterable[str] = ()):
+        self._taken = set(existing)
+        self._lock = threading.Lock()
+
+    def __contains__(self, resource_id: str) -> bool:
+        with self._lock:
+            return resource_id in self._taken
+
+    def __len__(self) -> int:
+        return len(self._taken)
+
+    def claim(self, base: str, max_length: int = MAX_ID_LENGTH) -> str:
+        """Reserve base, or base-2, base-3, ... if it is taken."""
+        base = sanitize_id(base, max_length) or "resource"
+        with self._lock:
+            candidate = base
+            n = 1
+            while candidate in self._taken:
+                n += 1
+                suffix = f"-{n}"
+                candidate = f"{base[:max_length - len(suffix)].rstrip('-')}{suffix}"
+            self._taken.add(candidate)
+            return candidate
+
+    def add(self, resource_id: str):
+        """Mark an ID as taken (e.g. one written by another path)."""
+        with self._lock:
+            self._taken.add(resource_id)
@@ -2,34 +2,46 @@
 Ingestion pipeline logging.
 
 Persists DSPy reasoning and pipeline decisions for debugging and analysis.
+Each run is a RunLog; finished runs are appended to the segmented run log
+(runlog.py).
 """
 
+import atexit
 import json
-import os
+import secrets
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
+from .runlog import DEFAULT_SEGMENT_BYTES, SegmentWriter, iter_records, read_run
 
-class IngestionLogger:
-    """Logs ingestion pipeline decisions and reasoning."""
+LOG_DIR = Path(__file__).parent.parent / "logs" / "ingestion"
 
-    def __init__(self, log_dir: Optional[Path] = None):
-        self.log_dir = log_dir or Path(__file__).parent.parent / "logs" / "ingestion"
-        self.log_dir.mkdir(parents=True, exist_ok=True)
-        self.current_run: dict[str, Any] = {}
-        self.run_id: Optional[str] = None
+# Per-step metrics summed into the run's totals
+TOTAL_FIELDS = ("calls", "prompt_tokens", "completion_tokens", "cost_usd", "retries", "cache_hits")
 
-    def start_run(self, url: str) -> str:
-        """Start a new ingestion run."""
-        self.run_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        self.current_run = {
+
+def new_run_id(at: Optional[datetime] = None) -> str:
+    """Sortable, unique run ID: timestamp plus a random suffix."""
+    return f"{at or datetime.utcnow():%Y%m%d_%H%M%S}_{secrets.token_hex(3)}"
+
+
+class RunLog:
+    """One pipeline run's steps and outcome.
+
+    Each run gets its own RunLog from IngestionLogger.start_run, so
+    concurrent runs sharing a logger never mix their steps.
+    """
+
+    def __init__(self, url: str):
+        started = datetime.utcnow()
+        self.run_id = new_run_id(started)
+        self.record: dict[str, Any] = {
             "run_id": self.run_id,
             "url": url,
-            "started_at": datetime.utcnow().isoformat(),
+            "started_at": started.isoformat(),
             "steps": [],
         }
-        return self.run_id
 
     def log_step(
         self,
@@ -37,8 +49,13 @@ class IngestionLogger:
         inputs: dict[str, Any],
         outputs: dict[str, Any],
         reasoning: Optional[str] = None,
+        metrics: Optional[dict[str, Any]] = None,
     ):
-        """Log a pipeline step."""
+        """Log a pipeline step.
+
+        metrics holds the step's wall time (duration_s) and, for LLM steps,
+        its calls, tokens, model, estimated cost and retries.
+        """
         step = {
             "step": step_name,
             "timestamp": datetime.utcnow().isoformat(),
@@ -47,10 +64,13 @@ class IngestionLogger:
         }
         if reasoning:
             step["reasoning"] = reasoning
-        self.current_run["steps"].append(step)
+        if metrics:
+            step["metrics"] = metrics
+        self.record["steps"].append(step)
 
     def log_extraction(self, extracted: Any):
         """Log extraction results."""
+        fetch_seconds = getattr(extracted, "fetch_seconds", None)
         self.log_step(
             "extraction",
             inputs={"url": extracted.url},
@@ -61,9 +81,10 @@ class IngestionLogger:
                 "has_code": extracted.has_code,
                 "has_video": extracted.has_video,
             },
+            metrics={"duration_s": round(fetch_seconds, 3)} if fetch_seconds is not None else None,
         )
 
-    def log_classification(self, classification: dict):
+    def log_classification(self, classification: dict, metrics: Optional[dict] = None):
         """Log classification results with reasoning."""
         self.log_step(
             "classification",
@@ -74,11 +95,13 @@ class IngestionLogger:
                 "content_type": classification["content_type"],
                 "granularity": classification["granularity"],
                 "confidence": classification["confidence"],
+                "source": classification.get("source", "llm"),
             },
             reasoning=classification.get("reasoning"),
+            metrics=metrics,
         )
 
-    def log_definition(self, definition: dict, score_result: Optional[dict] = None):
+    def log_definition(self, definition: dict, score_result: Optional[dict] = None, metrics: Optional[dict] = None):
         """Log definition generation and scoring."""
         outputs = {
             "definition": definition["definition"],
@@ -88,9 +111,9 @@ class IngestionLogger:
             outputs["score"] = score_result["score"]
             outputs["criteria"] = score_result.get("criteria", {})
             outputs["feedback"] = score_result.get("feedback")
-        self.log_step("definition", inputs={}, outputs=outputs)
+        self.log_step("definition", inputs={}, outputs=outputs, metrics=metrics)
 
-    def log_author(self, author: dict):
+    def log_author(self, author: dict, metrics: Optional[dict] = None):
         """Log author extraction."""
         self.log_step(
             "author",
@@ -100,23 +123,52 @@ class IngestionLogger:
                 "author_name": author["author_name"],
                 "is_organization": author.get("is_organization", False),
             },
+            metrics=metrics,
         )
 
-    def finish_run(self, success: bool, resource_id: Optional[str] = None, error: Optional[str] = None):
-        """Finish the run and write to log file."""
-        self.current_run["finished_at"] = datetime.utcnow().isoformat()
-        self.current_run["success"] = success
-        if resource_id:
-            self.current_run["resource_id"] = resource_id
-        if error:
-            self.current_run["error"] = error
+    def log_preprocess(self, prepared: Any, savings: dict, metrics: Optional[dict] = None):
+        """Log boilerplate removal and the estimated prompt tokens saved."""
+        self.log_step(
+            "preprocess",
+            inputs={"chars": prepared.raw_chars},
+            outputs={
+                "clean_chars": prepared.clean_chars,
+                "window_chars": len(prepared.text),
+                "boilerplate_lines": prepared.boilerplate_lines,
+                "duplicate_lines": prepared.duplicate_lines,
+                **savings,
+            },
+            metrics=metrics,
+        )
 
-        # Write to log file
-        log_file = self.log_dir / f"{self.run_id}.json"
-        with open(log_file, "w") as f:
-            json.dump(self.current_run, f, indent=2)
+    def log_cache(self, hits: int, misses: int):
+        """Log LLM stage cache hits and misses for this run."""
+        self.log_step("cache", inputs={}, outputs={"hits": hits, "misses": misses})
 
-        return log_file
+    def finish(self, success: bool, resource_id: Optional[str] = None, error: Optional[str] = None) -> dict:
+        """Close the run: outcome, duration and usage totals."""
+        finished = datetime.utcnow()
+        self.record["finished_at"] = finished.isoformat()
+        self.record["success"] = success
+        if resource_id:
+            self.record["resource_id"] = resource_id
+        if error:
+            self.record["error"] = error
+        started = datetime.fromisoformat(self.record["started_at"])
+        self.record["duration_s"] = round((finished - started).total_seconds(), 3)
+        self.record["totals"] = self._totals(self.record["steps"])
+        return self.record
+
+    @staticmethod
+    def _totals(steps: list[dict]) -> dict[str, Any]:
+        """Sum of the steps' LLM usage."""
+        totals: dict[str, Any] = {field: 0 for field in TOTAL_FIELDS}
+        for step in steps:
+            metrics = step.get("metrics") or {}
+            for field in TOTAL_FIELDS:
+                totals[field] += metrics.get(field) or 0
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        return totals
 
     def _serialize(self, obj: Any) -> Any:
         """Serialize objects for JSON."""
@@ -133,10 +185,68 @@ class IngestionLogger:
             return str(obj)
 
 
+class IngestionLogger:
+    """Writes finished runs to the segmented run log (see runlog.py).
+
+    Usage:
+        run = logger.start_run(url)
+        run.log_step(...)
+        logger.finish_run(run, success=True, resource_id=...)
+
+    Safe to share between threads; records are buffered and flushed every
+    flush_every runs and at exit.
+    """
+
+    def __init__(
+        self,
+        log_dir: Optional[Path] = None,
+        max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        compress: bool = True,
+        flush_every: int = 1,
+    ):
+        self.log_dir = log_dir or LOG_DIR
+        self.writer = SegmentWriter(
+            self.log_dir,
+            max_segment_bytes=max_segment_bytes,
+            compress=compress,
+            flush_every=flush_every,
+        )
+        atexit.register(self.flush)
+
+    def start_run(self, url: str) -> RunLog:
+        """Start a new ingestion run."""
+        return RunLog(url)
+
+    def finish_run(
+        self,
+        run: RunLog,
+        success: bool,
+        resource_id: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> str:
+        """Finish the run and append it to the log. Returns its run_id."""
+        self.writer.append(run.finish(success, resource_id=resource_id, error=error))
+        return run.run_id
+
+    def flush(self):
+        """Write buffered runs."""
+        self.writer.flush()
+
+
 # Global logger instance
 _logger: Optional[IngestionLogger] = None
 
 
+def iter_runs(log_dir: Optional[Path] = None) -> Iterator[dict]:
+    """Logged runs, oldest first: legacy per-run JSON files, then segments."""
+    return iter_records(log_dir or LOG_DIR)
+
+
+def get_run(run_id: str, log_dir: Optional[Path] = None) -> Optional[dict]:
+    """A single logged run, looked up through the run index."""
+    return read_run(log_dir or LOG_DIR, run_id)
+
+
 def get_logger() -> IngestionLogger:
     """Get or create the global logger instance."""
     global _logger
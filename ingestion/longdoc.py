@@ -0,0 +1,147 @@
+"""
+Map-reduce summaries for long documents.
+
+YouTube transcripts and arXiv papers run to tens of thousands of words,
+but each LLM stage only sees a few thousand characters. Above a word
+threshold the pipeline instead:
+
+1. splits the text into chunks of ~chunk_words words,
+2. summarizes the chunks concurrently with a short, cheap prompt, and
+3. joins the summaries (summarizing the summaries again while they are
+   still too long), handing the result to classification and definition.
+
+Chunk boundaries are content-defined: a chunk ends after a sentence whose
+hash hits a target, once the chunk is long enough. An edit therefore
+moves only the boundaries near it, and with the stage cache in front of
+the summarizer a re-run only pays for the chunks that changed.
+"""
+
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+DEFAULT_THRESHOLD_WORDS = 8000
+DEFAULT_CHUNK_WORDS = 1500
+
+# Longest reduced summary handed to the stages; longer ones are reduced again
+MAX_SUMMARY_CHARS = 6000
+MAX_LEVELS = 3
+
+# Characters of the document's opening kept ahead of the summary (title,
+# byline, abstract)
+LEAD_CHARS = 1500
+
+# Room for the "[Summary of the full document ...]" line between them
+DIGEST_HEADER_CHARS = 100
+
+# Sentences longer than this (unpunctuated transcripts) are cut into pieces
+MAX_UNIT_WORDS = 120
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+
+
+@dataclass
+class LongDocSummary:
+    """Reduced summary of a long document."""
+    text: str
+    words: int
+    chunks: int
+    levels: int
+
+
+def _units(text: str) -> list[str]:
+    """Sentences (or paragraph breaks), with run-on sentences cut to size."""
+    units = []
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        for i in range(0, len(words), MAX_UNIT_WORDS):
+            units.append(" ".join(words[i:i + MAX_UNIT_WORDS]))
+    return [u for u in units if u]
+
+
+def _is_boundary(unit: str, chunk_words: int) -> bool:
+    # With ~20-word sentences, about one boundary per chunk_words / 2 words
+    digest = hashlib.blake2b(unit.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % max(1, chunk_words // 40) == 0
+
+
+def chunk_text(text: str, chunk_words: int = DEFAULT_CHUNK_WORDS) -> list[str]:
+    """Split text into chunks of roughly chunk_words words.
+
+    A chunk closes at a content-defined boundary once it has chunk_words/2
+    words, and always by 1.5 x chunk_words.
+    """
+    chunks, current, size = [], [], 0
+    min_words, max_words = chunk_words // 2, chunk_words * 3 // 2
+    for unit in _units(text):
+        n = len(unit.split())
+        if current and size + n > max_words:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(unit)
+        size += n
+        if size >= min_words and _is_boundary(unit, chunk_words):
+            chunks.append(" ".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def map_reduce(
+    text: str,
+    summarize: Callable[[str], str],
+    chunk_words: int = DEFAULT_CHUNK_WORDS,
+    max_workers: int = 4,
+    max_chars: int = MAX_SUMMARY_CHARS,
+) -> LongDocSummary:
+    """
+    Summarize text chunk by chunk, then reduce the chunk summaries.
+
+    Args:
+        text: Full document text
+        summarize: Called with one chunk, returns its summary (thread-safe)
+        chunk_words: Target words per chunk
+        max_workers: Chunks summarized at once
+        max_chars: Reduce again while the joined summary is longer than this
+
+    Returns:
+        LongDocSummary with the joined summary
+    """
+    chunks = chunk_text(text, chunk_words)
+    pieces, levels = chunks, 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while True:
+            summaries = [s.strip() for s in pool.map(summarize, pieces)]
+            levels += 1
+            joined = "\n\n".join(summaries)
+            if len(joined) <= max_chars or len(summaries) == 1 or levels >= MAX_LEVELS:
+                break
+            # Reduce: group neighboring summaries into chunk-sized pieces
+            pieces = chunk_text(joined, chunk_words)
+            if len(pieces) >= len(summaries):
+                break  # Summaries aren't getting shorter; stop here
+
+    return LongDocSummary(
+        text=joined[:max_chars],
+        words=len(text.split()),
+        chunks=len(chunks),
+        levels=levels,
+    )
+
+
+def summary_budget(content_limit: int, lead_chars: int = LEAD_CHARS) -> int:
+    """Longest summary whose digest still fits a stage's content limit."""
+    return max(0, content_limit - lead_chars - DIGEST_HEADER_CHARS)
+
+
+def digest_text(lead: str, summary: LongDocSummary, lead_chars: int = LEAD_CHARS) -> str:
+    """What the stages see for a long document: its opening plus the summary."""
+    opening = lead[:lead_chars].rsplit(" ", 1)[0] if len(lead) > lead_chars else lead
+    return (
+        f"{opening}\n\n"
+        f"[Summary of the full document: {summary.words} words in {summary.chunks} sections]\n\n"
+        f"{summary.text}"
+    )
@@ -0,0 +1,153 @@
+"""
+LM usage metering for pipeline steps.
+
+measure() opens a Measurement on the current thread; MeteredLM adds the
+tokens, estimated cost and retries of every LM call made on that thread
+to it. The pipeline wraps each DSPy module call in measure(), so usage
+lands on the step that caused it even when steps run concurrently.
+
+Costs come from the per-model prices in config/ingestion.yaml
+(metrics.pricing, USD per million tokens), falling back to litellm's
+own estimate when a model isn't listed.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Iterator, Optional
+
+import dspy
+
+# Exceptions worth retrying (litellm / provider SDK class names)
+TRANSIENT_ERRORS = {
+    "RateLimitError", "APIConnectionError", "Timeout", "APITimeoutError",
+    "InternalServerError", "ServiceUnavailableError", "OverloadedError",
+}
+
+_local = threading.local()
+_pricing: dict[str, dict] = {}
+
+
+@dataclass
+class Measurement:
+    """Wall time and LM usage of one step."""
+    duration_s: float = 0.0
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: Optional[float] = None
+    retries: int = 0
+    cache_hits: int = 0
+    model: Optional[str] = None
+
+    def merge(self, other: "Measurement") -> "Measurement":
+        """Add other's usage (and duration) into this measurement."""
+        self.duration_s += other.duration_s
+        self.calls += other.calls
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        if other.cost_usd is not None:
+            self.cost_usd = (self.cost_usd or 0.0) + other.cost_usd
+        self.retries += other.retries
+        self.cache_hits += other.cache_hits
+        self.model = self.model or other.model
+        return self
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["duration_s"] = round(self.duration_s, 3)
+        if self.cost_usd is not None:
+            data["cost_usd"] = round(self.cost_usd, 6)
+        return data
+
+
+@contextmanager
+def measure() -> Iterator[Measurement]:
+    """Collect LM usage on this thread (and wall time) into a Measurement."""
+    measurement = Measurement()
+    parent = getattr(_local, "current", None)
+    _local.current = measurement
+    start = time.monotonic()
+    try:
+        yield measurement
+    finally:
+        measurement.duration_s += time.monotonic() - start
+        _local.current = parent
+
+
+def current() -> Optional[Measurement]:
+    return getattr(_local, "current", None)
+
+
+def configure_pricing(pricing: Optional[dict]):
+    """Set USD-per-million-token prices: {model: {"input": x, "output": y}}."""
+    _pricing.clear()
+    _pricing.update(pricing or {})
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Estimated USD cost of a call, or None if the model has no price."""
+    price = _pricing.get(model) or _pricing.get(model.split("/", 1)[-1])
+    if not price:
+        return None
+    return (prompt_tokens * price.get("input", 0) + completion_tokens * price.get("output", 0)) / 1_000_000
+
+
+class MeteredLM(dspy.LM):
+    """dspy.LM that reports each call's usage to the thread's Measurement.
+
+    Transient provider errors are retried here (with exponential backoff)
+    rather than inside litellm, so retries can be counted.
+    """
+
+    def __init__(self, model: str, max_retries: int = 3, backoff: float = 2.0, **kwargs):
+        kwargs.setdefault("num_retries", 0)
+        super().__init__(model, **kwargs)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def __call__(self, prompt=None, messages=None, **kwargs):
+        retries = 0
+        while True:
+            try:
+                outputs = self._complete(prompt, messages, **kwargs)
+                break
+            except Exception as e:
+                if retries >= self.max_retries or type(e).__name__ not in TRANSIENT_ERRORS:
+                    self._record(None, retries)
+                    raise
+                retries += 1
+                time.sleep(self.backoff * 2 ** (retries - 1))
+        self._record(self._history_entry(prompt, messages), retries)
+        return outputs
+
+    def _complete(self, prompt, messages, **kwargs):
+        """One provider call (overridden by the cassette LMs in cassette.py)."""
+        return super().__call__(prompt=prompt, messages=messages, **kwargs)
+
+    def _history_entry(self, prompt, messages) -> Optional[dict]:
+        """This call's entry in self.history (shared by threads, so match on identity)."""
+        for entry in reversed(self.history[-64:]):
+            if entry.get("messages") is messages and entry.get("prompt") is prompt:
+                return entry
+        return None
+
+    def _record(self, entry: Optional[dict], retries: int):
+        measurement = current()
+        if measurement is None:
+            return
+        usage = (entry or {}).get("usage") or {}
+        prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        completion_tokens = int(usage.get("completion_tokens") or 0)
+        cost = estimate_cost(self.model, prompt_tokens, completion_tokens)
+        if cost is None and entry is not None:
+            cost = entry.get("cost")
+        measurement.merge(Measurement(
+            calls=1,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=cost,
+            retries=retries,
+            model=self.model,
+        ))
@@ -0,0 +1,202 @@
+"""
+Aggregate pipeline metrics from run logs.
+
+Every logged run (logs/ingestion, see runlog.py) records per-step wall
+time and LLM usage (see RunLog.log_step). This module rolls a set of runs
+up into per-step latency percentiles, tokens and cost, and formats a row
+for the Metrics Log table in docs/ingestion-metrics.md.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+METRICS_DOC = Path(__file__).parent.parent / "docs" / "ingestion-metrics.md"
+METRICS_LOG_HEADING = "## Metrics Log"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class StepStats:
+    """Metrics of one pipeline step across runs."""
+    step: str
+    durations: list[float] = field(default_factory=list)
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    retries: int = 0
+    cache_hits: int = 0
+    models: set = field(default_factory=set)
+
+    def add(self, metrics: dict):
+        if metrics.get("duration_s") is not None:
+            self.durations.append(float(metrics["duration_s"]))
+        self.calls += metrics.get("calls") or 0
+        self.prompt_tokens += metrics.get("prompt_tokens") or 0
+        self.completion_tokens += metrics.get("completion_tokens") or 0
+        self.cost_usd += metrics.get("cost_usd") or 0.0
+        self.retries += metrics.get("retries") or 0
+        self.cache_hits += metrics.get("cache_hits") or 0
+        if metrics.get("model"):
+            self.models.add(metrics["model"])
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.durations, 50)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.durations, 95)
+
+
+@dataclass
+class RunSummary:
+    """Aggregated metrics of a set of runs."""
+    runs: int
+    succeeded: int
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    run_durations: list[float]
+    steps: dict[str, StepStats]
+
+    @property
+    def wall_seconds(self) -> float:
+        """First start to last finish (batch runs overlap)."""
+        if not self.started_at or not self.finished_at:
+            return 0.0
+        return (self.finished_at - self.started_at).total_seconds()
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(s.prompt_tokens + s.completion_tokens for s in self.steps.values())
+
+    @property
+    def total_cost(self) -> float:
+        return sum(s.cost_usd for s in self.steps.values())
+
+
+def _timestamp(value) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def summarize_runs(runs: Iterable[dict]) -> RunSummary:
+    """Roll run logs up into per-step statistics.
+
+    Runs logged before metrics were recorded still count towards the
+    totals; their steps simply have no durations.
+    """
+    steps: dict[str, StepStats] = {}
+    durations = []
+    count = succeeded = 0
+    first = last = None
+    for run in runs:
+        count += 1
+        succeeded += bool(run.get("success"))
+        started, finished = _timestamp(run.get("started_at")), _timestamp(run.get("finished_at"))
+        if started and (first is None or started < first):
+            first = started
+        if finished and (last is None or finished > last):
+            last = finished
+        if run.get("duration_s") is not None:
+            durations.append(float(run["duration_s"]))
+        elif started and finished:
+            durations.append((finished - started).total_seconds())
+        for step in run.get("steps", []):
+            if step.get("metrics"):
+                steps.setdefault(step["step"], StepStats(step["step"])).add(step["metrics"])
+    return RunSummary(
+        runs=count,
+        succeeded=succeeded,
+        started_at=first,
+        finished_at=last,
+        run_durations=durations,
+        steps=steps,
+    )
+
+
+def format_table(summary: RunSummary) -> str:
+    """Per-step table for the terminal."""
+    header = f"{'Step':<22} {'n':>5} {'p50 s':>8} {'p95 s':>8} {'calls':>6} {'tokens in':>10} {'tokens out':>10} {'cost $':>9} {'retries':>7}"
+    lines = [header, "-" * len(header)]
+    for stats in summary.steps.values():
+        lines.append(
+            f"{stats.step:<22} {len(stats.durations):>5} {stats.p50:>8.2f} {stats.p95:>8.2f} "
+            f"{stats.calls:>6} {stats.prompt_tokens:>10,} {stats.completion_tokens:>10,} "
+            f"{stats.cost_usd:>9.4f} {stats.retries:>7}"
+        )
+    lines.append("-" * len(header))
+    lines.append(
+        f"{'run':<22} {len(summary.run_durations):>5} {percentile(summary.run_durations, 50):>8.2f} "
+        f"{percentile(summary.run_durations, 95):>8.2f}"
+    )
+    return "\n".join(lines)
+
+
+# =============================================================================
+# DOCS TABLE
+# =============================================================================
+
+def format_duration(seconds: float) -> str:
+    """Approximate duration in the docs table's style: ~39 sec, ~1.7 min, ~13 min."""
+    if seconds < 60:
+        return f"~{seconds:.0f} sec"
+    minutes = seconds / 60
+    if minutes < 10:
+        return f"~{minutes:.1f} min"
+    return f"~{minutes:.0f} min"
+
+
+def metrics_row(summary: RunSummary, method: str = "Pipeline (batch)", notes: str = "") -> str:
+    """A Metrics Log row for docs/ingestion-metrics.md."""
+    resources = summary.succeeded
+    wall = summary.wall_seconds
+    per_resource = wall / resources if resources else 0.0
+    date = (summary.finished_at or datetime.utcnow()).strftime("%Y-%m-%d")
+    auto_notes = f"{summary.total_tokens:,} tokens, ~${summary.total_cost:.2f}"
+    notes = f"{notes.strip()} {auto_notes}." if notes.strip() else f"{auto_notes}."
+    return f"| {date} | {resources} | {format_duration(wall)} | {format_duration(per_resource)} | {method} | {notes} |"
+
+
+def insert_row(text: str, row: str) -> str:
+    """Insert row after the last row of the Metrics Log table."""
+    lines = text.split("\n")
+    try:
+        start = lines.index(METRICS_LOG_HEADING)
+    except ValueError:
+        raise ValueError(f"No '{METRICS_LOG_HEADING}' section found")
+    last_row = None
+    for i in range(start + 1, len(lines)):
+        if lines[i].startswith("|"):
+            last_row = i
+        elif last_row is not None or lines[i].startswith("#"):
+            break
+    if last_row is None:
+        raise ValueError(f"No table under '{METRICS_LOG_HEADING}'")
+    lines.insert(last_row + 1, row)
+    return "\n".join(lines)
+
+
+def append_row(row: str, doc_path: Path = METRICS_DOC):
+    """Append a row to the docs Metrics Log table (locked, atomic rewrite)."""
+    from .writer import update_file
+
+    def transform(text: Optional[str]) -> str:
+        if text is None:
+            raise FileNotFoundError(doc_path)
+        return insert_row(text, row)
+
+    update_file(doc_path, transform)
@@ -0,0 +1,232 @@
+"""
+Near-duplicate detection over extracted text.
+
+Exact URL checks miss the same essay syndicated on Substack, Medium and a
+personal blog. This module fingerprints extracted text with MinHash over
+word shingles and keeps the signatures in an LSH-banded SQLite index
+(.cache/near-duplicates.sqlite), so a new page can be matched against the
+catalog before any LLM call.
+
+Usage:
+    index = NearDuplicateIndex(threshold=0.8)
+    sig = minhash(extracted.text)
+    if match := index.query(sig):
+        print(match.resource_id, match.similarity)
+    index.add(resource.id, resource.url, sig)
+    index.remove(resource.id)          # deleted from the queue or catalog
+"""
+
+import hashlib
+import re
+import sqlite3
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Container, Optional
+
+from .cache import CACHE_DIR
+
+# Bump (or change any parameter below) to invalidate stored signatures
+NEARDUP_VERSION = 1
+
+SHINGLE_SIZE = 5      # words per shingle
+NUM_PERM = 128        # MinHash permutations
+BANDS = 16            # LSH bands of NUM_PERM // BANDS rows (~0.7 similarity knee)
+MAX_WORDS = 20000     # cap on words shingled per document
+
+_MERSENNE = (1 << 61) - 1
+_WORD = re.compile(r"\w+")
+
+
+def _permutations() -> list[tuple[int, int]]:
+    """Fixed (a, b) pairs for h(x) = (a*x + b) mod p, stable across runs."""
+    perms = []
+    for i in range(NUM_PERM):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little") % (_MERSENNE - 1) + 1
+        b = int.from_bytes(digest[8:], "little") % _MERSENNE
+        perms.append((a, b))
+    return perms
+
+
+_PERMS = _permutations()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """Hashed word shingles of text (lowercased, punctuation dropped)."""
+    words = _WORD.findall(text.lower())[:MAX_WORDS]
+    # Texts shorter than one shingle become a single shingle
+    count = max(1, len(words) - size + 1) if words else 0
+    return {
+        int.from_bytes(
+            hashlib.blake2b(" ".join(words[i:i + size]).encode(), digest_size=8).digest(),
+            "little",
+        ) % _MERSENNE
+        for i in range(count)
+    }
+
+
+def minhash(text: str) -> Optional[tuple[int, ...]]:
+    """MinHash signature of text, or None if it has no words."""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return tuple(min((a * x + b) % _MERSENNE for x in hashes) for a, b in _PERMS)
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the documents behind two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def _bands(sig: tuple[int, ...]) -> list[int]:
+    rows = NUM_PERM // BANDS
+    keys = []
+    for band in range(BANDS):
+        packed = struct.pack(f"<{rows}Q", *sig[band * rows:(band + 1) * rows])
+        keys.append(int.from_bytes(hashlib.blake2b(packed, digest_size=8).digest(), "little", signed=True))
+    return keys
+
+
+@dataclass
+class NearDuplicate:
+    """An indexed resource whose text closely matches a new page."""
+    resource_id: str
+    url: str
+    similarity: float
+    status: str  # "catalog" or "pending" (in the review queue)
+
+
+class NearDuplicateIndex:
+    """LSH index of MinHash signatures, one per catalog/queued resource.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[Path] = None, threshold: float = 0.8):
+        self.path = Path(path or CACHE_DIR / "near-duplicates.sqlite")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS signatures (
+                resource_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                status TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                hash INTEGER NOT NULL,
+                resource_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS bands_lookup ON bands(band, hash);
+            CREATE INDEX IF NOT EXISTS bands_resource ON bands(resource_id);
+            """
+        )
+        params = f"{NEARDUP_VERSION}:{SHINGLE_SIZE}:{NUM_PERM}:{BANDS}:{MAX_WORDS}"
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'params'").fetchone()
+        if row is None or row[0] != params:
+            # Signatures from other parameters aren't comparable
+            self._conn.execute("DELETE FROM signatures")
+            self._conn.execute("DELETE FROM bands")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('params', ?)", (params,))
+        self._conn.commit()
+
+    def query(
+        self,
+        sig: tuple[int, ...],
+        exclude: Optional[str] = None,
+        known: Optional[Container[str]] = None,
+    ) -> Optional[NearDuplicate]:
+        """Best match at or above the threshold, or None.
+
+        With known (the catalog and queue IDs), matches on resources that
+        have since been deleted are ignored.
+        """
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(_bands(sig)):
+                candidates.update(
+                    row[0] for row in self._conn.execute(
+                        "SELECT resource_id FROM bands WHERE band = ? AND hash = ?", (band, key)
+                    )
+                )
+            candidates.discard(exclude)
+            if known is not None:
+                candidates = {c for c in candidates if c in known}
+
+            best = None
+            for resource_id in candidates:
+                row = self._conn.execute(
+                    "SELECT url, signature, status FROM signatures WHERE resource_id = ?", (resource_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                score = similarity(sig, struct.unpack(f"<{NUM_PERM}Q", row[1]))
+                if score >= self.threshold and (best is None or score > best.similarity):
+                    best = NearDuplicate(resource_id, row[0], score, row[2])
+        return best
+
+    def add(self, resource_id: str, url: str, sig: tuple[int, ...], status: str = "catalog"):
+        """Index (or re-index) a resource's signature."""
+        with self._lock:
+            self._conn.execute("DELETE FROM bands WHERE resource_id = ?", (resource_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO signatures (resource_id, url, signature, status) VALUES (?, ?, ?, ?)",
+                (resource_id, url, struct.pack(f"<{NUM_PERM}Q", *sig), status),
+            )
+            self._conn.executemany(
+                "INSERT INTO bands (band, hash, resource_id) VALUES (?, ?, ?)",
+                [(band, key, resource_id) for band, key in enumerate(_bands(sig))],
+            )
+            self._conn.commit()
+
+    def remove(self, resource_id: str) -> bool:
+        """Drop a resource's signature. Returns False if it wasn't indexed."""
+        with self._lock:
+            self._conn.execute("DELETE FROM bands WHERE resource_id = ?", (resource_id,))
+            removed = self._conn.execute(
+                "DELETE FROM signatures WHERE resource_id = ?", (resource_id,)
+            ).rowcount
+            self._conn.commit()
+        return bool(removed)
+
+    def reconcile(self, known: Container[str]) -> int:
+        """Drop signatures of resources not in known (the catalog and queue
+        IDs). Returns signatures removed."""
+        with self._lock:
+            stale = [
+                row[0] for row in self._conn.execute("SELECT resource_id FROM signatures")
+                if row[0] not in known
+            ]
+            for resource_id in stale:
+                self._conn.execute("DELETE FROM bands WHERE resource_id = ?", (resource_id,))
+                self._conn.execute("DELETE FROM signatures WHERE resource_id = ?", (resource_id,))
+            self._conn.commit()
+        return len(stale)
+
+    def set_status(self, resource_id: str, status: str) -> bool:
+        """Update an indexed resource's status. Returns False if not indexed."""
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE signatures SET status = ? WHERE resource_id = ?", (status, resource_id)
+            ).rowcount
+            self._conn.commit()
+        return bool(updated)
+
+    def __contains__(self, resource_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM signatures WHERE resource_id = ?", (resource_id,)
+            ).fetchone() is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM signatures GROUP BY status"))
+        return {"catalog": counts.get("catalog", 0), "pending": counts.get("pending", 0)}
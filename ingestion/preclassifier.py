@@ -0,0 +1,309 @@
+"""
+Local kNN pre-classifier trained on the catalog.
+
+Every resource in resources.yaml is already labeled with a domain,
+category, content type and granularity, so the catalog doubles as a
+training set. LocalClassifier votes among the nearest catalog entries
+(TF-IDF over labels + definition, see vectors.py) and, when the vote is
+clear enough, the pipeline uses its answer instead of calling
+ResourceClassifier.
+
+Every example, catalog or learned, is vectorized from the same fields:
+preferred label, alternate labels and definition (example_terms). A page
+being classified has no definition yet, so it is queried with its title
+and opening words (query_text); min_similarity is calibrated for that
+page-vs-entry comparison. Bump PRECLASSIFIER_VERSION if either side
+changes.
+
+Examples live in .cache/preclassifier.sqlite. Catalog examples are
+re-read whenever resources.yaml changes. Resources are learned only when
+they are written to the catalog (a real run, or approval in review), so
+dry runs and rejected items never become training data; the catalog
+entry replaces the learned one once resources.yaml is re-read.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .cache import CACHE_DIR
+from .vectors import TfidfIndex, term_counts
+
+# Bump when the example text or vectorization changes
+PRECLASSIFIER_VERSION = 2
+
+QUERY_WORDS = 400  # words of page text used to classify a page
+
+LABEL_FIELDS = ("domain", "category", "content_type", "granularity")
+
+
+@dataclass
+class Prediction:
+    """A local classification and how clearly the neighbors agreed on it."""
+    domain: str
+    category: str
+    content_type: str
+    granularity: str
+    share: float        # weighted vote share of the winning domain/category
+    margin: float       # share minus the runner-up's share
+    similarity: float   # similarity of the nearest example
+    neighbors: list[str]
+
+    def as_classification(self, color: str) -> dict:
+        """The prediction in ResourceClassifier's output format."""
+        return {
+            "domain": self.domain,
+            "category": self.category,
+            "content_type": self.content_type,
+            "granularity": self.granularity,
+            "confidence": round(self.share, 3),
+            "reasoning": (
+                f"Local kNN: {self.share:.0%} of weighted votes from the nearest catalog entries "
+                f"({', '.join(self.neighbors[:3])}) for {self.domain} / {self.category}"
+            ),
+            "color": color,
+            "source": "local",
+        }
+
+
+def query_text(title: str, text: str) -> str:
+    """The part of a page that is vectorized: title plus its opening words."""
+    return f"{title}\n" + " ".join((text or "").split()[:QUERY_WORDS])
+
+
+def example_terms(title: str, alternate_labels, definition: str) -> Counter:
+    """Term counts of a labeled example: catalog entries and learned resources alike."""
+    if isinstance(alternate_labels, list):
+        alternate_labels = " . ".join(str(label) for label in alternate_labels)
+    return term_counts(str(title or ""), str(alternate_labels or ""), str(definition or ""))
+
+
+def _file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest() if path.exists() else ""
+
+
+class LocalClassifier:
+    """kNN classifier over catalog and learned examples.
+
+    Usage:
+        classifier = LocalClassifier(resources_file)
+        prediction = classifier.predict(title, text)
+        if classifier.confident(prediction):
+            ...                          # skip the LLM
+        ...
+        classifier.learn(resource)       # once it is written to the catalog
+
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        resources_file: Path,
+        path: Optional[Path] = None,
+        neighbors: int = 7,
+        min_margin: float = 0.6,
+        min_similarity: float = 0.2,
+        min_examples: int = 20,
+        taxonomy: Optional[dict] = None,
+    ):
+        self.resources_file = Path(resources_file)
+        self.path = Path(path or CACHE_DIR / "preclassifier.sqlite")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.neighbors = neighbors
+        self.min_margin = min_margin
+        self.min_similarity = min_similarity
+        self.min_examples = min_examples
+        # {domain: {"categories": [...]}}; labels outside it never win a vote
+        self.taxonomy = taxonomy
+        self.stats = {"local": 0, "llm": 0, "learned": 0}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS examples (
+                url TEXT PRIMARY KEY,
+                origin TEXT NOT NULL,
+                terms TEXT NOT NULL,
+                domain TEXT,
+                category TEXT,
+                content_type TEXT,
+                granularity TEXT
+            );
+            """
+        )
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(PRECLASSIFIER_VERSION):
+            self._conn.execute("DELETE FROM examples")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (str(PRECLASSIFIER_VERSION),))
+        self._conn.commit()
+
+        self.index = TfidfIndex()
+        self.labels: dict[str, dict] = {}
+        self.sync()
+
+    # -------------------------------------------------------------------------
+    # Training data
+    # -------------------------------------------------------------------------
+
+    def sync(self) -> bool:
+        """Reload catalog examples if resources.yaml changed, then load all.
+
+        Returns:
+            True if catalog examples were re-read
+        """
+        from .scan import scan_entries
+        from .urls import normalize_url
+
+        digest = _file_sha256(self.resources_file)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'catalog_sha256'").fetchone()
+            retrain = row is None or row[0] != digest
+            if retrain:
+                catalog = {}
+                fields = (
+                    "url", "preferredLabel", "alternateLabels", "definition",
+                    "domain", "category", "contentType", "granularity",
+                )
+                for entry in scan_entries(self.resources_file, "resources", fields):
+                    if not entry.get("url") or not entry.get("domain"):
+                        continue
+                    terms = example_terms(
+                        entry.get("preferredLabel"), entry.get("alternateLabels"), entry.get("definition")
+                    )
+                    catalog[normalize_url(str(entry["url"]))] = (
+                        terms,
+                        str(entry["domain"]),
+                        str(entry.get("category") or ""),
+                        str(entry.get("contentType") or ""),
+                        str(entry.get("granularity") or ""),
+                    )
+
+                # The catalog entry (possibly edited since) supersedes a learned one
+                self._conn.execute("DELETE FROM examples WHERE origin = 'catalog'")
+                for url, (terms, *labels) in catalog.items():
+                    if terms:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO examples "
+                            "(url, origin, terms, domain, category, content_type, granularity) "
+                            "VALUES (?, 'catalog', ?, ?, ?, ?, ?)",
+                            (url, json.dumps(terms), *labels),
+                        )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('catalog_sha256', ?)", (digest,)
+                )
+                self._conn.commit()
+
+            rows = self._conn.execute(
+                "SELECT url, terms, domain, category, content_type, granularity FROM examples"
+            ).fetchall()
+
+        index = TfidfIndex()
+        labels = {}
+        for url, terms, *values in rows:
+            index.add(url, Counter(json.loads(terms)))
+            labels[url] = dict(zip(LABEL_FIELDS, values))
+        self.index, self.labels = index, labels
+        return retrain
+
+    def learn(self, resource):
+        """Add (or replace) an example from a resource written to the catalog.
+
+        Takes a ClassifiedResource; it is vectorized like a catalog entry,
+        so it is usable before resources.yaml is re-read.
+        """
+        from .urls import normalize_url
+
+        key = normalize_url(resource.url)
+        terms = example_terms(resource.title, resource.alternate_labels, resource.definition)
+        if not terms:
+            return
+        values = tuple(str(getattr(resource, field) or "") for field in LABEL_FIELDS)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO examples (url, origin, terms, domain, category, content_type, granularity) "
+                "VALUES (?, 'learned', ?, ?, ?, ?, ?)",
+                (key, json.dumps(terms), *values),
+            )
+            self._conn.commit()
+            self.labels[key] = dict(zip(LABEL_FIELDS, values))
+            self.stats["learned"] += 1
+        self.index.add(key, terms)
+
+    # -------------------------------------------------------------------------
+    # Prediction
+    # -------------------------------------------------------------------------
+
+    def _valid(self, labels: dict) -> bool:
+        if self.taxonomy is None:
+            return True
+        domain = self.taxonomy.get(labels["domain"])
+        return domain is not None and labels["category"] in domain["categories"]
+
+    def predict(self, title: str, text: str, url: Optional[str] = None) -> Optional[Prediction]:
+        """Weighted kNN vote, or None with too few examples or no neighbors."""
+        if len(self.index) < self.min_examples:
+            return None
+        exclude = ()
+        if url:
+            from .urls import normalize_url
+            exclude = (normalize_url(url),)  # Don't let a page vote for itself
+
+        neighbors = [
+            (key, score)
+            for key, score in self.index.nearest(term_counts(query_text(title, text)), k=self.neighbors, exclude=exclude)
+            if self._valid(self.labels[key])
+        ]
+        if not neighbors:
+            return None
+
+        votes: dict[str, Counter] = {field: Counter() for field in ("placement", "content_type", "granularity")}
+        for key, score in neighbors:
+            labels = self.labels[key]
+            votes["placement"][(labels["domain"], labels["category"])] += score
+            if labels["content_type"]:
+                votes["content_type"][labels["content_type"]] += score
+            if labels["granularity"]:
+                votes["granularity"][labels["granularity"]] += score
+
+        total = sum(votes["placement"].values())
+        ranked = votes["placement"].most_common(2)
+        (domain, category), top = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+
+        def winner(field: str, default: str) -> str:
+            return votes[field].most_common(1)[0][0] if votes[field] else default
+
+        return Prediction(
+            domain=domain,
+            category=category,
+            content_type=winner("content_type", "essay"),
+            granularity=winner("granularity", "conceptual"),
+            share=top / total,
+            margin=(top - runner_up) / total,
+            similarity=neighbors[0][1],
+            neighbors=[key for key, _ in neighbors],
+        )
+
+    def confident(self, prediction: Optional[Prediction]) -> bool:
+        """True if the prediction is clear enough to skip the LLM."""
+        return (
+            prediction is not None
+            # A lone neighbor always has a 100% margin
+            and len(prediction.neighbors) >= min(3, self.neighbors)
+            and prediction.margin >= self.min_margin
+            and prediction.similarity >= self.min_similarity
+        )
+
+    def record(self, source: str):
+        """Count a classification made locally ("local") or by the LLM ("llm")."""
+        with self._lock:
+            self.stats[source] += 1
@@ -0,0 +1,201 @@
+"""
+Pre-LLM cleanup of extracted text.
+
+summarize's output often opens with navigation, subscribe prompts and
+cookie banners, and repeats share/like widgets between sections; the
+LLM stages each used to send a raw prefix of it. prepare() strips that
+boilerplate, drops repeated lines and builds one informative window
+(the article's lead plus its densest remaining paragraphs, in document
+order) that every stage reuses.
+
+Token counts are estimates (~4 characters per token); no tokenizer is
+needed.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+
+from .vectors import tokenize
+
+DEFAULT_WINDOW_CHARS = 4000
+
+# Share of the window reserved for the opening paragraphs, which carry the
+# title, byline and thesis
+LEAD_SHARE = 0.4
+
+# Lines longer than this are content, whatever words they contain
+MAX_BOILERPLATE_WORDS = 25
+
+OMISSION = "[...]"
+
+BOILERPLATE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r"^(subscribe|sign up|sign in|log ?in|register|get started)\b",
+    r"\bsubscribe (now|for free|to (my|our|the)|today)\b",
+    r"\b(upgrade to paid|become a paid subscriber|pledge your support|support my work)\b",
+    r"^(like|comment|restack|share|reply|follow|menu|search|home|about|archive|top|latest|discussion)s?$",
+    r"^share (this|on)\b",
+    r"^skip to (main )?content$",
+    r"\bcookies\b.*\b(accept|consent|policy|settings|preferences)\b",
+    r"^(this (site|website) uses|we use) cookies\b",
+    r"^accept( all)?( cookies)?$",
+    r"^(privacy policy|terms of (service|use)|all rights reserved)",
+    r"(©|\(c\) \d{4}|copyright \d{4})",
+    r"^discussion about this (post|video|episode)",
+    r"^ready for more\?$",
+    r"^(read more|continue reading|load more|see all|view all|show more)\b",
+    r"^thanks for reading\b",
+    r"^(previous|next)( post| article| episode)?$",
+    r"^(powered by|start writing|get the app)\b",
+    r"^listen to this (post|article|episode)",
+    r"^\d+\s*(likes?|comments?|restacks?|shares?)$",
+    r"^(advertisement|sponsored)$",
+)]
+
+# Lines that are nothing but links or images (menus, share bars, badges)
+_LINK_ONLY = re.compile(r"^(\s*(!?\[[^\]]*\]\([^)]*\)|https?://\S+)\s*[|·•,–-]?)+\s*$")
+
+
+@dataclass
+class PreparedText:
+    """Cleaned text for the LLM stages, with what was removed."""
+    text: str                 # the informative window
+    clean: str                # all of the cleaned text
+    raw_chars: int
+    clean_chars: int          # len(clean)
+    boilerplate_lines: int
+    duplicate_lines: int
+
+    def token_savings(self, raw: str, limits: dict[str, int]) -> dict:
+        """Estimated prompt tokens with and without preprocessing.
+
+        Args:
+            raw: The extracted text the stages would otherwise receive
+            limits: Characters of content each stage sends, by stage name
+        """
+        before = sum(estimate_tokens(raw[:limit]) for limit in limits.values())
+        after = sum(estimate_tokens(self.text[:limit]) for limit in limits.values())
+        return {"tokens_before": before, "tokens_after": after, "tokens_saved": before - after}
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def is_boilerplate(line: str) -> bool:
+    """True for navigation, subscription, sharing and cookie lines."""
+    stripped = line.strip().strip("#*_>").strip()
+    if not stripped:
+        return False
+    if _LINK_ONLY.match(stripped):
+        return True
+    if len(stripped.split()) > MAX_BOILERPLATE_WORDS:
+        return False
+    return any(pattern.search(stripped) for pattern in BOILERPLATE_PATTERNS)
+
+
+def clean_lines(text: str) -> tuple[list[str], int, int]:
+    """Drop boilerplate and repeated lines; collapse blank runs.
+
+    Returns:
+        (kept lines, boilerplate lines removed, duplicate lines removed)
+    """
+    kept: list[str] = []
+    seen: set[str] = set()
+    boilerplate = duplicates = 0
+    in_code = False
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        if in_code or line.lstrip().startswith("```"):
+            kept.append(line.rstrip())  # Code is kept verbatim
+            continue
+        key = " ".join(line.lower().split())
+        if not key:
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if is_boilerplate(line):
+            boilerplate += 1
+            continue
+        # Short lines ("---", "1.", table rules) legitimately repeat
+        if len(key.split()) >= 3:
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+        kept.append(line.rstrip())
+    while kept and not kept[-1]:
+        kept.pop()
+    return kept, boilerplate, duplicates
+
+
+def _density(paragraph: str) -> float:
+    """Distinct content words, discounted for length and favoring prose."""
+    words = paragraph.split()
+    if len(words) < 8:
+        # Headings and captions: cheap, and they outline the article
+        return 0.5 if paragraph.lstrip().startswith("#") else 0.0
+    terms = tokenize(paragraph)
+    return len(set(terms)) / math.sqrt(len(words))
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut if cut else text[:limit]
+
+
+def informative_window(paragraphs: list[str], window_chars: int) -> str:
+    """The lead paragraphs plus the densest others, in document order."""
+    text = "\n\n".join(paragraphs)
+    if len(text) <= window_chars:
+        return text
+
+    chosen: dict[int, str] = {}
+    used = 0
+    lead_budget = int(window_chars * LEAD_SHARE)
+    for i, paragraph in enumerate(paragraphs):
+        if used >= lead_budget:
+            break
+        piece = _truncate(paragraph, lead_budget - used)
+        chosen[i] = piece
+        used += len(piece) + 2
+
+    ranked = sorted(
+        (i for i in range(len(paragraphs)) if i not in chosen),
+        key=lambda i: _density(paragraphs[i]),
+        reverse=True,
+    )
+    gap_cost = len(OMISSION) + 4
+    for i in ranked:
+        size = len(paragraphs[i]) + 2 + gap_cost
+        if _density(paragraphs[i]) <= 0 or used + size > window_chars:
+            continue
+        chosen[i] = paragraphs[i]
+        used += size
+
+    parts = []
+    previous = -1
+    for i in sorted(chosen):
+        if i != previous + 1:
+            parts.append(OMISSION)
+        parts.append(chosen[i])
+        previous = i
+    return "\n\n".join(parts)
+
+
+def prepare(text: str, window_chars: int = DEFAULT_WINDOW_CHARS) -> PreparedText:
+    """Clean extracted text and build the window the LLM stages share."""
+    lines, boilerplate, duplicates = clean_lines(text or "")
+    paragraphs = [p.strip() for p in "\n".join(lines).split("\n\n") if p.strip()]
+    clean = "\n\n".join(paragraphs)
+    return PreparedText(
+        text=informative_window(paragraphs, window_chars),
+        clean=clean,
+        raw_chars=len(text or ""),
+        clean_chars=len(clean),
+        boilerplate_lines=boilerplate,
+        duplicate_lines=duplicates,
+    )
@@ -0,0 +1,123 @@
+"""
+Relationship suggestions from sparse text similarity.
+
+Every resource is a TF-IDF vector over its preferred label, alternate
+labels and definition (vectors.py). New resources get their nearest
+catalog neighbors as `related` relationships; backfill() computes the
+neighbors of the whole catalog in one pass over the inverted index and
+fill_relationships() writes them into resources.yaml.
+
+Only `related` is suggested: the directional types in RELATIONSHIP_TYPES
+(broader, requires-prerequisite, ...) need a human to pick a direction.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .vectors import TfidfIndex, term_counts
+
+
+@dataclass
+class Relationship:
+    """A suggested link from one resource to another."""
+    target: str
+    type: str = "related"
+    score: float = 0.0
+
+
+def resource_terms(title: Optional[str], alternate_labels: Iterable, definition: Optional[str]):
+    """Term counts for a resource's label text (unigrams: definitions are short)."""
+    if isinstance(alternate_labels, str):
+        alternate_labels = [alternate_labels]
+    return term_counts(
+        str(title or ""),
+        " . ".join(str(label) for label in alternate_labels or []),
+        str(definition or ""),
+        bigrams=False,
+    )
+
+
+class RelationshipSuggester:
+    """Nearest-neighbor relationship suggestions over the catalog.
+
+    Usage:
+        suggester = RelationshipSuggester(resources_file, max_suggestions=5, threshold=0.25)
+        suggester.suggest(resource)       # -> [Relationship, ...]
+        suggester.add(resource)           # make it a candidate for later ones
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, resources_file: Path, max_suggestions: int = 5, threshold: float = 0.25):
+        from .scan import scan_entries
+
+        self.max_suggestions = max_suggestions
+        self.threshold = threshold
+        self.index = TfidfIndex()
+        self._lock = threading.Lock()
+        fields = ("id", "preferredLabel", "alternateLabels", "definition")
+        for entry in scan_entries(resources_file, "resources", fields):
+            if entry.get("id"):
+                self.index.add(
+                    str(entry["id"]),
+                    resource_terms(entry.get("preferredLabel"), entry.get("alternateLabels"), entry.get("definition")),
+                )
+
+    def suggest(self, resource) -> list[Relationship]:
+        """Suggested relationships for a ClassifiedResource, best first."""
+        terms = resource_terms(resource.title, resource.alternate_labels, resource.definition)
+        return [
+            Relationship(target=str(key), score=round(score, 3))
+            for key, score in self.index.nearest(
+                terms, k=self.max_suggestions, min_score=self.threshold, exclude=(resource.id,)
+            )
+        ]
+
+    def add(self, resource):
+        """Index a newly written resource."""
+        with self._lock:
+            self.index.add(
+                resource.id,
+                resource_terms(resource.title, resource.alternate_labels, resource.definition),
+            )
+
+    def backfill(self) -> dict[str, list[Relationship]]:
+        """Suggested relationships for every catalog resource, in one pass."""
+        return {
+            str(key): [Relationship(target=str(other), score=round(score, 3)) for other, score in neighbors]
+            for key, neighbors in self.index.all_nearest(k=self.max_suggestions, min_score=self.threshold).items()
+        }
+
+
+# =============================================================================
+# RESOURCES.YAML REWRITE
+# =============================================================================
+
+_ENTRY_ID = re.compile(r"^  - id: *(\S+)")
+_EMPTY_RELATIONSHIPS = "    relationships: []"
+
+
+def fill_relationships(text: str, suggestions: dict[str, list[Relationship]]) -> tuple[str, int]:
+    """Replace empty `relationships: []` entries with suggestions.
+
+    Entries that already have relationships (e.g. curated by hand) are
+    left alone. Everything else in the file is kept byte-for-byte.
+
+    Returns:
+        (new text, number of resources filled)
+    """
+    from .yaml_writer import format_relationships
+
+    lines = text.split("\n")
+    current = None
+    filled = 0
+    for i, line in enumerate(lines):
+        if match := _ENTRY_ID.match(line):
+            current = match.group(1).strip("\"'")
+        elif line.rstrip() == _EMPTY_RELATIONSHIPS and suggestions.get(current):
+            lines[i] = format_relationships(suggestions[current])
+            filled += 1
+    return "\n".join(lines), filled
@@ -0,0 +1,245 @@
+"""
+Append-only, segmented storage for pipeline run logs.
+
+Runs are appended as one JSON line each to logs/ingestion/runs-NNNNNN.jsonl.
+When the active segment passes max_segment_bytes a new one is started and
+the closed segment is compressed to .jsonl.zst (if the optional zstandard
+package is installed). A SQLite sidecar index (index.sqlite) maps each
+run_id to its segment, byte offset and length, so a single run is read
+without scanning the history; at worst one segment is decompressed.
+
+Appends take the same advisory file lock as the catalog writers
+(writer.file_lock), so concurrent processes (ingest.py runs, the bird
+cron job) never interleave lines or rotate the same segment twice.
+
+Run logs written before segments (one pretty-printed <run_id>.json per
+run) are still read by iter_records.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .writer import file_lock
+
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+
+SEGMENT_SUFFIX = ".jsonl"
+COMPRESSED_SUFFIX = ".jsonl.zst"
+_SEGMENT_NAME = re.compile(r"^runs-(\d{6})\.jsonl(\.zst)?$")
+
+
+def _zstd():
+    """The zstandard module, or None if it isn't installed."""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def segment_names(log_dir: Path) -> list[str]:
+    """Segment stems (runs-NNNNNN), oldest first."""
+    stems = set()
+    for path in log_dir.glob("runs-*"):
+        if match := _SEGMENT_NAME.match(path.name):
+            stems.add(f"runs-{match.group(1)}")
+    return sorted(stems)
+
+
+def _open_segment(log_dir: Path, stem: str):
+    """Open a segment for reading (compressed or not), or None if it's gone."""
+    plain = log_dir / f"{stem}{SEGMENT_SUFFIX}"
+    if plain.exists():
+        return open(plain, "rb")
+    compressed = log_dir / f"{stem}{COMPRESSED_SUFFIX}"
+    if compressed.exists():
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError(f"{compressed.name} is compressed; install zstandard to read it")
+        return zstandard.ZstdDecompressor().stream_reader(open(compressed, "rb"), closefd=True)
+    return None
+
+
+class RunIndex:
+    """SQLite sidecar index: run_id -> (segment, offset, length)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                started_at TEXT
+            )"""
+        )
+        self._conn.commit()
+
+    def add_many(self, rows: list[tuple[str, str, int, int, Optional[str]]]):
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def locate(self, run_id: str) -> Optional[tuple[str, int, int]]:
+        """(segment, offset, length) of a run, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT segment, offset, length FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+
+class SegmentWriter:
+    """Buffered appender of run records to rotating JSONL segments.
+
+    Usage:
+        writer = SegmentWriter(log_dir, max_segment_bytes=8 << 20)
+        writer.append(record)      # buffered; written every flush_every runs
+        writer.flush()             # and at exit (IngestionLogger registers it)
+
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        compress: bool = True,
+        flush_every: int = 1,
+    ):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.compress = compress
+        self.flush_every = max(1, flush_every)
+        self.index = RunIndex(self.log_dir / "index.sqlite")
+        self._pending: list[dict] = []
+        self._lock = threading.Lock()
+
+    def append(self, record: dict):
+        """Queue a run record (must have run_id)."""
+        with self._lock:
+            self._pending.append(record)
+            if len(self._pending) < self.flush_every:
+                return
+            pending, self._pending = self._pending, []
+        self._write(pending)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            self._write(pending)
+
+    def _write(self, records: list[dict]):
+        lines = [(json.dumps(r, separators=(",", ":"), default=str) + "\n").encode() for r in records]
+        with file_lock(self.log_dir / "runs"):
+            stems = segment_names(self.log_dir)
+            stem = stems[-1] if stems else "runs-000001"
+            path = self.log_dir / f"{stem}{SEGMENT_SUFFIX}"
+            if not path.exists():
+                # The newest segment was closed (and compressed) elsewhere
+                stem = self._next_stem(stems)
+                path = self.log_dir / f"{stem}{SEGMENT_SUFFIX}"
+            with open(path, "ab") as f:
+                offset = f.seek(0, 2)
+                rows = []
+                for record, line in zip(records, lines):
+                    rows.append((record["run_id"], stem, offset, len(line), record.get("started_at")))
+                    offset += len(line)
+                f.write(b"".join(lines))
+            self.index.add_many(rows)
+            if offset >= self.max_segment_bytes:
+                self._rotate(path, stem)
+
+    @staticmethod
+    def _next_stem(stems: list[str]) -> str:
+        last = int(stems[-1].split("-")[1]) if stems else 0
+        return f"runs-{last + 1:06d}"
+
+    def _rotate(self, path: Path, stem: str):
+        """Start a new segment; compress the closed one if zstandard is installed."""
+        (self.log_dir / f"{self._next_stem([stem])}{SEGMENT_SUFFIX}").touch()
+        zstandard = _zstd() if self.compress else None
+        if zstandard is None:
+            return
+        compressed = path.with_name(path.name[: -len(SEGMENT_SUFFIX)] + COMPRESSED_SUFFIX)
+        partial = compressed.with_suffix(".tmp")
+        with open(path, "rb") as source, open(partial, "wb") as target:
+            zstandard.ZstdCompressor(level=10).copy_stream(source, target)
+        partial.replace(compressed)
+        # Readers fall back to the compressed file once the plain one is gone
+        path.unlink()
+
+
+def read_run(log_dir: Path, run_id: str) -> Optional[dict]:
+    """One run's record, via the index (legacy <run_id>.json files too)."""
+    legacy = log_dir / f"{run_id}.json"
+    if legacy.exists():
+        return json.loads(legacy.read_text())
+    if not (log_dir / "index.sqlite").exists():
+        return None
+    location = RunIndex(log_dir / "index.sqlite").locate(run_id)
+    if location is None:
+        return None
+    stem, offset, length = location
+    stream = _open_segment(log_dir, stem)
+    if stream is None:
+        return None
+    with stream:
+        if hasattr(stream, "seekable") and stream.seekable():
+            stream.seek(offset)
+        else:
+            # Compressed: skip forward (bounded by the segment size)
+            remaining = offset
+            while remaining:
+                remaining -= len(stream.read(min(remaining, 1 << 20)))
+        return json.loads(stream.read(length))
+
+
+def iter_records(log_dir: Path) -> Iterator[dict]:
+    """Every logged run, oldest first: legacy JSON files, then segments.
+
+    Streams one line at a time; unreadable entries are skipped.
+    """
+    for path in sorted(log_dir.glob("*.json")):
+        try:
+            yield json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+    for stem in segment_names(log_dir):
+        try:
+            stream = _open_segment(log_dir, stem)
+        except RuntimeError:
+            continue  # Compressed, and zstandard isn't installed
+        if stream is None:
+            continue
+        with stream:
+            for line in _lines(stream):
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by a crash
+
+
+def _lines(stream) -> Iterator[bytes]:
+    """Lines of a binary stream (zstd readers have no line iteration)."""
+    buffer = b""
+    while chunk := stream.read(1 << 16):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        yield from (line for line in lines if line)
+    if buffer:
+        yield buffer
@@ -0,0 +1,342 @@
+"""
+Streaming scanners for the catalog YAML files.
+
+Duplicate checks and the catalog index only need a handful of scalar
+fields (id, url, author, ...) from each entry, but a full parse builds the
+whole document tree including every definition and label. scan_entries()
+streams a top-level list (e.g. ``resources:``) and yields just the
+requested fields per entry, in constant memory:
+
+- A line-oriented fast path handles the layout our writers produce
+  (block sequence of block mappings, scalar values on the key line).
+- Anything it doesn't recognize (flow collections, block scalars,
+  anchors, multi-line plain scalars) hands over to a YAML event scanner
+  that builds only the requested values.
+
+validate_scan() checks both paths against a full parse.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+import yaml
+from yaml.constructor import SafeConstructor
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+from yaml.resolver import Resolver
+
+from .catalog import SafeLoader, load_yaml
+
+# Value starts that the fast path leaves to the event scanner
+_COMPLEX_START = ("|", ">", "[", "{", "&", "*", "!", "%", "@", "`")
+
+_resolver = Resolver()
+
+
+class _Unsupported(Exception):
+    """Raised by the fast path on input it can't scan exactly."""
+
+
+def _construct(node) -> Any:
+    # A fresh constructor per value keeps no state between entries
+    return SafeConstructor().construct_object(node, deep=True)
+
+
+# =============================================================================
+# LINE-ORIENTED FAST PATH
+# =============================================================================
+
+def _plain_scalar(text: str) -> Any:
+    """Value of a single-line scalar as PyYAML would construct it."""
+    if text[0] in "\"'":
+        try:
+            value = yaml.load(text, Loader=SafeLoader)
+        except yaml.YAMLError as e:
+            raise _Unsupported(f"unparseable quoted scalar: {text!r}") from e
+        if not isinstance(value, str):
+            raise _Unsupported(f"unexpected quoted scalar: {text!r}")
+        return value
+
+    if text.startswith(_COMPLEX_START) or text.startswith(("- ", "? ", ": ")):
+        raise _Unsupported(f"complex value: {text!r}")
+
+    # Strip a trailing comment (" #" starts one; "#" alone inside a URL doesn't)
+    comment = text.find(" #")
+    if comment != -1:
+        text = text[:comment]
+    text = text.rstrip()
+    if ": " in text or text.endswith(":"):
+        raise _Unsupported(f"ambiguous plain scalar: {text!r}")
+
+    tag = _resolver.resolve(ScalarNode, text, (True, False))
+    if tag == "tag:yaml.org,2002:str":
+        return text
+    return _construct(ScalarNode(tag, text))
+
+
+def _scan_lines(
+    path: Path,
+    section: str,
+    fields: frozenset[str],
+) -> Iterator[dict[str, Any]]:
+    """Fast path: scan the section line by line.
+
+    Raises:
+        _Unsupported: On layout it can't scan exactly (caller falls back)
+    """
+    header = re.compile(rf"^{re.escape(section)}:[ \t]*(#.*)?$")
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(("---", "...", "%")):
+                raise _Unsupported("multi-document stream")
+            if header.match(line.rstrip("\n")):
+                break
+        else:
+            return
+
+        item_indent: Optional[int] = None
+        entry: Optional[dict[str, Any]] = None
+        # Requested key on the previous significant line; a deeper line after
+        # it means its value spans lines
+        last_requested: Optional[str] = None
+
+        for line in f:
+            stripped = line.lstrip(" ")
+            if stripped[:1] in ("\n", "#", ""):
+                continue
+            indent = len(line) - len(stripped)
+
+            if indent == 0:
+                if line.startswith(("---", "...", "%", "-", "\t")):
+                    raise _Unsupported("unexpected top-level content")
+                break  # Next top-level key ends the section
+            if stripped[0] == "\t":
+                raise _Unsupported("tab indentation")
+
+            if stripped[:2] == "- " and (item_indent is None or indent + 2 == item_indent):
+                if entry is not None:
+                    yield entry
+                item_indent = indent + 2
+                entry = {}
+                last_requested = None
+                stripped = stripped[2:].lstrip(" ")
+                indent = len(line) - len(stripped)
+                if indent != item_indent or stripped[:1] in ("{", "[", "&", "!", "*", "-", "?"):
+                    raise _Unsupported("entry is not a simple block mapping")
+
+            if item_indent is None:
+                raise _Unsupported(f"unexpected line before first entry: {line!r}")
+
+            if indent > item_indent:
+                if last_requested is not None:
+                    raise _Unsupported(f"{last_requested!r} value spans lines")
+                continue  # Nested value of a field we don't need
+            if indent < item_indent:
+                raise _Unsupported(f"unexpected indentation: {line!r}")
+
+            name, colon, value = stripped.partition(":")
+            # "key: value" or "key:" only; quoted/complex/padded keys go to the event scanner
+            if not colon or value[:1] not in (" ", "\t", "\n", "") or stripped[0] in "\"'?" or name[-1:].isspace():
+                raise _Unsupported(f"unrecognized line: {line.rstrip()!r}")
+            if name not in fields:
+                last_requested = None
+                continue
+            value = value.strip()
+            last_requested = name
+            if not value or value[0] == "#":
+                entry[name] = None  # Unless a deeper line follows (checked above)
+            else:
+                entry[name] = _plain_scalar(value)
+
+        if entry is not None:
+            yield entry
+
+
+# =============================================================================
+# YAML EVENT SCANNER
+# =============================================================================
+
+def _skip_value(events: Iterator, event) -> None:
+    """Consume the events of a value whose first event is event."""
+    if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+        depth = 1
+        while depth:
+            event = next(events)
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+
+
+def _compose_value(events: Iterator, event, anchors: dict):
+    """Build a node for one value from its events (like yaml.compose)."""
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise _Unsupported(f"alias to an anchor outside requested fields: {event.anchor}")
+        return anchors[event.anchor]
+
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = _resolver.resolve(ScalarNode, event.value, event.implicit)
+        node = ScalarNode(tag, event.value, style=event.style)
+    elif isinstance(event, yaml.SequenceStartEvent):
+        tag = event.tag if event.tag not in (None, "!") else _resolver.resolve(SequenceNode, None, event.implicit)
+        node = SequenceNode(tag, [])
+        while not isinstance(child := next(events), yaml.SequenceEndEvent):
+            node.value.append(_compose_value(events, child, anchors))
+    elif isinstance(event, yaml.MappingStartEvent):
+        tag = event.tag if event.tag not in (None, "!") else _resolver.resolve(MappingNode, None, event.implicit)
+        node = MappingNode(tag, [])
+        while not isinstance(child := next(events), yaml.MappingEndEvent):
+            key = _compose_value(events, child, anchors)
+            node.value.append((key, _compose_value(events, next(events), anchors)))
+    else:
+        raise _Unsupported(f"unexpected event: {event}")
+
+    if getattr(event, "anchor", None):
+        anchors[event.anchor] = node
+    return node
+
+
+def _scan_events(
+    path: Path,
+    section: str,
+    fields: frozenset[str],
+) -> Iterator[dict[str, Any]]:
+    """Event path: scan the section from the YAML event stream.
+
+    Raises:
+        _Unsupported: On aliases into unrequested data (caller falls back)
+    """
+    with open(path, "rb") as f:
+        events = yaml.parse(f, Loader=SafeLoader)
+        for event in events:
+            if isinstance(event, yaml.MappingStartEvent):
+                break
+        else:
+            return
+
+        # Walk the root mapping's keys until we reach the section
+        while True:
+            event = next(events)
+            if isinstance(event, yaml.MappingEndEvent):
+                return
+            value = next(events)
+            if isinstance(event, yaml.ScalarEvent) and event.value == section:
+                break
+            _skip_value(events, value)
+
+        if not isinstance(value, yaml.SequenceStartEvent):
+            return
+
+        while True:
+            event = next(events)
+            if isinstance(event, yaml.SequenceEndEvent):
+                return  # Section done; don't parse the rest of the file
+            if not isinstance(event, yaml.MappingStartEvent):
+                _skip_value(events, event)
+                continue
+
+            entry: dict[str, Any] = {}
+            anchors: dict = {}
+            while not isinstance(key := next(events), yaml.MappingEndEvent):
+                value = next(events)
+                if isinstance(key, yaml.ScalarEvent) and key.value in fields:
+                    entry[key.value] = _construct(_compose_value(events, value, anchors))
+                else:
+                    _skip_value(events, value)
+            yield entry
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+
+def _scan_full(path: Path, section: str, fields: frozenset[str]) -> Iterator[dict[str, Any]]:
+    data = load_yaml(path, default={}, snapshot=False)
+    for item in (data.get(section) or []) if isinstance(data, dict) else []:
+        if isinstance(item, dict):
+            yield {k: v for k, v in item.items() if k in fields}
+
+
+_SCANNERS = {"lines": _scan_lines, "events": _scan_events, "full": _scan_full}
+
+
+def scan_entries(
+    path: Path,
+    section: str,
+    fields: Iterable[str],
+    method: str = "auto",
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream the entries of a top-level list, keeping only some fields.
+
+    Args:
+        path: YAML file (e.g. resources.yaml)
+        section: Top-level key holding a list of mappings (e.g. "resources")
+        fields: Keys to keep from each entry; missing keys are omitted
+        method: "auto" (fast path with fallback), "lines", "events" or "full"
+
+    Yields:
+        One dict per mapping entry, in file order
+    """
+    path = Path(path)
+    fields = frozenset(fields)
+    if not path.exists():
+        return
+    if method != "auto":
+        yield from _SCANNERS[method](path, section, fields)
+        return
+
+    # Resume the next scanner after the entries already yielded
+    yielded = 0
+    for scanner in (_scan_lines, _scan_events, _scan_full):
+        try:
+            for i, entry in enumerate(scanner(path, section, fields)):
+                if i >= yielded:
+                    yield entry
+                    yielded += 1
+            return
+        except _Unsupported:
+            continue
+
+
+def iter_resource_urls(path: Optional[Path] = None) -> Iterator[tuple[str, Optional[str]]]:
+    """Yield (id, url) for every resource in resources.yaml."""
+    path = path or Path(__file__).parent.parent / "resources.yaml"
+    for entry in scan_entries(path, "resources", ("id", "url")):
+        if "id" in entry:
+            url = entry.get("url")
+            yield str(entry["id"]), None if url is None else str(url)
+
+
+def validate_scan(
+    path: Path,
+    section: str = "resources",
+    fields: Iterable[str] = ("id", "url"),
+) -> list[str]:
+    """
+    Check that every scan method agrees with a full parse.
+
+    Returns:
+        Human-readable mismatch descriptions (empty if all agree)
+    """
+    expected = list(scan_entries(path, section, fields, method="full"))
+    problems = []
+    for method in ("lines", "events", "auto"):
+        try:
+            actual = list(scan_entries(path, section, fields, method=method))
+        except _Unsupported as e:
+            if method == "lines":
+                continue  # Falling back is allowed; mismatching is not
+            problems.append(f"{method}: unsupported input ({e})")
+            continue
+        if len(actual) != len(expected):
+            problems.append(f"{method}: {len(actual)} entries, full parse has {len(expected)}")
+        for i, (got, want) in enumerate(zip(actual, expected)):
+            if got != want:
+                problems.append(f"{method}: entry {i} differs: {got!r} != {want!r}")
+                break
+    return problems
@@ -0,0 +1,230 @@
+"""
+URL canonicalization for duplicate detection.
+
+clean_url() drops tracking parameters and fragments while keeping a URL
+fetchable; normalize_url() turns it into the duplicate-check key. Short
+links (t.co, bit.ly, ...) are expanded by RedirectResolver, which keeps
+resolved targets in a persistent cache so each short link costs one
+request ever.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# Bump when normalize_url changes so stored normalized URLs are rebuilt
+NORMALIZER_VERSION = 2
+
+# Query parameters that only carry tracking/referral state, on any host
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid",
+    "mc_cid", "mc_eid", "igshid", "_hsenc", "_hsmi", "mkt_tok",
+    "ref", "ref_src", "ref_url", "s",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# Extra tracking parameters for specific hosts (matched on domain suffix)
+HOST_TRACKING_PARAMS = {
+    "x.com": {"t"},
+    "twitter.com": {"t"},
+    "substack.com": {"r", "triedRedirect", "showWelcome", "publication_id", "post_id", "isFreemail"},
+    "medium.com": {"source", "sk"},
+    "youtube.com": {"si", "feature", "pp"},
+    "youtu.be": {"si", "feature"},
+    "linkedin.com": {"trk", "trackingId", "lipi"},
+}
+
+# Link shorteners / redirectors worth a network round trip to expand
+SHORTENER_HOSTS = {
+    "t.co", "bit.ly", "buff.ly", "ow.ly", "tinyurl.com", "lnkd.in", "goo.gl",
+    "dlvr.it", "trib.al", "ift.tt", "is.gd", "t.ly", "rebrand.ly", "shorturl.at",
+    "tiny.cc", "rb.gy", "cutt.ly", "hubs.ly", "hubs.la",
+}
+# Redirect endpoints on hosts that otherwise serve content: host -> first path segment
+SHORTENER_PATHS = {
+    "substack.com": "redirect",
+    "l.facebook.com": "l.php",
+    "google.com": "url",
+}
+
+
+def _host_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+def _strip_www(host: str) -> str:
+    return host[4:] if host.startswith("www.") else host
+
+
+def clean_url(url: str) -> str:
+    """Drop tracking parameters and the fragment; otherwise leave the URL as is."""
+    parsed = urlparse(url.strip())
+    host = parsed.hostname or ""
+    extra = set()
+    for domain, params in HOST_TRACKING_PARAMS.items():
+        if _host_matches(host, domain):
+            extra |= params
+
+    params = parse_qsl(parsed.query, keep_blank_values=True)
+    kept = [
+        (key, value)
+        for key, value in params
+        if key not in TRACKING_PARAMS
+        and key not in extra
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    # Re-encode only if something was dropped, so the URL stays byte-identical otherwise
+    query = parsed.query if len(kept) == len(params) else urlencode(kept, doseq=True)
+    return urlunparse(parsed._replace(query=query, fragment=""))
+
+
+def _rewrite_host(host: str, path: str, query: list[tuple[str, str]]) -> tuple[str, str, list]:
+    """Map equivalent hosts onto one form (youtu.be, twitter.com, open.substack.com)."""
+    if host == "youtu.be" and path.strip("/"):
+        return "youtube.com", "/watch", [("v", path.strip("/"))] + query
+    if host in ("m.youtube.com", "music.youtube.com"):
+        return "youtube.com", path, query
+    if host in ("twitter.com", "mobile.twitter.com", "mobile.x.com"):
+        return "x.com", path, query
+    if host == "open.substack.com" and path.startswith("/pub/"):
+        # /pub/<name>/p/<slug> -> <name>.substack.com/p/<slug>
+        parts = path.split("/")
+        if len(parts) > 2 and parts[2]:
+            return f"{parts[2]}.substack.com", "/" + "/".join(parts[3:]), query
+    return host, path, query
+
+
+def normalize_url(url: str) -> str:
+    """Normalize URL for deduplication.
+
+    Tracking parameters, fragments, default ports, a leading "www." and
+    trailing slashes are dropped; http and https compare equal; remaining
+    query parameters are sorted.
+    """
+    parsed = urlparse(clean_url(url))
+    host = _strip_www((parsed.hostname or "").lower())
+    query = parse_qsl(parsed.query, keep_blank_values=True)
+    host, path, query = _rewrite_host(host, parsed.path, query)
+
+    scheme = parsed.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+    netloc = host
+    try:
+        port = parsed.port
+    except ValueError:
+        # Malformed port (e.g. ":abc"): keep the netloc as written
+        port, netloc = None, parsed.netloc.lower()
+    if port and port not in (80, 443):
+        netloc = f"{host}:{port}"
+
+    return urlunparse((
+        scheme,
+        netloc,
+        path.rstrip("/") or "/",
+        "",  # params
+        urlencode(sorted(query), doseq=True),
+        "",  # fragment
+    ))
+
+
+def is_shortener(url: str) -> bool:
+    """True if the URL is on a known link shortener / redirector."""
+    parsed = urlparse(url)
+    host = _strip_www((parsed.hostname or "").lower())
+    if host in SHORTENER_HOSTS:
+        return True
+    return SHORTENER_PATHS.get(host) == parsed.path.strip("/").split("/", 1)[0]
+
+
+# =============================================================================
+# REDIRECT RESOLUTION
+# =============================================================================
+
+class RedirectResolver:
+    """Expands short links with HEAD requests over one pooled HTTP client.
+
+    Resolved targets are kept in a DiskCache (.cache/redirects.sqlite), so
+    repeat lookups — across runs too — need no network at all. URLs that are not
+    on a known shortener are returned unchanged without a request.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        use_cache: bool = True,
+        timeout: float = 10.0,
+        max_redirects: int = 10,
+    ):
+        from .cache import CACHE_DIR, DiskCache
+
+        self.store = (
+            DiskCache(cache_path or CACHE_DIR / "redirects.sqlite", max_bytes=20 * 1024 * 1024)
+            if use_cache else None
+        )
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.requests = 0
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Shared httpx client (keeps connections to each shortener alive)."""
+        with self._lock:
+            if self._client is None:
+                import httpx
+
+                self._client = httpx.Client(
+                    follow_redirects=True,
+                    max_redirects=self.max_redirects,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                    headers={"User-Agent": "Mozilla/5.0 (compatible; data-centered-ingest)"},
+                )
+            return self._client
+
+    def resolve(self, url: str) -> str:
+        """Final destination of url (url itself if not a short link or on error)."""
+        if not is_shortener(url):
+            return url
+
+        key = url.strip()
+        if self.store is not None and (cached := self.store.get(key)) is not None:
+            return cached.decode()
+
+        import httpx
+
+        try:
+            with self._lock:
+                self.requests += 1
+            response = self.client.head(key)
+            if response.status_code in (403, 405, 501):
+                # Some redirectors refuse HEAD; a streamed GET stops after headers
+                with self.client.stream("GET", key) as streamed:
+                    response = streamed
+            final = str(response.url)
+        except httpx.HTTPError:
+            return url
+
+        if self.store is not None:
+            self.store.set(key, final.encode())
+        return final
+
+    def resolve_many(self, urls: Iterable[str], max_workers: int = 8) -> dict[str, str]:
+        """Resolve urls concurrently. Returns {url: resolved} for every input."""
+        urls = list(dict.fromkeys(urls))
+        short = [u for u in urls if is_shortener(u)]
+        resolved = {u: u for u in urls}
+        if short:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(short)))) as pool:
+                resolved.update(zip(short, pool.map(self.resolve, short)))
+        return resolved
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
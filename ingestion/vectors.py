@@ -0,0 +1,202 @@
+"""
+Sparse TF-IDF vectors with an inverted index for nearest-neighbor search.
+
+The catalog is a few hundred short documents (labels + definitions), so a
+dict-of-dicts sparse representation is plenty: no numpy or scikit-learn.
+Queries score only documents sharing a term with the query, by walking
+the posting lists of the query's terms (a sparse matrix-vector product).
+
+Usage:
+    index = TfidfIndex()
+    index.add("semantic-gap", term_counts("The Semantic Gap ..."))
+    index.nearest(term_counts("semantic layers ..."), k=5)
+    # -> [("semantic-gap", 0.41), ...]
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Hashable, Iterable, Optional
+
+from .ids import STOPWORDS
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]")
+
+# Words too common in catalog text to tell resources apart
+EXTRA_STOPWORDS = {
+    "about", "also", "all", "any", "been", "being", "between", "both", "each",
+    "more", "most", "not", "one", "only", "other", "over", "such", "them",
+    "then", "there", "these", "they", "through", "using", "very", "were",
+}
+
+MAX_TERMS_TEXT = 2000  # words of body text vectorized per document
+
+SparseVector = dict[str, float]
+
+
+def tokenize(text: Optional[str], max_words: int = MAX_TERMS_TEXT) -> list[str]:
+    """Lowercase word tokens of text, stopwords and single characters dropped."""
+    if not text:
+        return []
+    words = _WORD.findall(text.lower())[:max_words]
+    return [w for w in words if len(w) > 1 and w not in STOPWORDS and w not in EXTRA_STOPWORDS]
+
+
+def term_counts(*texts: Optional[str], bigrams: bool = True) -> Counter:
+    """Unigram (and adjacent-pair bigram) counts over one or more texts."""
+    counts = Counter()
+    for text in texts:
+        words = tokenize(text)
+        counts.update(words)
+        if bigrams:
+            counts.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return counts
+
+
+def cosine(a: SparseVector, b: SparseVector) -> float:
+    """Dot product of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+class TfidfIndex:
+    """Documents as TF-IDF vectors, searchable by cosine similarity.
+
+    Term counts are stored raw; weights (sublinear tf x smoothed idf, L2
+    normalized) and posting lists are rebuilt lazily after documents
+    change, so adding documents one at a time stays cheap. Thread-safe.
+    """
+
+    def __init__(self):
+        self._counts: dict[Hashable, Counter] = {}
+        self._df: Counter = Counter()
+        self._vectors: dict[Hashable, SparseVector] = {}
+        self._postings: dict[str, list[tuple[Hashable, float]]] = {}
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._counts
+
+    def keys(self) -> list[Hashable]:
+        with self._lock:
+            return list(self._counts)
+
+    def add(self, key: Hashable, counts: Counter):
+        """Add (or replace) a document's term counts."""
+        with self._lock:
+            self.remove(key)
+            if not counts:
+                return
+            self._counts[key] = Counter(counts)
+            self._df.update(counts.keys())
+            self._dirty = True
+
+    def remove(self, key: Hashable) -> bool:
+        with self._lock:
+            counts = self._counts.pop(key, None)
+            if counts is None:
+                return False
+            self._df.subtract(counts.keys())
+            self._df += Counter()  # drop zero counts
+            self._dirty = True
+            return True
+
+    def idf(self, term: str) -> float:
+        return math.log((1 + len(self._counts)) / (1 + self._df.get(term, 0))) + 1
+
+    def weigh(self, counts: Counter) -> SparseVector:
+        """TF-IDF vector of term counts, using the indexed documents' idf.
+
+        Terms no indexed document contains are dropped, since they can't
+        contribute to a similarity.
+        """
+        with self._lock:
+            vector = {
+                term: (1 + math.log(count)) * self.idf(term)
+                for term, count in counts.items()
+                if count > 0 and term in self._df
+            }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {term: w / norm for term, w in vector.items()} if norm else {}
+
+    def _rebuild(self):
+        self._vectors = {}
+        postings: dict[str, list[tuple[Hashable, float]]] = {}
+        for key, counts in self._counts.items():
+            vector = {term: (1 + math.log(count)) * self.idf(term) for term, count in counts.items() if count > 0}
+            norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            vector = {term: w / norm for term, w in vector.items()}
+            self._vectors[key] = vector
+            for term, weight in vector.items():
+                postings.setdefault(term, []).append((key, weight))
+        self._postings = postings
+        self._dirty = False
+
+    def vector(self, key: Hashable) -> SparseVector:
+        """The stored document's TF-IDF vector (empty if unknown)."""
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            return self._vectors.get(key, {})
+
+    def scores(self, query: SparseVector, exclude: Iterable[Hashable] = ()) -> dict[Hashable, float]:
+        """Cosine similarity of query against every document sharing a term."""
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            scores: dict[Hashable, float] = {}
+            for term, q_weight in query.items():
+                for key, weight in self._postings.get(term, ()):
+                    scores[key] = scores.get(key, 0.0) + q_weight * weight
+        for key in exclude:
+            scores.pop(key, None)
+        return scores
+
+    def nearest(
+        self,
+        counts: Counter,
+        k: int = 5,
+        min_score: float = 0.0,
+        exclude: Iterable[Hashable] = (),
+    ) -> list[tuple[Hashable, float]]:
+        """Top-k (key, similarity) for raw term counts, best first."""
+        scores = self.scores(self.weigh(counts), exclude)
+        return heapq.nlargest(
+            k,
+            ((key, score) for key, score in scores.items() if score >= min_score and score > 0),
+            key=lambda item: item[1],
+        )
+
+    def all_nearest(
+        self,
+        k: int = 5,
+        min_score: float = 0.0,
+    ) -> dict[Hashable, list[tuple[Hashable, float]]]:
+        """Top-k neighbors of every indexed document, in one pass.
+
+        Equivalent to nearest() per document but reuses the stored vectors
+        and posting lists instead of re-weighing each document.
+        """
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            keys = list(self._vectors)
+        return {
+            key: heapq.nlargest(
+                k,
+                (
+                    (other, score)
+                    for other, score in self.scores(self.vector(key), exclude=(key,)).items()
+                    if score >= min_score and score > 0
+                ),
+                key=lambda item: item[1],
+            )
+            for key in keys
+        }
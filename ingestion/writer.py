@@ -0,0 +1,247 @@
+"""
+Locked, durable writes for the catalog and queue files.
+
+resources.yaml, authors.yaml, queue/pending.yaml and bird's markdown
+queues are written by `ingest.py` runs and by the bird cron job, possibly
+at the same time. Everything here takes an advisory lock per file
+(fcntl.flock on a lock file under .cache/locks, where available) so
+writers never interleave:
+
+- CatalogWriter buffers appends and commits them with one write + fsync,
+  optionally checking each entry as it is appended (so one bad entry is
+  rejected on its own) and the written bytes after the write (truncating
+  them away if they don't parse).
+- atomic_write / update_file replace a whole file via temp file + rename,
+  so readers never see a half-written file.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from .cache import CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+LOCK_DIR = CACHE_DIR / "locks"
+
+# One in-process lock per file, so threads of one run also serialize
+_thread_locks: dict[Path, threading.RLock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path: Path) -> threading.RLock:
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(path, threading.RLock())
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on path (blocks until available).
+
+    The lock lives in a separate file so it survives the target being
+    replaced by rename.
+    """
+    path = Path(path).resolve()
+    with _thread_lock(path):
+        if fcntl is None:
+            yield
+            return
+        LOCK_DIR.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha1(str(path).encode()).hexdigest()[:12]
+        with open(LOCK_DIR / f"{path.name}-{digest}.lock", "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def _fsync_dir(directory: Path):
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: Path, text: str):
+    """Replace path's contents via temp file + fsync + rename.
+
+    Callers that read-modify-write should hold file_lock (see update_file).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+
+
+def update_file(path: Path, transform: Callable[[Optional[str]], str]) -> str:
+    """Read, transform and atomically rewrite a file under its lock.
+
+    Args:
+        path: File to update
+        transform: Called with the current text (None if missing); returns
+            the new text
+
+    Returns:
+        The text written
+    """
+    path = Path(path)
+    with file_lock(path):
+        current = path.read_text(encoding="utf-8") if path.exists() else None
+        text = transform(current)
+        atomic_write(path, text)
+    return text
+
+
+def validate_yaml_entries(text: str) -> None:
+    """Check that appended text is a well-formed block of YAML list entries.
+
+    Entries are written indented under a top-level key (e.g. resources:),
+    so the tail is parsed as the body of such a key.
+
+    Raises:
+        ValueError: If the text doesn't parse as list entries
+    """
+    import yaml
+
+    from .catalog import parse_yaml
+
+    try:
+        data = parse_yaml("_entries:\n" + text)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Appended YAML does not parse: {e}") from e
+    entries = data.get("_entries") if isinstance(data, dict) else None
+    if text.strip() and not isinstance(entries, list):
+        raise ValueError("Appended YAML is not a list of entries")
+
+
+class CatalogWriter:
+    """Buffered, locked appender for one file.
+
+    Usage:
+        writer = CatalogWriter(resources_file, validate=validate_yaml_entries)
+        writer.append(entry_yaml)   # ValueError if the entry doesn't validate
+        ...
+        writer.flush()   # one locked write + fsync for everything pending
+
+    Entries are validated on append, so the buffer only ever holds valid
+    text. If the bytes read back after a flush don't validate (a disk
+    problem), the file is truncated back to its previous length, the error
+    propagates and the pending text is kept for a retry or discard().
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        validate: Optional[Callable[[str], Any]] = None,
+        separator: str = "\n",
+        terminator: str = "\n",
+    ):
+        self.path = Path(path)
+        self.validate = validate
+        self.separator = separator
+        self.terminator = terminator
+        self.writes = 0
+        self._pending: list[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def discard(self) -> list[str]:
+        """Drop and return everything pending (e.g. after a failed flush)."""
+        with self._lock:
+            dropped, self._pending = self._pending, []
+        return dropped
+
+    def check(self, text: str):
+        """Validate one entry as it would be appended.
+
+        Raises:
+            ValueError: If validate rejects it
+        """
+        if self.validate:
+            self.validate(f"{self.separator}{text}{self.terminator}")
+
+    def append(self, text: str):
+        """Queue text to be appended on the next flush.
+
+        Raises:
+            ValueError: If validate rejects it (nothing is queued)
+        """
+        self.check(text)
+        with self._lock:
+            self._pending.append(text)
+
+    def flush(self) -> int:
+        """Append everything pending in one locked write + fsync.
+
+        Returns:
+            Number of entries written
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            # Entries were validated on append; the post-write check below
+            # catches anything that went wrong on disk
+            chunk = "".join(f"{self.separator}{text}{self.terminator}" for text in self._pending)
+
+            with file_lock(self.path):
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a+b") as f:
+                    f.seek(0, os.SEEK_END)
+                    start = f.tell()
+                    f.write(chunk.encode("utf-8"))
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                    if self.validate:
+                        f.seek(start)
+                        try:
+                            self.validate(f.read().decode("utf-8"))
+                        except ValueError:
+                            f.truncate(start)
+                            f.flush()
+                            os.fsync(f.fileno())
+                            raise
+
+            count = len(self._pending)
+            self._pending.clear()
+            self.writes += 1
+            return count
+
+    def __enter__(self) -> "CatalogWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+
+def append_text(path: Path, text: str):
+    """Append text to a file as one locked write + fsync."""
+    writer = CatalogWriter(path, separator="", terminator="")
+    writer.append(text)
+    writer.flush()
@@ -9,50 +9,88 @@ from typing import Optional
 from .classifiers import ClassifiedResource
 
 
-def generate_resource_yaml(resource: ClassifiedResource) -> str:
+def _scalar(value) -> str:
+    """A value as a one-line YAML scalar: plain when that parses back to the
+    same string, otherwise double-quoted and escaped (titles with `: ` or
+    quotes, values like "yes" or "@org", embedded newlines)."""
+    import yaml
+
+    def dump(**style) -> str:
+        text = yaml.safe_dump(str(value), allow_unicode=True, width=float("inf"), **style)
+        return text.removesuffix("\n").removesuffix("\n...")
+
+    text = dump()
+    if "\n" in text or text.startswith(("'", '"')):
+        return dump(default_style='"')
+    return text
+
+
+def _folded(text: Optional[str], indent: int = 6) -> str:
+    """A `>` folded block, with every line of text indented under it."""
+    lines = (text or "").strip().splitlines() or [""]
+    pad = " " * indent
+    return ">\n" + "\n".join(f"{pad}{line}" if line.strip() else "" for line in lines)
+
+
+def format_relationships(relationships: Optional[list] = None) -> str:
+    """
+    Format the relationships field of a resource entry.
+
+    Args:
+        relationships: Relationship suggestions (relationships.py), if any
+
+    Returns:
+        The indented `relationships:` line(s)
+    """
+    if not relationships:
+        return "    relationships: []"
+    lines = ["    relationships:"]
+    for rel in relationships:
+        lines.append(f"      - type: {_scalar(rel.type)}")
+        lines.append(f"        target: {_scalar(rel.target)}")
+    return "\n".join(lines)
+
+
+def generate_resource_yaml(resource: ClassifiedResource, relationships: Optional[list] = None) -> str:
     """
     Generate a YAML entry for resources.yaml.
 
     Args:
         resource: ClassifiedResource from the pipeline
+        relationships: Suggested relationships (relationships.py), if any
 
     Returns:
         Formatted YAML string ready to append to resources.yaml
     """
     # Format alternate labels
-    alt_labels_yaml = "\n".join(f"      - {label}" for label in resource.alternate_labels)
+    alt_labels_yaml = "\n".join(f"      - {_scalar(label)}" for label in resource.alternate_labels)
 
     # Format published date
     pub_date = resource.published_date if resource.published_date else "~"
 
-    # Escape title if it contains special chars
-    title = resource.title
-    if ":" in title or '"' in title:
-        title = f'"{title}"'
-
+    # Free-text values are escaped so any title or definition stays valid YAML
     yaml = f"""
-  - id: {resource.id}
-    url: {resource.url}
-    preferredLabel: {title}
+  - id: {_scalar(resource.id)}
+    url: {_scalar(resource.url)}
+    preferredLabel: {_scalar(resource.title)}
     alternateLabels:
 {alt_labels_yaml}
-    definition: >
-      {resource.definition}
+    definition: {_folded(resource.definition)}
 
     # Provenance
-    author: {resource.author_id}
-    source: {resource.source}
-    contentType: {resource.content_type}
+    author: {_scalar(resource.author_id)}
+    source: {_scalar(resource.source)}
+    contentType: {_scalar(resource.content_type)}
     publishedDate: {pub_date}
     dateAdded: {date.today().isoformat()}
 
     # Classification
-    domain: {resource.domain}
-    category: {resource.category}
-    granularity: {resource.granularity}
+    domain: {_scalar(resource.domain)}
+    category: {_scalar(resource.category)}
+    granularity: {_scalar(resource.granularity)}
 
     # Relationships
-    relationships: []
+{format_relationships(relationships)}
 
     # Quality
     validationStatus: unvalidated
@@ -61,7 +99,7 @@ def generate_resource_yaml(resource: ClassifiedResource) -> str:
     readingTime: {resource.reading_time}
     color: "{resource.color}"
 """
-    return yaml.strip()
+    return yaml.strip("\n")
 
 
 def generate_author_yaml(
@@ -91,7 +129,8 @@ def generate_author_yaml(
     perspective = "organization" if is_organization else "practitioner"
 
     # Use GitHub data if available, otherwise fallback
-    affiliation_line = gh.get("affiliation") or affiliation or "~"
+    affiliation_value = gh.get("affiliation") or affiliation
+    affiliation_line = _scalar(affiliation_value) if affiliation_value else "~"
     location_str = gh.get("location", "")
     bio_text = gh.get("bio", "[To be researched]")
 
@@ -101,25 +140,25 @@ def generate_author_yaml(
     if location_str:
         parts = [p.strip() for p in location_str.split(",")]
         if len(parts) >= 2:
-            city = parts[0]
-            country = parts[-1]
+            city = _scalar(parts[0])
+            country = _scalar(parts[-1])
         else:
-            city = location_str
+            city = _scalar(location_str)
 
     # Build social links section
     social_lines = []
     if gh.get("github"):
-        social_lines.append(f"    github: {gh['github']}")
+        social_lines.append(f"    github: {_scalar(gh['github'])}")
     if gh.get("twitter"):
-        social_lines.append(f"    twitter: {gh['twitter']}")
+        social_lines.append(f"    twitter: {_scalar(gh['twitter'])}")
     social_section = "\n".join(social_lines) if social_lines else "    # (no social links found)"
 
     # Followers count
     followers = gh.get("github_followers", "~")
 
     yaml = f"""
-  - id: {author_id}
-    name: {author_name}
+  - id: {_scalar(author_id)}
+    name: {_scalar(author_name)}
     # Demographics
     birthYear: ~
     generation: ~
@@ -141,11 +180,10 @@ def generate_author_yaml(
 {social_section}
     socialFollowing: {followers}
     # Meta
-    bio: >
-      {bio_text}
-    bioSource: {source_url if source_url else '~'}
+    bio: {_folded(bio_text)}
+    bioSource: {_scalar(source_url) if source_url else '~'}
 """
-    return yaml.strip()
+    return yaml.strip("\n")
 
 
 def generate_review_entry(resource: ClassifiedResource) -> str:
@@ -161,17 +199,15 @@ def generate_review_entry(resource: ClassifiedResource) -> str:
     yaml = f"""
   - id: {resource.id}
     url: {resource.url}
-    title: {resource.title}
+    title: {_scalar(resource.title)}
 
     # Classification (confidence: {resource.confidence:.0%})
     domain: {resource.domain}
     category: {resource.category}
-    reasoning: >
-      {resource.reasoning}
+    reasoning: {_folded(resource.reasoning)}
 
     # Suggested definition
-    definition: >
-      {resource.definition}
+    definition: {_folded(resource.definition)}
 
     # Review actions
     status: pending
@@ -180,7 +216,7 @@ def generate_review_entry(resource: ClassifiedResource) -> str:
 {f"      - new_author: {resource.author_id}" if resource.is_new_author else ""}
     added: {date.today().isoformat()}
 """
-    return yaml.strip()
+    return yaml.strip("\n")
 
 
 def format_for_display(resource: ClassifiedResource) -> str:
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark catalog YAML loading: pure-Python vs libyaml vs snapshot.
+
+Inflates resources.yaml N times (default 10x) into a temp directory and
+times each loading strategy.
+
+Usage:
+    python scripts/bench_catalog_load.py
+    python scripts/bench_catalog_load.py --factor 20 --repeat 5
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingestion.catalog import SafeLoader, load_yaml  # noqa: E402
+
+
+def inflate(source: Path, factor: int, dest: Path) -> int:
+    """Write source with its resource list repeated factor times (unique IDs)."""
+    data = yaml.load(source.read_text(), Loader=SafeLoader)
+    resources = data.get("resources", [])
+    inflated = []
+    for i in range(factor):
+        for r in resources:
+            copy = dict(r)
+            copy["id"] = f"{r.get('id')}-{i}"
+            copy["url"] = f"{r.get('url')}?copy={i}"
+            inflated.append(copy)
+    data["resources"] = inflated
+    with open(dest, "w") as f:
+        yaml.dump(data, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), allow_unicode=True)
+    return len(inflated)
+
+
+def timed(fn, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--factor", type=int, default=10, help="Inflation factor (default: 10)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per strategy (default: 3)")
+    args = parser.parse_args()
+
+    source = Path(__file__).parent.parent / "resources.yaml"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        catalog = tmp / "resources.yaml"
+        count = inflate(source, args.factor, catalog)
+        size_mb = catalog.stat().st_size / 1024 / 1024
+        print(f"Catalog: {count} resources, {size_mb:.1f} MB ({args.factor}x resources.yaml)")
+        print(f"libyaml available: {SafeLoader is not yaml.SafeLoader}\n")
+
+        snapshots = tmp / "snapshots"
+        results = [
+            ("yaml.safe_load (pure Python)", timed(lambda: yaml.safe_load(catalog.read_text()), args.repeat)),
+            ("CSafeLoader", timed(lambda: load_yaml(catalog, snapshot=False), args.repeat)),
+        ]
+
+        def cold():
+            for f in snapshots.glob("*.pickle"):
+                f.unlink()
+            load_yaml(catalog, snapshot_dir=snapshots)
+
+        results.append(("cold (parse + write snapshot)", timed(cold, args.repeat)))
+        results.append(("warm (snapshot hit)", timed(lambda: load_yaml(catalog, snapshot_dir=snapshots), args.repeat)))
+
+        baseline = statistics.median(results[0][1])
+        print(f"{'Strategy':<32} {'median':>10} {'speedup':>9}")
+        print("─" * 53)
+        for name, times in results:
+            median = statistics.median(times)
+            print(f"{name:<32} {median * 1000:>8.1f}ms {baseline / median:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
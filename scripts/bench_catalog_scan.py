@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark duplicate-check loading: full YAML parse vs streaming scanner.
+
+Generates a synthetic resources.yaml (default 100k entries, shaped like
+the real catalog) and builds the normalized-URL map each way. Every
+method runs in fresh processes: one timed, one under tracemalloc for
+peak Python heap memory (tracing slows the run, so it isn't timed).
+
+Usage:
+    python scripts/bench_catalog_scan.py
+    python scripts/bench_catalog_scan.py --resources 20000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+ENTRY = """
+  - id: synthetic-resource-{i}
+    url: https://example{d}.substack.com/p/synthetic-resource-{i}?utm_source=bench
+    preferredLabel: "Synthetic Resource {i}: A Study"
+    alternateLabels:
+      - synthetic label {i}
+      - benchmark entry
+    definition: >
+      Generated entry {i} used to benchmark catalog loading. It carries a
+      definition of realistic length so the full parse does realistic work.
+
+    # Provenance
+    author: author-{a}
+    source: Substack
+    contentType: essay
+    publishedDate: ~
+    dateAdded: 2025-01-{day:02d}
+
+    # Classification
+    domain: knowledge-engineering
+    category: Core Architecture
+    granularity: conceptual
+    relationships: []
+    validationStatus: unvalidated
+    readingTime: 10m
+    color: "#06b6d4"
+"""
+
+
+def generate(path: Path, count: int):
+    with open(path, "w") as f:
+        f.write("metadata:\n  version: \"1.2\"\n\nresources:\n")
+        for i in range(count):
+            f.write(ENTRY.format(i=i, d=i % 50, a=i % 500, day=i % 28 + 1))
+
+
+def child(method: str, path: Path, trace: bool):
+    """Build the URL map with one method; print timing or peak memory as JSON."""
+    from ingestion.catalog import load_yaml
+    from ingestion.scan import scan_entries
+    from ingestion.urls import normalize_url
+
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if method == "full":
+        data = load_yaml(path, snapshot=False)
+        urls = {normalize_url(r["url"]): r["id"] for r in data["resources"] if r.get("url")}
+    else:
+        urls = {
+            normalize_url(r["url"]): r["id"]
+            for r in scan_entries(path, "resources", ("id", "url"), method=method)
+            if r.get("url")
+        }
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    print(json.dumps({"seconds": elapsed, "peak_bytes": peak, "urls": len(urls)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resources", type=int, default=100_000, help="Synthetic entries (default: 100000)")
+    parser.add_argument("--child", nargs=3, metavar=("METHOD", "PATH", "TRACE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], Path(args.child[1]), args.child[2] == "trace")
+        return
+
+    from ingestion.scan import validate_scan
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "resources.yaml"
+        generate(path, args.resources)
+        print(f"Catalog: {args.resources} resources, {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+        problems = validate_scan(path)
+        print(f"Validation: {'scanner agrees with full parse' if not problems else problems}\n")
+
+        print(f"{'Method':<28} {'time':>9} {'peak mem':>11} {'URLs':>8}")
+        print("─" * 59)
+        labels = {
+            "full": "full parse (CSafeLoader)",
+            "events": "event scanner",
+            "lines": "line scanner",
+        }
+        for method, label in labels.items():
+            timed, traced = (
+                json.loads(subprocess.run(
+                    [sys.executable, __file__, "--child", method, str(path), mode],
+                    capture_output=True, text=True, check=True,
+                ).stdout)
+                for mode in ("time", "trace")
+            )
+            print(
+                f"{label:<28} {timed['seconds']:>8.2f}s"
+                f" {traced['peak_bytes'] / 1024 / 1024:>9.1f}MB {timed['urls']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark GitHub author enrichment against the local fake API
+(scripts/fake_github_server.py): no network, no quota.
+
+Enriches the authors in authors.yaml (or --authors N synthetic ones)
+three ways, each with a fresh client and no cache:
+
+    sequential  enrich_author per author (search + profile, one at a time)
+    rest        enrich_authors_batch without a token (concurrent searches,
+                one REST profile request each)
+    graphql     enrich_authors_batch with a token (concurrent searches,
+                profiles in aliased GraphQL queries)
+
+and reports wall time, requests per endpoint and budget used, and checks
+that every mode produced the same enrichment.
+
+Usage:
+    python scripts/bench_github_enrichment.py
+    python scripts/bench_github_enrichment.py --authors 300 --latency 0.1 --workers 8
+    python scripts/bench_github_enrichment.py --modes rest graphql --batch-size 25
+"""
+
+import argparse
+import copy
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+MODES = ("sequential", "rest", "graphql")
+
+
+def load_authors(count: int) -> list[dict]:
+    """Author dicts without GitHub links: from authors.yaml, or synthetic."""
+    if count:
+        return [{"id": f"a-{i}", "name": f"Author {i}"} for i in range(count)]
+    import yaml
+
+    data = yaml.safe_load((ROOT / "authors.yaml").read_text()) or {}
+    return [
+        {"id": a["id"], "name": a["name"]}
+        for a in data.get("authors", [])
+        if a.get("id") and a.get("name") and not a.get("github")
+    ]
+
+
+def run_mode(mode: str, authors: list[dict], base_url: str, workers: int, batch_size: int) -> list[dict]:
+    from ingestion import github_client
+    from ingestion.github_enrichment import enrich_author, enrich_authors_batch
+
+    client = github_client.GitHubClient(
+        token="fake" if mode == "graphql" else None,
+        use_cache=False,
+        base_url=base_url,
+    )
+    github_client._client = client  # enrichment uses the shared client
+    if mode == "sequential":
+        for author in authors:
+            author.update(enrich_author(author["name"], author["id"], ""))
+        return authors
+    return enrich_authors_batch(authors, workers=workers, batch_size=batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--authors", type=int, default=0, help="Synthetic authors (default: authors.yaml)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake API seconds per request")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=50, help="Profiles per GraphQL query")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    from fake_github_server import start_server
+
+    authors = load_authors(args.authors)
+    print(f"Enriching {len(authors)} authors (fake API latency {args.latency:.2f}s)\n")
+    print(f"{'Mode':<12} {'wall s':>8} {'authors/s':>10} {'enriched':>9} {'requests':>9} {'search':>7} {'users':>6} {'graphql':>8}")
+    print("─" * 76)
+
+    results = {}
+    for mode in args.modes:
+        server, state, url = start_server(latency=args.latency)
+        try:
+            batch = copy.deepcopy(authors)
+            start = time.perf_counter()
+            enriched = run_mode(mode, batch, url, args.workers, args.batch_size)
+            wall = time.perf_counter() - start
+        finally:
+            server.shutdown()
+        results[mode] = {a["id"]: a.get("github") for a in enriched}
+        count = sum(1 for a in enriched if a.get("github"))
+        requests = state.requests
+        print(f"{mode:<12} {wall:>8.2f} {len(authors) / wall:>10.1f} {count:>9} {sum(requests.values()):>9} "
+              f"{requests.get('search', 0):>7} {requests.get('users', 0):>6} {requests.get('graphql', 0):>8}")
+
+    baseline = next(iter(results.values()))
+    mismatched = [mode for mode, result in results.items() if result != baseline]
+    if mismatched:
+        sys.exit(f"\n✗ Enrichment differs between modes: {', '.join(mismatched)}")
+    print("\n✓ All modes produced the same enrichment")
+
+
+if __name__ == "__main__":
+    main()
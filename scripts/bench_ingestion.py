@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Benchmark ingestion throughput offline, from recorded cassettes.
+
+`record` runs the pipeline live (summarize, LLM provider, GitHub) over the
+links in a markdown file and stores every extraction, LM response and
+GitHub lookup in a cassette (ingestion/cassette.py). Nothing is written
+to the catalog.
+
+`replay` runs the cassette through the pipeline again with no network:
+LM calls take --lm-latency seconds (default: as recorded) and fail with a
+rate limit at --error-rate. Each replay runs in a fresh process against a
+scratch copy of the catalog, and reports URLs/min, per-step latency
+percentiles (from the run logs' metrics) and peak RSS.
+
+Modes:
+    pipeline  IngestionPipeline.process on a thread pool (no writes)
+    batch     cmd_batch --auto-approve, end to end including catalog writes
+
+Usage:
+    python scripts/bench_ingestion.py record intake-queue.md
+    python scripts/bench_ingestion.py replay --lm-latency 1.5 --concurrency 4
+    python scripts/bench_ingestion.py replay --mode batch --extract-workers 4 --classify-workers 2
+    python scripts/bench_ingestion.py replay --error-rate 0.05 --repeat 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_CASSETTE = ROOT / ".cache" / "cassettes" / "ingestion.json"
+
+# What a scratch copy of the tree needs to run the pipeline
+TREE = ("ingest.py", "ingestion", "config", "resources.yaml", "authors.yaml", "queue")
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def capture_runs() -> list[dict]:
+    """Collect every finished run in memory (as well as in the run log)."""
+    from ingestion.logger import IngestionLogger
+
+    runs, lock = [], threading.Lock()
+    finish_run = IngestionLogger.finish_run
+
+    def capturing(self, run, *args, **kwargs):
+        run_id = finish_run(self, run, *args, **kwargs)
+        with lock:
+            runs.append(run.record)
+        return run_id
+
+    IngestionLogger.finish_run = capturing
+    return runs
+
+
+# =============================================================================
+# RECORD
+# =============================================================================
+
+def record(links_file: Path, cassette_path: Path, concurrency: int):
+    import ingest
+    from ingestion.cassette import Cassette, recording
+
+    links = ingest.extract_markdown_links(links_file.read_text())
+    session = ingest.IngestionSession(use_cache=False)
+    urls = list(dict.fromkeys(session.canonicalize_many([url for _, url in links]).values()))
+    print(f"Recording {len(urls)} URLs → {cassette_path}")
+
+    cassette = Cassette()
+    with recording(cassette):
+        session.configure_lm()
+
+        def run(url: str) -> bool:
+            try:
+                session.pipeline.process(session.extract(url))
+                return True
+            except Exception as e:
+                print(f"  ✗ {url}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            ok = sum(pool.map(run, urls))
+
+    cassette.save(cassette_path)
+    print(f"✓ Recorded {ok}/{len(urls)} URLs, {len(cassette.lm)} LM responses, "
+          f"{len(cassette.github)} GitHub lookups")
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+def child(options: dict):
+    """Replay once inside a scratch tree; print the result as JSON."""
+    import ingest
+    from ingestion.cassette import Cassette, replaying
+    from ingestion.metrics import summarize_runs
+
+    cassette = Cassette.load(Path(options["cassette"]))
+    urls = cassette.urls[: options["limit"]] if options["limit"] else cassette.urls
+    runs = capture_runs()
+    env_var = "ANTHROPIC_API_KEY" if ingest.load_config()["llm"]["provider"] == "anthropic" else "OPENAI_API_KEY"
+    os.environ.setdefault(env_var, "replay")  # cmd_add checks for a key
+
+    with replaying(
+        cassette,
+        lm_latency=options["lm_latency"],
+        jitter=options["jitter"],
+        error_rate=options["error_rate"],
+        fetch_latency=options["fetch_latency"],
+        seed=options["seed"],
+    ):
+        start = time.perf_counter()
+        if options["mode"] == "batch":
+            links_file = Path("bench-links.md")
+            links_file.write_text("".join(f"- [{i}]({url})\n" for i, url in enumerate(urls)))
+            with contextlib.redirect_stdout(io.StringIO()):
+                ingest.cmd_batch(
+                    str(links_file),
+                    auto_approve=True,
+                    concurrency=options["concurrency"],
+                    extract_workers=options["extract_workers"],
+                    classify_workers=options["classify_workers"],
+                    use_cache=False,
+                )
+        else:
+            session = ingest.IngestionSession(use_cache=False)
+            session.configure_lm()
+
+            def run(url: str):
+                try:
+                    session.pipeline.process(session.extract(url))
+                except Exception:
+                    pass  # Counted from the run logs
+
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                list(pool.map(run, urls))
+        wall = time.perf_counter() - start
+
+    summary = summarize_runs(runs)
+    print(json.dumps({
+        "urls": len(urls),
+        "succeeded": summary.succeeded,
+        "wall_s": wall,
+        "peak_rss_mb": peak_rss_mb(),
+        "run_durations": summary.run_durations,
+        "steps": {
+            name: {"durations": s.durations, "calls": s.calls, "retries": s.retries,
+                   "tokens": s.prompt_tokens + s.completion_tokens}
+            for name, s in summary.steps.items()
+        },
+        "cassette": cassette.stats,
+    }))
+
+
+def replay_once(options: dict) -> dict:
+    """Run child() in a fresh process on a scratch copy of the tree."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in TREE:
+            source = ROOT / name
+            if source.is_dir():
+                shutil.copytree(source, Path(tmp) / name, ignore=shutil.ignore_patterns("__pycache__"))
+            elif source.exists():
+                shutil.copy2(source, Path(tmp) / name)
+        (Path(tmp) / "scripts").mkdir()
+        shutil.copy2(__file__, Path(tmp) / "scripts" / "bench_ingestion.py")
+        result = subprocess.run(
+            [sys.executable, "scripts/bench_ingestion.py", "--child", json.dumps(options)],
+            cwd=tmp, capture_output=True, text=True,
+        )
+    if result.returncode != 0:
+        sys.exit(f"Replay failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def report(results: list[dict]):
+    from ingestion.metrics import percentile
+
+    print(f"\n{'Run':<5} {'URLs':>5} {'ok':>5} {'wall s':>8} {'URLs/min':>9} {'peak RSS':>10}")
+    print("─" * 46)
+    for i, r in enumerate(results, 1):
+        print(f"{i:<5} {r['urls']:>5} {r['succeeded']:>5} {r['wall_s']:>8.2f} "
+              f"{r['succeeded'] / r['wall_s'] * 60:>9.1f} {r['peak_rss_mb']:>8.1f}MB")
+
+    steps: dict[str, dict] = {}
+    run_durations = []
+    for r in results:
+        run_durations += r["run_durations"]
+        for name, s in r["steps"].items():
+            merged = steps.setdefault(name, {"durations": [], "calls": 0, "retries": 0, "tokens": 0})
+            merged["durations"] += s["durations"]
+            for field in ("calls", "retries", "tokens"):
+                merged[field] += s[field]
+
+    print(f"\n{'Step':<22} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'calls':>6} {'retries':>7} {'tokens':>9}")
+    print("─" * 72)
+    for name, s in [*steps.items(), ("run", {"durations": run_durations})]:
+        d = s["durations"]
+        print(f"{name:<22} {percentile(d, 50):>8.3f} {percentile(d, 95):>8.3f} {percentile(d, 99):>8.3f} "
+              f"{s.get('calls', ''):>6} {s.get('retries', ''):>7} {s.get('tokens', ''):>9}")
+
+    total = {k: sum(r["cassette"][k] for r in results) for k in results[0]["cassette"]}
+    print(f"\nCassette: {total['hits']} exact hits, {total['near_misses']} near misses, "
+          f"{total['errors_injected']} injected errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    subparsers = parser.add_subparsers(dest="command")
+
+    record_parser = subparsers.add_parser("record", help="Record a cassette from live services")
+    record_parser.add_argument("file", help="Markdown file with links")
+    record_parser.add_argument("--cassette", type=Path, default=DEFAULT_CASSETTE)
+    record_parser.add_argument("--concurrency", type=int, default=4)
+
+    replay_parser = subparsers.add_parser("replay", help="Benchmark offline from a cassette")
+    replay_parser.add_argument("--cassette", type=Path, default=DEFAULT_CASSETTE)
+    replay_parser.add_argument("--mode", choices=["pipeline", "batch"], default="pipeline")
+    replay_parser.add_argument("--limit", type=int, default=0, help="Replay only the first N URLs")
+    replay_parser.add_argument("--repeat", type=int, default=1, help="Runs (each in a fresh process)")
+    replay_parser.add_argument("--concurrency", type=int, default=4)
+    replay_parser.add_argument("--extract-workers", type=int, default=0, help="batch: pipelined mode")
+    replay_parser.add_argument("--classify-workers", type=int, default=0, help="batch: pipelined mode")
+    replay_parser.add_argument("--lm-latency", type=float, default=None, help="Seconds per LM call (default: recorded)")
+    replay_parser.add_argument("--jitter", type=float, default=0.2, help="+/- fraction of LM latency")
+    replay_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of LM calls that hit a rate limit")
+    replay_parser.add_argument("--fetch-latency", type=float, default=None, help="Seconds per extraction (default: recorded)")
+    replay_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.child:
+        child(json.loads(args.child))
+    elif args.command == "record":
+        record(Path(args.file), args.cassette, args.concurrency)
+    elif args.command == "replay":
+        if not args.cassette.exists():
+            sys.exit(f"No cassette at {args.cassette}; run `record` first")
+        options = {
+            "cassette": str(args.cassette.resolve()),
+            "mode": args.mode,
+            "limit": args.limit,
+            "concurrency": max(1, args.concurrency),
+            "extract_workers": args.extract_workers,
+            "classify_workers": args.classify_workers,
+            "lm_latency": args.lm_latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "fetch_latency": args.fetch_latency,
+        }
+        results = []
+        for i in range(max(1, args.repeat)):
+            print(f"Replay {i + 1}/{args.repeat} ({args.mode})...", flush=True)
+            results.append(replay_once({**options, "seed": args.seed + i}))
+        report(results)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
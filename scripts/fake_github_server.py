@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub API, for benchmarking and trying out author
+enrichment (ingestion/github_enrichment.py) without network or quota.
+
+Serves the endpoints the enrichment client uses, with synthetic but
+deterministic users:
+
+    GET  /search/users?q=<name>   one hit; login = the name, lowercased, no spaces
+    GET  /users/<login>           a profile (404 for logins starting with "missing")
+    POST /graphql                 aliased `alias: user(login: $var) {...}` queries
+
+Responses carry ETags (If-None-Match gets a 304) and X-RateLimit-* headers
+from per-resource budgets, so rate-limit handling is exercised too. Each
+request sleeps --latency seconds.
+
+Usage:
+    python scripts/fake_github_server.py --port 8765 --latency 0.05
+    python scripts/fake_github_server.py --search-limit 30 --core-limit 60   # GitHub's real budgets
+
+    # then point the client at it
+    GitHubClient(base_url="http://127.0.0.1:8765", token="fake")
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# The shape of user(...) in the aliased queries github_enrichment sends
+_ALIASED_USER = re.compile(r"(\w+)\s*:\s*user\(\s*login:\s*\$(\w+)\s*\)")
+
+
+def fake_profile(login: str) -> dict:
+    """A deterministic REST profile for a login."""
+    seed = int(hashlib.sha1(login.encode()).hexdigest()[:8], 16)
+    return {
+        "login": login,
+        "name": login.replace("-", " ").title(),
+        "bio": f"Data engineer #{seed % 1000}" if seed % 3 else None,
+        "location": ["Berlin, Germany", "Austin, TX", "Bangalore, India", None][seed % 4],
+        "company": ["@dbt-labs", "Acme Data", None][seed % 3],
+        "blog": f"https://{login}.dev" if seed % 2 else "",
+        "twitter_username": login if seed % 5 == 0 else None,
+        "public_repos": seed % 80,
+        "followers": seed % 2500,
+    }
+
+
+def graphql_user(login: str) -> dict:
+    """The GraphQL view of fake_profile (the fields enrichment asks for)."""
+    profile = fake_profile(login)
+    return {
+        "login": profile["login"],
+        "name": profile["name"],
+        "bio": profile["bio"],
+        "location": profile["location"],
+        "company": profile["company"],
+        "websiteUrl": profile["blog"] or None,
+        "twitterUsername": profile["twitter_username"],
+        "followers": {"totalCount": profile["followers"]},
+        "repositories": {"totalCount": profile["public_repos"]},
+    }
+
+
+class FakeGitHub:
+    """Budgets and request counters shared by the handler threads."""
+
+    def __init__(self, latency: float = 0.0, core_limit: int = 5000, search_limit: int = 1000,
+                 graphql_limit: int = 5000, window_s: int = 3600):
+        self.latency = latency
+        self.limits = {"core": core_limit, "search": search_limit, "graphql": graphql_limit}
+        self.used = {resource: 0 for resource in self.limits}
+        self.window_s = window_s
+        self.reset_at = int(time.time()) + window_s
+        self.requests: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def spend(self, resource: str, endpoint: str, cost: int = 1) -> tuple[bool, dict]:
+        """Count a request; (allowed, rate-limit headers)."""
+        with self.lock:
+            if time.time() >= self.reset_at:
+                self.used = {r: 0 for r in self.limits}
+                self.reset_at = int(time.time()) + self.window_s
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            allowed = self.used[resource] + cost <= self.limits[resource]
+            if allowed:
+                self.used[resource] += cost
+            headers = {
+                "x-ratelimit-limit": str(self.limits[resource]),
+                "x-ratelimit-remaining": str(self.limits[resource] - self.used[resource]),
+                "x-ratelimit-reset": str(self.reset_at),
+                "x-ratelimit-used": str(self.used[resource]),
+                "x-ratelimit-resource": resource,
+            }
+        return allowed, headers
+
+
+def make_handler(state: FakeGitHub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body, headers: dict):
+            payload = json.dumps(body).encode() if body is not None else b""
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _limited(self, headers: dict):
+            self._send(403, {"message": "API rate limit exceeded"}, headers)
+
+        def do_GET(self):
+            time.sleep(state.latency)
+            url = urlparse(self.path)
+            if url.path == "/search/users":
+                allowed, headers = state.spend("search", "search")
+                if not allowed:
+                    return self._limited(headers)
+                query = parse_qs(url.query).get("q", [""])[0]
+                login = query.lower().replace(" ", "")
+                body = {"total_count": 1, "items": [{"login": login}]} if login else {"total_count": 0, "items": []}
+            elif match := re.fullmatch(r"/users/([\w.-]+)", url.path):
+                allowed, headers = state.spend("core", "users")
+                if not allowed:
+                    return self._limited(headers)
+                login = match.group(1)
+                if login.startswith("missing"):
+                    return self._send(404, {"message": "Not Found"}, headers)
+                body = fake_profile(login)
+            else:
+                return self._send(404, {"message": "Not Found"}, {})
+
+            etag = f'"{hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()}"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, None, headers)
+            self._send(200, body, headers)
+
+        def do_POST(self):
+            time.sleep(state.latency)
+            if urlparse(self.path).path != "/graphql":
+                return self._send(404, {"message": "Not Found"}, {})
+            if not self.headers.get("Authorization"):
+                return self._send(401, {"message": "This endpoint requires you to be authenticated."}, {})
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            allowed, headers = state.spend("graphql", "graphql")
+            if not allowed:
+                return self._send(200, {"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}, headers)
+
+            variables = request.get("variables") or {}
+            data, errors = {}, []
+            for alias, variable in _ALIASED_USER.findall(request.get("query", "")):
+                login = variables.get(variable, "")
+                if login.startswith("missing"):
+                    data[alias] = None
+                    errors.append({"type": "NOT_FOUND", "path": [alias],
+                                   "message": f"Could not resolve to a User with the login of '{login}'."})
+                else:
+                    data[alias] = graphql_user(login)
+            self._send(200, {"data": data, **({"errors": errors} if errors else {})}, headers)
+
+    return Handler
+
+
+def start_server(port: int = 0, **options) -> tuple[ThreadingHTTPServer, FakeGitHub, str]:
+    """Serve on a background thread; (server, state, base URL). Port 0 picks a free one."""
+    state = FakeGitHub(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--core-limit", type=int, default=5000, help="REST requests per window")
+    parser.add_argument("--search-limit", type=int, default=1000, help="Searches per window")
+    parser.add_argument("--graphql-limit", type=int, default=5000, help="GraphQL points per window")
+    parser.add_argument("--window", type=int, default=3600, help="Rate-limit window (seconds)")
+    args = parser.parse_args()
+
+    server, state, url = start_server(
+        args.port,
+        latency=args.latency,
+        core_limit=args.core_limit,
+        search_limit=args.search_limit,
+        graphql_limit=args.graphql_limit,
+        window_s=args.window,
+    )
+    print(f"Fake GitHub API on {url} (Ctrl-C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\nRequests: {state.requests}")
+
+
+if __name__ == "__main__":
+    main()